@@ -0,0 +1,48 @@
+"""
+Benchmark comparing A* with Dijkstra's Algorithm on a road-like grid, whose
+edge weights are 10-20 per unit of distance: the time per query and the
+number of vertices each one expands.
+
+Run from the repository root:
+    python -m benchmarks.bench_a_star [side] [query_count]
+"""
+import random
+import sys
+import time
+
+from graphs import a_star
+from graphs.generators import grid
+from graphs.weighted_graph import WeightedGraph
+
+
+def bench(name, graph, queries, heuristic):
+    expanded = 0
+    start = time.perf_counter()
+
+    for start_id, target_id in queries:
+        expanded += graph.a_star(start_id, target_id, heuristic).expanded
+    elapsed = time.perf_counter() - start
+
+    print(f'{name}: {elapsed / len(queries) * 1000:.2f}ms/query, '
+          f'{expanded / len(queries):,.0f} vertices expanded/query')
+
+
+if __name__ == '__main__':
+    side = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    query_count = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    rng = random.Random(0)
+    graph = WeightedGraph(is_directed=False)
+    graph.add_vertices_from(range(side * side))
+    graph.add_edges_from((vertex.get_id(), neighbor.get_id(),
+                          rng.randint(10, 20))
+                         for vertex in grid(side, side).get_vertices()
+                         for neighbor in vertex.get_neighbors()
+                         if vertex.get_id() < neighbor.get_id())
+    coordinates = {row * side + column: (column, row)
+                   for row in range(side) for column in range(side)}
+    queries = [(rng.randrange(side * side), rng.randrange(side * side))
+               for _ in range(query_count)]
+
+    bench('dijkstra', graph, queries, None)
+    bench('a* manhattan', graph, queries, a_star.manhattan(coordinates, 10))
+    bench('a* euclidean', graph, queries, a_star.euclidean(coordinates, 10))
@@ -0,0 +1,46 @@
+"""
+Benchmark comparing Bellman-Ford and SPFA on a random directed graph with
+negative edge weights. Weights are positive weights shifted by random vertex
+potentials, w(u, v) + p(u) - p(v), which leaves every cycle's total weight
+unchanged, so there are negative edges but no negative cycles.
+
+Run from the repository root:
+    python -m benchmarks.bench_bellman_ford [vertex_count] [edges_per_vertex]
+"""
+import random
+import sys
+import time
+
+from graphs.bellman_ford import bellman_ford, edge_arrays, spfa
+from graphs.generators import erdos_renyi
+from graphs.weighted_graph import WeightedGraph
+
+
+def bench(name, engine, *args):
+    start = time.perf_counter()
+    distances, _ = engine(*args)
+    elapsed = time.perf_counter() - start
+    print(f'{name}: {elapsed:.2f}s')
+    return distances
+
+
+if __name__ == '__main__':
+    vertex_count = int(sys.argv[1]) if len(sys.argv) > 1 else 10**4
+    edges_per_vertex = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+    positive = erdos_renyi(vertex_count, edges_per_vertex * vertex_count,
+                           weighted=True)
+    rng = random.Random(0)
+    potentials = [rng.randint(0, 50) for _ in range(vertex_count)]
+    graph = WeightedGraph()
+    graph.add_vertices_from(range(vertex_count))
+    graph.add_edges_from((vertex.get_id(), neighbor.get_id(),
+                          weight + potentials[vertex.get_id()] -
+                          potentials[neighbor.get_id()])
+                         for vertex in positive.get_vertices()
+                         for neighbor, weight in
+                         vertex.get_neighbors_with_weights())
+    frozen = graph.freeze()
+    edges = edge_arrays(frozen)
+
+    expected = bench('bellman-ford', bellman_ford, frozen, 0, edges)
+    assert list(bench('spfa', spfa, frozen, 0)) == list(expected)
@@ -0,0 +1,33 @@
+"""
+Benchmark for Graph.two_coloring on million-vertex graphs.
+
+Run from the repository root:
+    python -m benchmarks.bench_bipartite [vertex_count]
+"""
+import math
+import sys
+import time
+
+from graphs.generators import chain, erdos_renyi, grid
+
+
+def bench(name, graph):
+    edge_count = sum(vertex.get_out_degree() for vertex in graph.get_vertices())
+
+    start = time.perf_counter()
+    is_bipartite, result = graph.two_coloring()
+    elapsed = time.perf_counter() - start
+
+    outcome = (f'sides of {len(result[0])} and {len(result[1])}' if is_bipartite
+               else f'odd cycle of {len(result)}')
+    print(f'{name}: {len(graph.get_vertices())} vertices, {edge_count} edges, '
+          f'{outcome} in {elapsed:.2f}s')
+
+
+if __name__ == '__main__':
+    vertex_count = int(sys.argv[1]) if len(sys.argv) > 1 else 10**6
+    side = math.isqrt(vertex_count)
+    bench('grid', grid(side, side))
+    bench('directed chain', chain(vertex_count))
+    bench('random', erdos_renyi(vertex_count, 2 * vertex_count,
+                                is_directed=False))
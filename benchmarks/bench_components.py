@@ -0,0 +1,82 @@
+"""
+Benchmark for parallel_components.label_components: the in-process
+depth-first walk against union-find over a process pool, on a sparse and a
+dense random undirected graph. Also prints the per-edge costs behind
+UNION_FIND_EDGE_COST and MERGE_EDGE_COST, and the path label_components
+picks.
+
+Run from the repository root:
+    python -m benchmarks.bench_components [vertex_count] [processes]
+
+The pool only wins on dense graphs with several CPUs: each worker's spanning
+forest can hold |V| - 1 edges, and the parent unions every forest serially.
+"""
+import random
+import sys
+import time
+from array import array
+from multiprocessing import cpu_count
+
+from graphs import parallel_components
+from graphs.disjoint_set import DisjointSet
+
+
+def random_csr(vertex_count, edge_count, seed=0):
+    """Return (offsets, targets) of a random undirected graph."""
+    rng = random.Random(seed)
+    rows = [[] for _ in range(vertex_count)]
+
+    for _ in range(edge_count):
+        vertex1 = rng.randrange(vertex_count)
+        vertex2 = rng.randrange(vertex_count)
+        rows[vertex1].append(vertex2)
+        rows[vertex2].append(vertex1)
+    offsets = array('q', [0])
+    targets = array('q')
+
+    for row in rows:
+        targets.extend(row)
+        offsets.append(len(targets))
+    return offsets, targets
+
+
+def timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+def bench(name, vertex_count, edge_count, processes):
+    offsets, targets = random_csr(vertex_count, edge_count)
+    stored_edges = len(targets)
+
+    _, walk = timed(parallel_components._walk_labels, offsets, targets,
+                    vertex_count)
+    forest, union_find = timed(parallel_components._spanning_forest, 0,
+                               offsets, targets, vertex_count)
+    _, merge = timed(parallel_components._merge, DisjointSet(vertex_count),
+                     [forest])
+    forests, pool = timed(list, parallel_components._pooled_forests(
+        offsets, targets, processes))
+    forest_edges = sum(len(sources) for sources, _ in forests)
+    _, pool_merge = timed(parallel_components._merge,
+                          DisjointSet(vertex_count), forests)
+    walk_edge = walk / stored_edges
+    uses_pool = parallel_components._pool_pays_off(stored_edges, vertex_count,
+                                                   False, processes)
+
+    print(f'{name}: {vertex_count} vertices, {stored_edges} stored edges')
+    print(f'  walk {walk:.2f}s, pool of {processes} {pool + pool_merge:.2f}s '
+          f'(workers {pool:.2f}s, merging {forest_edges} forest edges '
+          f'{pool_merge:.2f}s)')
+    print(f'  per-edge cost vs walk: union-find '
+          f'{union_find / stored_edges / walk_edge:.1f}, merge '
+          f'{merge / max(len(forest[0]), 1) / walk_edge:.1f}')
+    print(f'  label_components uses the {"pool" if uses_pool else "walk"}')
+
+
+if __name__ == '__main__':
+    vertex_count = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    processes = int(sys.argv[2]) if len(sys.argv) > 2 else max(cpu_count(), 2)
+    bench('sparse', vertex_count, 4 * vertex_count, processes)
+    bench('dense', vertex_count // 100, 4 * vertex_count, processes)
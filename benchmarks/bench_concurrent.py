@@ -0,0 +1,86 @@
+"""
+Stress benchmark for ConcurrentGraph: read throughput with 1, 2, 4 and 8
+reader threads running shortest path queries on snapshots while a writer
+thread keeps publishing batches of new edges, against readers that share one
+lock with the writer around a plain Graph.
+
+Run from the repository root:
+    python -m benchmarks.bench_concurrent [vertex_count] [seconds]
+
+On interpreters with a global interpreter lock, threads take turns running
+Python code, so the total stays roughly flat as threads are added; snapshot
+readers still never wait for the writer. On free-threaded builds the snapshot
+readers scale with cores.
+"""
+import random
+import sys
+import threading
+import time
+
+from graphs.concurrent import ConcurrentGraph
+from graphs.generators import erdos_renyi
+
+# Edges added per write batch
+BATCH_SIZE = 1000
+
+
+def run(reader_count, seconds, read, write):
+    """Return the total reads per second of `reader_count` threads."""
+    stop = threading.Event()
+    counts = [0] * reader_count
+
+    def reader(slot):
+        rng = random.Random(slot)
+        while not stop.is_set():
+            read(rng)
+            counts[slot] += 1
+
+    def writer():
+        rng = random.Random(-1)
+        while not stop.is_set():
+            write(rng)
+
+    threads = [threading.Thread(target=reader, args=(slot,))
+               for slot in range(reader_count)]
+    threads.append(threading.Thread(target=writer))
+    for thread in threads:
+        thread.start()
+    time.sleep(seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    return sum(counts) / seconds
+
+
+def random_edges(rng, vertex_count):
+    return [(rng.randrange(vertex_count), rng.randrange(vertex_count))
+            for _ in range(BATCH_SIZE)]
+
+
+if __name__ == '__main__':
+    vertex_count = int(sys.argv[1]) if len(sys.argv) > 1 else 10**4
+    seconds = float(sys.argv[2]) if len(sys.argv) > 2 else 2
+
+    for reader_count in (1, 2, 4, 8):
+        shared = ConcurrentGraph(erdos_renyi(vertex_count, 4 * vertex_count))
+        rcu = run(reader_count, seconds,
+                  lambda rng: shared.snapshot.find_shortest_path(
+                      rng.randrange(vertex_count), rng.randrange(vertex_count)),
+                  lambda rng: shared.add_edges_from(random_edges(rng,
+                                                                 vertex_count)))
+
+        graph = erdos_renyi(vertex_count, 4 * vertex_count)
+        lock = threading.Lock()
+
+        def locked_read(rng):
+            with lock:
+                graph.find_shortest_path(rng.randrange(vertex_count),
+                                         rng.randrange(vertex_count))
+
+        def locked_write(rng):
+            with lock:
+                graph.add_edges_from(random_edges(rng, vertex_count))
+
+        locked = run(reader_count, seconds, locked_read, locked_write)
+        print(f'{reader_count} readers: snapshots {rcu:,.0f} reads/s, '
+              f'lock {locked:,.0f} reads/s')
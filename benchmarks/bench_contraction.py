@@ -0,0 +1,42 @@
+"""
+Benchmark for contraction hierarchies on a road-like weighted grid: the
+preprocessing time and the per-query latency against
+WeightedGraph.find_shortest_path.
+
+Run from the repository root:
+    python -m benchmarks.bench_contraction [side] [query_count]
+"""
+import random
+import sys
+import time
+
+from graphs.generators import grid
+
+
+def bench(name, find_shortest_path, queries):
+    start = time.perf_counter()
+
+    for start_id, target_id in queries:
+        find_shortest_path(start_id, target_id)
+    elapsed = time.perf_counter() - start
+    print(f'{name}: {elapsed / len(queries) * 1e6:,.0f}us/query')
+    return elapsed
+
+
+if __name__ == '__main__':
+    side = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    query_count = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    graph = grid(side, side, weighted=True)
+    rng = random.Random(0)
+    queries = [(rng.randrange(side * side), rng.randrange(side * side))
+               for _ in range(query_count)]
+
+    start = time.perf_counter()
+    hierarchy = graph.contraction_hierarchy()
+    print(f'preprocessing: {time.perf_counter() - start:.2f}s, '
+          f'{hierarchy.shortcut_count} shortcuts')
+
+    dijkstra = bench('dijkstra', graph.find_shortest_path, queries)
+    contracted = bench('contraction hierarchy', hierarchy.find_shortest_path,
+                       queries)
+    print(f'speedup: {dijkstra / contracted:.1f}x')
@@ -0,0 +1,47 @@
+"""
+Memory benchmark for the mutable graph classes: the bytes allocated per vertex
+and per edge, as measured by tracemalloc.
+
+Run from the repository root:
+    python -m benchmarks.bench_memory [vertex_count] [edges_per_vertex]
+"""
+import random
+import sys
+import tracemalloc
+
+from graphs.graph import Graph
+from graphs.weighted_graph import WeightedGraph
+
+
+def measure(graph_class, vertex_count, edges_per_vertex, seed=0):
+    """
+    Build a random graph and return the bytes allocated per vertex and per
+    edge. The edge list is generated up front so only the graph is counted.
+    """
+    rng = random.Random(seed)
+    is_weighted = graph_class is WeightedGraph
+    edges = [(rng.randrange(vertex_count), rng.randrange(vertex_count))
+             for _ in range(vertex_count * edges_per_vertex)]
+
+    if is_weighted:
+        edges = [(id1, id2, rng.random()) for id1, id2 in edges]
+
+    tracemalloc.start()
+    graph = graph_class(is_directed=True)
+    graph.add_vertices_from(range(vertex_count))
+    vertex_bytes = tracemalloc.get_traced_memory()[0]
+    edge_count = graph.add_edges_from(edges)
+    edge_bytes = tracemalloc.get_traced_memory()[0] - vertex_bytes
+    tracemalloc.stop()
+    return vertex_bytes / vertex_count, edge_bytes / edge_count
+
+
+if __name__ == '__main__':
+    vertex_count = int(sys.argv[1]) if len(sys.argv) > 1 else 10**5
+    edges_per_vertex = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+
+    for graph_class in (Graph, WeightedGraph):
+        per_vertex, per_edge = measure(graph_class, vertex_count,
+                                       edges_per_vertex)
+        print(f'{graph_class.__name__}: {per_vertex:,.0f} bytes/vertex, '
+              f'{per_edge:,.0f} bytes/edge')
@@ -0,0 +1,29 @@
+"""
+Throughput benchmark for strongly_connected_components.
+
+Run from the repository root:
+    python -m benchmarks.bench_scc [edge_count]
+"""
+import sys
+import time
+
+from graphs.generators import chain, erdos_renyi
+
+
+def bench(name, graph):
+    frozen = graph.freeze()
+    edge_count = len(frozen.targets)
+
+    start = time.perf_counter()
+    components = frozen.strongly_connected_components()
+    elapsed = time.perf_counter() - start
+
+    print(f'{name}: {len(frozen)} vertices, {edge_count} edges, '
+          f'{len(components)} components in {elapsed:.2f}s '
+          f'({edge_count / elapsed:,.0f} edges/s)')
+
+
+if __name__ == '__main__':
+    edge_count = int(sys.argv[1]) if len(sys.argv) > 1 else 10**6
+    bench('chain', chain(edge_count + 1))
+    bench('random', erdos_renyi(edge_count // 4, edge_count))
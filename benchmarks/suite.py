@@ -0,0 +1,193 @@
+"""
+Benchmark suite: times every graph algorithm on seeded synthetic graphs and
+records the peak memory each one allocates, as JSON.
+
+Run from the repository root:
+    python -m benchmarks.suite [--sizes small medium] [--output results.json]
+                               [--baseline old.json] [--tolerance 0.25]
+
+With --baseline, results slower than the baseline by more than the tolerance
+(or using more memory by the same margin) are reported and the exit status is
+1, so the suite can gate changes.
+"""
+import argparse
+import json
+import math
+import platform
+import sys
+import time
+import tracemalloc
+
+from graphs import generators
+from graphs.graph import Graph
+
+# Vertex counts for each named size
+SIZES = {'small': 1000, 'medium': 10000, 'large': 100000}
+
+# name -> (factory(vertex_count, weighted), is_directed, is_acyclic)
+GRAPHS = {
+    'erdos_renyi': (lambda count, weighted: generators.erdos_renyi(
+        count, 4 * count, weighted=weighted), True, False),
+    'barabasi_albert': (lambda count, weighted: generators.barabasi_albert(
+        count, 4, weighted=weighted), False, False),
+    'grid': (lambda count, weighted: generators.grid(
+        math.isqrt(count), math.isqrt(count), weighted=weighted), False, False),
+    'chain': (lambda count, weighted: generators.chain(
+        count, weighted=weighted), True, True),
+    'dag': (lambda count, weighted: generators.random_dag(
+        count, 4 * count, weighted=weighted), True, True),
+}
+
+
+def _ignore(vertex_id, depth, parent_id):
+    """bfs_traversal visitor that does nothing."""
+
+
+def _invalidate(graph):
+    """
+    Bump the graph's version, so that the snapshot, reverse index and query
+    caches kept against it are rebuilt and every run measures a cold query.
+    """
+    graph._record_change('invalidate')
+
+
+def algorithms(is_directed, is_acyclic):
+    """
+    Return (name, uses_weights, run(graph, last_id)) for each algorithm that
+    applies to a graph of this kind.
+    """
+    cases = [
+        ('freeze', False, lambda graph, last_id: graph.freeze()),
+        ('bfs_traversal', False,
+         lambda graph, last_id: graph.bfs_traversal(0, _ignore)),
+        ('find_shortest_path', False,
+         lambda graph, last_id: Graph.find_shortest_path(graph, 0, last_id)),
+        ('dijkstra', True, lambda graph, last_id: graph.dijkstra(0)),
+    ]
+    if is_directed:
+        cases.append(('reverse_index', False,
+                      lambda graph, last_id: graph._adjacent(reverse=True)))
+        cases.append(('strongly_connected_components', False,
+                      lambda graph, last_id:
+                      graph.strongly_connected_components()))
+    if is_acyclic:
+        cases.append(('topological_sort', False,
+                      lambda graph, last_id: graph.topological_sort()))
+    if not is_directed:
+        cases.append(('kruskal', True, lambda graph, last_id:
+                      graph.minimum_spanning_tree_kruskal()))
+        cases.append(('prim', True, lambda graph, last_id:
+                      graph.minimum_spanning_forest_prim()))
+    return cases
+
+
+def measure(run, graph, last_id, repeat):
+    """
+    Return the best wall time of `repeat` runs and the peak bytes allocated by
+    one further run under tracemalloc. Caches are invalidated before every
+    run, so costs such as freezing a snapshot (also timed on its own as
+    `freeze`) or building a reverse index (`reverse_index`) are included.
+    """
+    best = math.inf
+
+    for _ in range(repeat):
+        _invalidate(graph)
+        start = time.perf_counter()
+        run(graph, last_id)
+        best = min(best, time.perf_counter() - start)
+
+    _invalidate(graph)
+    tracemalloc.start()
+    run(graph, last_id)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return best, peak
+
+
+def run_suite(sizes, repeat=3, graph_names=None):
+    """
+    Run every applicable algorithm on every graph at every size.
+
+    Returns:
+    list: One dict per (graph, size, algorithm).
+    """
+    results = []
+
+    for size in sizes:
+        for graph_name in graph_names or GRAPHS:
+            factory, is_directed, is_acyclic = GRAPHS[graph_name]
+            graphs = {False: factory(SIZES[size], False),
+                      True: factory(SIZES[size], True)}
+            last_id = len(graphs[False].get_vertices()) - 1
+            edge_count = sum(vertex.get_out_degree()
+                             for vertex in graphs[False].get_vertices())
+
+            for name, uses_weights, run in algorithms(is_directed, is_acyclic):
+                seconds, peak = measure(run, graphs[uses_weights], last_id,
+                                        repeat)
+                results.append({'graph': graph_name, 'size': size,
+                                'vertices': last_id + 1, 'edges': edge_count,
+                                'algorithm': name, 'seconds': seconds,
+                                'peak_bytes': peak})
+                print(f'{graph_name:>16} {size:>6} {name:>30} '
+                      f'{seconds * 1000:10.2f} ms {peak / 1024:10.0f} KiB',
+                      file=sys.stderr)
+    return results
+
+
+def regressions(results, baseline, tolerance):
+    """
+    Compare results with a baseline run.
+
+    Returns:
+    list: Messages for each result slower, or using more memory, than the
+    baseline by more than `tolerance` (a fraction).
+    """
+    key = lambda result: (result['graph'], result['size'], result['algorithm'])
+    previous = {key(result): result for result in baseline}
+    messages = []
+
+    for result in results:
+        old = previous.get(key(result))
+
+        if old is None:
+            continue
+        for field in ('seconds', 'peak_bytes'):
+            if result[field] > old[field] * (1 + tolerance):
+                messages.append(f'{"/".join(map(str, key(result)))}: {field} '
+                                f'{old[field]:.6g} -> {result[field]:.6g}')
+    return messages
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--sizes', nargs='+', choices=SIZES, default=['small'])
+    parser.add_argument('--graphs', nargs='+', choices=GRAPHS)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--output', help='write JSON here instead of stdout')
+    parser.add_argument('--baseline', help='JSON from an earlier run')
+    parser.add_argument('--tolerance', type=float, default=0.25)
+    args = parser.parse_args(argv)
+
+    report = {'python': platform.python_version(),
+              'results': run_suite(args.sizes, args.repeat, args.graphs)}
+
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(report, file, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+    if args.baseline:
+        with open(args.baseline) as file:
+            messages = regressions(report['results'],
+                                   json.load(file)['results'], args.tolerance)
+        for message in messages:
+            print(f'REGRESSION {message}', file=sys.stderr)
+        return 1 if messages else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,115 @@
+"""
+A* search over a WeightedGraph, and heuristics built from vertex coordinates.
+
+A heuristic is any callable `heuristic(vertex_id, target_id)` returning an
+estimate of the remaining distance. It must never overestimate (be
+admissible) for the returned path to be shortest; with the zero heuristic A*
+expands vertices exactly like Dijkstra's Algorithm.
+"""
+from collections import namedtuple
+from heapq import heappop, heappush
+from math import hypot
+
+SearchResult = namedtuple("SearchResult", "cost path expanded")
+SearchResult.__doc__ = """
+Result of a point-to-point search: the total weight of the path, the vertex
+ids along it from start to target, and the number of vertices expanded.
+"""
+
+
+def zero(vertex_id, target_id):
+    """The trivial heuristic, which turns A* into Dijkstra's Algorithm."""
+    return 0
+
+
+def euclidean(coordinates, scale=1):
+    """
+    Return a straight-line-distance heuristic.
+
+    Parameters:
+    coordinates (dict): vertex id -> (x, y).
+    scale (number): The smallest edge weight per unit of distance; the
+                    heuristic stays admissible as long as no edge is cheaper.
+    """
+    def heuristic(vertex_id, target_id):
+        x1, y1 = coordinates[vertex_id]
+        x2, y2 = coordinates[target_id]
+        return scale * hypot(x1 - x2, y1 - y2)
+    return heuristic
+
+
+def manhattan(coordinates, scale=1):
+    """
+    Return a city-block-distance heuristic, for graphs whose edges only move
+    along one axis at a time, such as grids.
+
+    Parameters:
+    coordinates (dict): vertex id -> (x, y).
+    scale (number): The smallest edge weight per unit of distance; the
+                    heuristic stays admissible as long as no edge is cheaper.
+    """
+    def heuristic(vertex_id, target_id):
+        x1, y1 = coordinates[vertex_id]
+        x2, y2 = coordinates[target_id]
+        return scale * (abs(x1 - x2) + abs(y1 - y2))
+    return heuristic
+
+
+def a_star(graph, start_id, target_id, heuristic=zero):
+    """
+    Find the shortest weighted path with A*, expanding vertices in order of
+    distance so far plus the heuristic's estimate of the distance left. A
+    vertex is expanded again if a shorter path to it turns up later, so an
+    admissible heuristic is enough; it need not be consistent.
+
+    Parameters:
+    graph (WeightedGraph): The graph to search.
+    start_id (string): The id of the start vertex.
+    target_id (string): The id of the target vertex.
+    heuristic (callable): heuristic(vertex_id, target_id) -> estimate.
+
+    Returns:
+    SearchResult: The cost, path and expansion count, or None if the target
+    is unreachable.
+    """
+    if not graph.contains_id(start_id) or not graph.contains_id(target_id):
+        raise KeyError("One or both vertices are not in the graph!")
+    start_vertex = graph.get_vertex(start_id)
+    target_vertex = graph.get_vertex(target_id)
+    # Best distance found so far and the vertex it came from, by index. Heap
+    # entries hold the negated distance, so that among equal estimates the
+    # vertex closest to the target is expanded first.
+    distances = {start_vertex.index: 0}
+    previous = {start_vertex.index: None}
+    heap = [(heuristic(start_id, target_id), 0, start_vertex.index,
+             start_vertex)]
+    expanded = 0
+
+    while heap:
+        _, distance, index, vertex = heappop(heap)
+        distance = -distance
+
+        if distance > distances[index]:
+            continue # stale entry, a shorter path was found since
+        expanded += 1
+
+        if vertex is target_vertex:
+            path = []
+
+            while vertex is not None:
+                path.append(vertex.get_id())
+                vertex = previous[vertex.index]
+            path.reverse()
+            return SearchResult(distance, path, expanded)
+
+        for neighbor, weight in vertex.get_neighbors_with_weights():
+            neighbor_index = neighbor.index
+            new_distance = distance + weight
+
+            if new_distance < distances.get(neighbor_index, graph.INFINITY):
+                distances[neighbor_index] = new_distance
+                previous[neighbor_index] = vertex
+                heappush(heap, (new_distance +
+                                heuristic(neighbor.get_id(), target_id),
+                                -new_distance, neighbor_index, neighbor))
+    return None # path not found
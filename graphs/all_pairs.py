@@ -0,0 +1,175 @@
+from array import array
+from collections import namedtuple
+from heapq import heappop, heappush
+from math import log2
+
+INFINITY = float('inf')
+
+AllPairsShortestPaths = namedtuple("AllPairsShortestPaths",
+                                   "vertex_ids distances predecessors")
+AllPairsShortestPaths.__doc__ = """
+All-pairs shortest path result over the vertices of a frozen graph.
+
+`distances[i][j]` is the shortest distance from `vertex_ids[i]` to
+`vertex_ids[j]` (INFINITY if unreachable) and `predecessors[i][j]` is the index
+of the vertex before `j` on that path (-1 if there is none).
+"""
+
+
+def use_dense_kernel(vertex_count, edge_count):
+    """
+    Return True when the O(|V|^3) dense kernel is expected to beat running
+    Johnson's O(|V| |E| log |V|) algorithm.
+    """
+    if vertex_count < 2:
+        return True
+    return edge_count * log2(vertex_count) >= vertex_count * vertex_count
+
+
+def floyd_warshall_dense(frozen):
+    """
+    Floyd-Warshall over a dense distance matrix. Each intermediate vertex k is
+    applied to a whole row at once, so the inner loop is a single comprehension
+    over row k rather than an indexed double loop.
+    Time: O(|V|^3)
+
+    Parameters:
+    frozen (WeightedCSRGraph): The graph to solve.
+
+    Returns:
+    AllPairsShortestPaths: The distance and predecessor matrices.
+    """
+    vertex_count = len(frozen)
+    offsets, targets, weights = frozen.offsets, frozen.targets, frozen.weights
+    distances = []
+    predecessors = []
+
+    for source in range(vertex_count):
+        row = array('d', [INFINITY]) * vertex_count
+        previous = array('q', [-1]) * vertex_count
+        row[source] = 0
+
+        for edge in range(offsets[source], offsets[source+1]):
+            target = targets[edge]
+
+            if weights[edge] < row[target]:
+                row[target] = weights[edge]
+                previous[target] = source
+        distances.append(row)
+        predecessors.append(previous)
+
+    for k in range(vertex_count):
+        row_k = distances[k]
+        previous_k = predecessors[k]
+
+        for i in range(vertex_count):
+            row_i = distances[i]
+            distance_ik = row_i[k]
+
+            if distance_ik == INFINITY:
+                continue
+            improved = [j for j, through_k in enumerate(row_k)
+                        if distance_ik + through_k < row_i[j]]
+            previous_i = predecessors[i]
+
+            for j in improved:
+                row_i[j] = distance_ik + row_k[j]
+                previous_i[j] = previous_k[j]
+
+    if any(distances[i][i] < 0 for i in range(vertex_count)):
+        raise ValueError("Graph contains a negative-weight cycle")
+    return AllPairsShortestPaths(frozen.vertex_ids, distances, predecessors)
+
+
+def _potentials(frozen):
+    """
+    Bellman-Ford from a virtual source joined to every vertex by a 0-weight
+    edge. The result makes every reweighted edge non-negative.
+    """
+    vertex_count = len(frozen)
+    offsets, targets, weights = frozen.offsets, frozen.targets, frozen.weights
+    potentials = array('d', [0]) * vertex_count
+
+    if all(weight >= 0 for weight in weights):
+        return potentials # zero potentials already work
+
+    for _ in range(vertex_count):
+        relaxed = False
+
+        for source in range(vertex_count):
+            for edge in range(offsets[source], offsets[source+1]):
+                target = targets[edge]
+                candidate = potentials[source] + weights[edge]
+
+                if candidate < potentials[target]:
+                    potentials[target] = candidate
+                    relaxed = True
+        if not relaxed:
+            return potentials
+    raise ValueError("Graph contains a negative-weight cycle")
+
+
+def johnson_row(frozen, potentials, source):
+    """
+    Heap Dijkstra from `source` over potential-reweighted edges. Rows are
+    independent of each other, so they can be computed in any order or in
+    separate workers.
+
+    Returns:
+    tuple(array, array): The distance and predecessor rows for `source`.
+    """
+    vertex_count = len(frozen)
+    offsets, targets, weights = frozen.offsets, frozen.targets, frozen.weights
+    reduced = array('d', [INFINITY]) * vertex_count
+    previous = array('q', [-1]) * vertex_count
+    settled = bytearray(vertex_count)
+    reduced[source] = 0
+    heap = [(0, source)]
+
+    while heap:
+        distance, current = heappop(heap)
+
+        if settled[current]:
+            continue # stale entry
+        settled[current] = 1
+        potential = potentials[current]
+
+        for edge in range(offsets[current], offsets[current+1]):
+            target = targets[edge]
+            candidate = (distance + weights[edge] + potential -
+                         potentials[target])
+
+            if candidate < reduced[target]:
+                reduced[target] = candidate
+                previous[target] = current
+                heappush(heap, (candidate, target))
+
+    # Undo the reweighting to recover true distances
+    source_potential = potentials[source]
+    row = array('d', (distance - source_potential + potentials[target]
+                      if distance != INFINITY else INFINITY
+                      for target, distance in enumerate(reduced)))
+    return row, previous
+
+
+def johnson(frozen):
+    """
+    Johnson's Algorithm: reweight edges with Bellman-Ford potentials, then run
+    one heap Dijkstra per source.
+    Time: O(|V| |E| log |V|)
+
+    Parameters:
+    frozen (WeightedCSRGraph): The graph to solve.
+
+    Returns:
+    AllPairsShortestPaths: The distance and predecessor matrices.
+    """
+    potentials = _potentials(frozen)
+    distances = []
+    predecessors = []
+
+    for source in range(len(frozen)):
+        row, previous = johnson_row(frozen, potentials, source)
+        distances.append(row)
+        predecessors.append(previous)
+    return AllPairsShortestPaths(frozen.vertex_ids, distances, predecessors)
@@ -0,0 +1,148 @@
+"""
+Single-source shortest paths that allow negative edge weights, over frozen
+weighted graphs: Bellman-Ford, and SPFA (its queue-based variant), which only
+re-examines the edges of vertices whose distance just changed.
+"""
+from array import array
+from collections import deque
+
+INFINITY = float('inf')
+
+
+class NegativeCycleError(ValueError):
+    """
+    Raised when a negative-weight cycle is reachable from the source, so
+    shortest paths are undefined. `cycle` holds the vertex ids around it.
+    """
+    def __init__(self, cycle):
+        super().__init__("Graph contains a negative-weight cycle: " +
+                         ' -> '.join(map(str, cycle + cycle[:1])))
+        self.cycle = cycle
+
+
+def edge_arrays(frozen):
+    """
+    Return flat (sources, targets, weights) arrays with one entry per edge,
+    so a relaxation pass is a single loop over three parallel arrays. The
+    weights keep the snapshot's typecode.
+    """
+    offsets = frozen.offsets
+    sources = array('q')
+
+    for source in range(len(frozen)):
+        sources.extend([source] * (offsets[source+1] - offsets[source]))
+    return (sources, array('q', frozen.targets),
+            array(frozen.weight_typecode, frozen.weights))
+
+
+def _cycle_through(frozen, previous, vertex):
+    """
+    Return the vertex ids of the predecessor cycle that `vertex` leads to,
+    in edge order. Walking |V| predecessors from a vertex relaxed in round
+    |V| is guaranteed to land on the cycle.
+    """
+    for _ in range(len(frozen)):
+        vertex = previous[vertex]
+    cycle = [vertex]
+    current = previous[vertex]
+
+    while current != vertex:
+        cycle.append(current)
+        current = previous[current]
+    cycle.reverse()
+    return [frozen.vertex_ids[index] for index in cycle]
+
+
+def bellman_ford(frozen, source, edges=None):
+    """
+    Bellman-Ford: relax every edge once per round until a round changes
+    nothing, which on most graphs happens long before the |V| - 1 round
+    worst case. Time: O(|V| |E|)
+
+    Parameters:
+    frozen (WeightedCSRGraph): The graph to search.
+    source (integer): The index of the start vertex.
+    edges (tuple): Optional arrays from edge_arrays, to reuse across calls.
+
+    Returns:
+    tuple(list, array): The distance to every vertex (INFINITY if
+    unreachable), an int if every weight is, and the index of the previous
+    vertex on its shortest path (-1 if there is none).
+
+    Raises:
+    NegativeCycleError: If a negative cycle is reachable from the source.
+    """
+    vertex_count = len(frozen)
+    sources, targets, weights = edges or edge_arrays(frozen)
+    distances = [INFINITY] * vertex_count
+    previous = array('q', [-1]) * vertex_count
+    distances[source] = 0
+
+    for _ in range(vertex_count):
+        relaxed = -1
+
+        for edge_source, target, weight in zip(sources, targets, weights):
+            candidate = distances[edge_source] + weight
+
+            if candidate < distances[target]:
+                distances[target] = candidate
+                previous[target] = edge_source
+                relaxed = target
+
+        if relaxed < 0:
+            return distances, previous
+    # Still relaxing after |V| rounds
+    raise NegativeCycleError(_cycle_through(frozen, previous, relaxed))
+
+
+def spfa(frozen, source):
+    """
+    Shortest Path Faster Algorithm: Bellman-Ford driven by a FIFO queue of
+    vertices whose distance improved, so only their edges are relaxed again.
+    Usually close to linear on sparse graphs; worst case O(|V| |E|).
+
+    A shortest path has fewer than |V| edges, so a vertex reached by a path
+    of |V| edges proves a negative cycle; Bellman-Ford is then run to report
+    it.
+
+    Parameters:
+    frozen (WeightedCSRGraph): The graph to search.
+    source (integer): The index of the start vertex.
+
+    Returns:
+    tuple(list, array): As for bellman_ford.
+
+    Raises:
+    NegativeCycleError: If a negative cycle is reachable from the source.
+    """
+    vertex_count = len(frozen)
+    offsets, targets, weights = frozen.offsets, frozen.targets, frozen.weights
+    distances = [INFINITY] * vertex_count
+    previous = array('q', [-1]) * vertex_count
+    # Number of edges on the path that gave each vertex its distance
+    lengths = array('q', [0]) * vertex_count
+    queued = bytearray(vertex_count)
+    distances[source] = 0
+    queued[source] = 1
+    queue = deque((source,))
+
+    while queue:
+        current = queue.popleft()
+        queued[current] = 0
+        distance = distances[current]
+
+        for edge in range(offsets[current], offsets[current+1]):
+            target = targets[edge]
+            candidate = distance + weights[edge]
+
+            if candidate < distances[target]:
+                distances[target] = candidate
+                previous[target] = current
+                lengths[target] = lengths[current] + 1
+
+                if lengths[target] >= vertex_count:
+                    bellman_ford(frozen, source) # raises with the cycle
+                if not queued[target]:
+                    queued[target] = 1
+                    queue.append(target)
+    return distances, previous
@@ -0,0 +1,72 @@
+from graphs.disjoint_set import DisjointSet
+
+# Mutations that can be applied to union-find without a rebuild
+_INCREMENTAL_CHANGES = frozenset(('add_vertex', 'add_edge', 'set_edge_weight'))
+
+
+class ComponentIndex:
+    """ ComponentIndex Class
+    Connected-component labels kept in step with a graph (weakly connected
+    components, for directed graphs). Added vertices and edges are read from
+    Graph.changes_since and applied to a DisjointSet incrementally; removals,
+    which union-find cannot undo, and bulk add_edges_from calls, whose edges
+    aren't logged, fall back to a rebuild.
+    """
+    def __init__(self, graph):
+        """
+        Label the components of `graph`.
+
+        Parameters:
+        graph (Graph): The graph to follow.
+        """
+        self.__graph = graph
+        self.__rebuild()
+
+    def __rebuild(self):
+        """Recompute every label from the current graph."""
+        vertices = self.__graph.get_vertices()
+        self.__id_to_index = {vertex.get_id(): index
+                              for index, vertex in enumerate(vertices)}
+        self.__groups = DisjointSet(len(vertices))
+
+        for index, vertex in enumerate(vertices):
+            for neighbor in vertex.get_neighbors():
+                self.__groups.union(index, self.__id_to_index[neighbor.get_id()])
+        self.__version = self.__graph.version
+
+    def refresh(self):
+        """
+        Bring the labels up to date with the graph.
+
+        Returns:
+        boolean: True if the update was incremental, False if it rebuilt.
+        """
+        changes = self.__graph.changes_since(self.__version)
+
+        if changes is None or any(operation not in _INCREMENTAL_CHANGES or
+                                  (operation == 'add_vertex' and
+                                   args[0] in self.__id_to_index)
+                                  for _, operation, args in changes):
+            self.__rebuild()
+            return False
+
+        for _, operation, args in changes:
+            if operation == 'add_vertex':
+                self.__id_to_index[args[0]] = self.__groups.add()
+            elif operation == 'add_edge':
+                self.__groups.union(self.__id_to_index[args[0]],
+                                    self.__id_to_index[args[1]])
+        self.__version = self.__graph.version
+        return True
+
+    @property
+    def component_count(self):
+        """Return the number of connected components."""
+        self.refresh()
+        return self.__groups.component_count
+
+    def connected(self, vertex_id1, vertex_id2):
+        """Return True if the two vertices are in the same component."""
+        self.refresh()
+        return self.__groups.connected(self.__id_to_index[vertex_id1],
+                                       self.__id_to_index[vertex_id2])
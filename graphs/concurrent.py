@@ -0,0 +1,99 @@
+"""
+Read-copy-update access to a graph shared between threads.
+
+Readers take the current snapshot, an immutable CSRGraph, and traverse it
+without any locking; a snapshot never changes once published. Writers apply
+a batch of mutations to a private Graph under a lock and then publish a fresh
+snapshot by swapping a single reference, so a reader sees either the whole
+batch or none of it. Readers holding an older snapshot keep using it safely
+until they ask for a new one.
+
+Publishing rebuilds the snapshot in O(|V| + |E|), so writers should group
+mutations into as few batches as they can.
+"""
+import threading
+from contextlib import contextmanager
+
+from graphs.graph import Graph
+
+
+class ConcurrentGraph:
+    """ ConcurrentGraph Class
+    A Graph whose readers use lock-free immutable snapshots while writers
+    batch mutations and publish a new snapshot atomically.
+    """
+    def __init__(self, graph=None):
+        """
+        Initialize from an existing graph, which should no longer be used
+        directly, or from a new empty directed Graph.
+
+        Parameters:
+        graph (Graph): The graph to take ownership of.
+        """
+        self.__graph = Graph() if graph is None else graph
+        self.__write_lock = threading.Lock()
+        # (version, snapshot), replaced as a whole on every publish
+        self.__published = (self.__graph.version, self.__graph.freeze())
+
+    @property
+    def snapshot(self):
+        """
+        Return the latest published snapshot. Reading it needs no lock; keep
+        the returned object for the duration of a query so that every step
+        sees the same graph.
+
+        Returns:
+        CSRGraph: The immutable snapshot (a WeightedCSRGraph for weighted
+        graphs).
+        """
+        return self.__published[1]
+
+    @property
+    def version(self):
+        """Return the graph version the current snapshot was taken at."""
+        return self.__published[0]
+
+    @contextmanager
+    def batch(self):
+        """
+        Mutate the graph as one atomic update: the block gets exclusive
+        access to the underlying Graph, and its changes are published as a
+        single new snapshot when it exits. If the block raises, the changes
+        it made before the error are still published.
+
+            with concurrent_graph.batch() as graph:
+                graph.add_edges_from(edges)
+
+        Yields:
+        Graph: The graph to mutate. Don't keep it after the block.
+        """
+        with self.__write_lock:
+            try:
+                yield self.__graph
+            finally:
+                self.__publish()
+
+    def __publish(self):
+        """Freeze and swap in a new snapshot if the graph has changed."""
+        if self.__graph.version != self.__published[0]:
+            # Rebinding one attribute is atomic, so readers see the old
+            # snapshot or the new one, never a mix
+            self.__published = (self.__graph.version, self.__graph.freeze())
+
+    def add_vertex(self, vertex_id):
+        """Add a vertex and publish it; see Graph.add_vertex."""
+        with self.batch() as graph:
+            graph.add_vertex(vertex_id)
+
+    def add_edge(self, *edge):
+        """Add an edge and publish it; see Graph.add_edge."""
+        with self.batch() as graph:
+            graph.add_edge(*edge)
+
+    def add_edges_from(self, edges, create_missing=False):
+        """
+        Add many edges and publish them as one snapshot; see
+        Graph.add_edges_from.
+        """
+        with self.batch() as graph:
+            return graph.add_edges_from(edges, create_missing)
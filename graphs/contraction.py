@@ -0,0 +1,375 @@
+"""
+Contraction hierarchies for repeated point-to-point shortest path queries on a
+fixed weighted graph.
+
+Preprocessing contracts the vertices one at a time, least important first.
+Contracting a vertex removes it and adds a shortcut edge u -> w, of weight
+w(u, v) + w(v, w), for every pair of neighbors whose only shortest path ran
+through it. The contraction order is a vertex's rank. A query then runs
+Dijkstra's Algorithm forward from the start and backward from the target, each
+only following edges to higher-ranked vertices, which touches a tiny fraction
+of the graph.
+"""
+from array import array
+from heapq import heapify, heappop, heappush
+
+INFINITY = float('inf')
+
+# Vertices a witness search may settle before giving up and assuming no
+# witness exists; lower is faster to build but adds more shortcuts.
+WITNESS_SETTLE_LIMIT = 100
+
+
+def _witness_distances(out_edges, source, skipped, limit, targets):
+    """
+    Dijkstra's Algorithm from `source` over the remaining graph without the
+    vertex `skipped`, stopping once every target is settled, the distance
+    passes `limit` or WITNESS_SETTLE_LIMIT vertices are settled. Tentative
+    distances are upper bounds, so they are returned as well.
+    """
+    distances = {source: 0}
+    heap = [(0, source)]
+    remaining = len(targets)
+    settled = 0
+
+    while heap and remaining and settled < WITNESS_SETTLE_LIMIT:
+        distance, current = heappop(heap)
+
+        if distance > distances[current]:
+            continue # stale entry
+        if distance > limit:
+            break
+        settled += 1
+
+        if current in targets:
+            remaining -= 1
+
+        for neighbor, (weight, _) in out_edges[current].items():
+            new_distance = distance + weight
+
+            if (neighbor != skipped and
+                new_distance < distances.get(neighbor, INFINITY)):
+                distances[neighbor] = new_distance
+                heappush(heap, (new_distance, neighbor))
+    return distances
+
+
+def _shortcuts(out_edges, in_edges, vertex):
+    """
+    Return the (source, target, weight) shortcuts needed to contract `vertex`
+    without lengthening any shortest path between the remaining vertices.
+    """
+    shortcuts = []
+
+    for source, (in_weight, _) in in_edges[vertex].items():
+        candidates = {target: in_weight + out_weight
+                      for target, (out_weight, _) in out_edges[vertex].items()
+                      if target != source}
+
+        if not candidates:
+            continue
+        witnesses = _witness_distances(out_edges, source, vertex,
+                                       max(candidates.values()), candidates)
+
+        for target, weight in candidates.items():
+            if witnesses.get(target, INFINITY) > weight:
+                shortcuts.append((source, target, weight))
+    return shortcuts
+
+
+def _pack(rows, typecode):
+    """
+    Flatten per-vertex lists of (neighbor, (weight, middle)) pairs into CSR
+    offsets, targets, weights and middles arrays, with weights of `typecode`.
+    """
+    offsets = array('q', [0])
+    targets = array('q')
+    weights = array(typecode)
+    middles = array('q')
+
+    for row in rows:
+        for neighbor, (weight, middle) in row:
+            targets.append(neighbor)
+            weights.append(weight)
+            middles.append(middle)
+        offsets.append(len(targets))
+    return offsets, targets, weights, middles
+
+
+class ContractionHierarchy:
+    """ ContractionHierarchy Class
+    The rank of every vertex plus two CSR edge sets over vertex indices: the
+    upward edges out of each vertex, for forward searches, and the upward
+    edges into each vertex, stored reversed, for backward searches. Each edge
+    has a `middle` array entry holding the contracted vertex a shortcut
+    bypasses, or -1 for an original edge, so paths can be unpacked.
+    """
+    def __init__(self, vertex_ids, ranks, up, down, is_directed=True):
+        """
+        Initialize a hierarchy from prebuilt arrays.
+
+        Parameters:
+        vertex_ids (iterable): Vertex ids, in index order.
+        ranks (sequence<int>): The contraction order of each vertex.
+        up (tuple): (offsets, targets, weights, middles) of the edges from
+                    each vertex to higher-ranked vertices.
+        down (tuple): (offsets, sources, weights, middles) of the edges into
+                      each vertex from higher-ranked vertices.
+        is_directed (boolean): Whether the source graph was directed.
+        """
+        self._vertex_ids = tuple(vertex_ids)
+        self._index_of = {vertex_id: index
+                          for index, vertex_id in enumerate(self._vertex_ids)}
+        self._ranks = ranks
+        self._up = up
+        self._down = down
+        self._is_directed = is_directed
+
+        for offsets, targets, weights, middles in (up, down):
+            if len(offsets) != len(self._vertex_ids) + 1:
+                raise ValueError("offsets must have one entry per vertex plus one")
+            if not len(targets) == len(weights) == len(middles):
+                raise ValueError("targets, weights and middles must be parallel")
+
+    @classmethod
+    def build(cls, frozen):
+        """
+        Contract every vertex of a frozen weighted graph. Vertices are ordered
+        by edge difference (shortcuts added minus edges removed) plus the
+        number of already contracted neighbors, which spreads contraction
+        evenly; priorities are refreshed lazily when a vertex is popped.
+
+        Parameters:
+        frozen (WeightedCSRGraph): The graph to preprocess. Edge weights must
+                                   not be negative.
+
+        Returns:
+        ContractionHierarchy: The hierarchy.
+        """
+        vertex_count = len(frozen)
+        offsets, targets, weights = frozen.offsets, frozen.targets, frozen.weights
+        # Remaining graph: vertex -> {neighbor: (weight, middle)}
+        out_edges = [{} for _ in range(vertex_count)]
+        in_edges = [{} for _ in range(vertex_count)]
+
+        for source in range(vertex_count):
+            for edge in range(offsets[source], offsets[source+1]):
+                target, weight = targets[edge], weights[edge]
+
+                if weight < 0:
+                    raise ValueError("Contraction hierarchies need non-negative weights")
+                if target != source and weight < out_edges[source].get(
+                        target, (INFINITY,))[0]:
+                    out_edges[source][target] = (weight, -1)
+                    in_edges[target][source] = (weight, -1)
+
+        contracted_neighbors = array('q', [0]) * vertex_count
+
+        def priority(vertex, shortcuts):
+            return (len(shortcuts) - len(out_edges[vertex]) -
+                    len(in_edges[vertex]) + contracted_neighbors[vertex])
+
+        heap = [(priority(vertex, _shortcuts(out_edges, in_edges, vertex)),
+                 vertex) for vertex in range(vertex_count)]
+        heapify(heap)
+        ranks = array('q', [0]) * vertex_count
+        up_rows = [None] * vertex_count
+        down_rows = [None] * vertex_count
+        rank = 0
+
+        while heap:
+            _, vertex = heappop(heap)
+            shortcuts = _shortcuts(out_edges, in_edges, vertex)
+            current_priority = priority(vertex, shortcuts)
+
+            if heap and current_priority > heap[0][0]:
+                heappush(heap, (current_priority, vertex))
+                continue # no longer the least important vertex
+
+            for source, target, weight in shortcuts:
+                if weight < out_edges[source].get(target, (INFINITY,))[0]:
+                    out_edges[source][target] = (weight, vertex)
+                    in_edges[target][source] = (weight, vertex)
+
+            # Every remaining neighbor will be ranked higher than this vertex
+            ranks[vertex] = rank
+            rank += 1
+            up_rows[vertex] = list(out_edges[vertex].items())
+            down_rows[vertex] = list(in_edges[vertex].items())
+
+            for target in out_edges[vertex]:
+                del in_edges[target][vertex]
+                contracted_neighbors[target] += 1
+            for source in in_edges[vertex]:
+                del out_edges[source][vertex]
+                contracted_neighbors[source] += 1
+            out_edges[vertex] = in_edges[vertex] = None
+
+        typecode = frozen.weight_typecode
+        return cls(frozen.vertex_ids, ranks, _pack(up_rows, typecode),
+                   _pack(down_rows, typecode), frozen.is_directed)
+
+    @property
+    def is_directed(self):
+        return self._is_directed
+
+    @property
+    def vertex_ids(self):
+        """Return the vertex ids, in index order."""
+        return self._vertex_ids
+
+    @property
+    def ranks(self):
+        return self._ranks
+
+    @property
+    def up(self):
+        return self._up
+
+    @property
+    def down(self):
+        return self._down
+
+    @property
+    def shortcut_count(self):
+        """Return the number of shortcut edges added by preprocessing."""
+        return sum(1 for edges in (self._up, self._down)
+                   for middle in edges[3] if middle >= 0)
+
+    def __len__(self):
+        return len(self._vertex_ids)
+
+    def contains_id(self, vertex_id):
+        return vertex_id in self._index_of
+
+    def _search(self, start, target):
+        """
+        Bidirectional upward Dijkstra. A direction stops once its smallest
+        tentative distance can't improve the best meeting point found.
+
+        Returns:
+        tuple: (distance, meeting vertex, forward parents, backward parents),
+        where parents map a vertex to (previous vertex, edge), or None if the
+        target is unreachable.
+        """
+        searches = tuple(({vertex: 0}, {vertex: None}, [(0, vertex)], edges)
+                         for vertex, edges in ((start, self._up),
+                                               (target, self._down)))
+        best, meeting = INFINITY, None
+
+        while True:
+            # Expand whichever live direction has the smaller distance
+            live = [side for side in (0, 1)
+                    if searches[side][2] and searches[side][2][0][0] < best]
+
+            if not live:
+                break
+            side = min(live, key=lambda side: searches[side][2][0][0])
+            distances, parents, heap, edges = searches[side]
+            other_distances = searches[1 - side][0]
+            distance, current = heappop(heap)
+
+            if distance > distances[current]:
+                continue # stale entry
+            if current in other_distances:
+                total = distance + other_distances[current]
+
+                if total < best:
+                    best, meeting = total, current
+            offsets, neighbors, weights, _ = edges
+
+            for edge in range(offsets[current], offsets[current+1]):
+                neighbor = neighbors[edge]
+                new_distance = distance + weights[edge]
+
+                if new_distance < distances.get(neighbor, INFINITY):
+                    distances[neighbor] = new_distance
+                    parents[neighbor] = (current, edge)
+                    heappush(heap, (new_distance, neighbor))
+
+        if meeting is None:
+            return None
+        return best, meeting, searches[0][1], searches[1][1]
+
+    def _unpack(self, edges, edge, source, target):
+        """
+        Expand one hierarchy edge from `source` to `target` into the original
+        vertices between them, excluding `source`.
+        """
+        path = []
+        stack = [(edges[3][edge], source, target)]
+
+        while stack:
+            middle, source, target = stack.pop()
+
+            if middle < 0:
+                path.append(target)
+                continue
+            # The middle vertex ranks below both ends, so source -> middle is
+            # a down edge into it and middle -> target an up edge out of it
+            first = self._find_edge(self._down, middle, source)
+            second = self._find_edge(self._up, middle, target)
+            stack.append((self._up[3][second], middle, target))
+            stack.append((self._down[3][first], source, middle))
+        return path
+
+    @staticmethod
+    def _find_edge(edges, vertex, neighbor):
+        """Return the position of the edge between `vertex` and `neighbor`."""
+        offsets, neighbors = edges[0], edges[1]
+
+        for edge in range(offsets[vertex], offsets[vertex+1]):
+            if neighbors[edge] == neighbor:
+                return edge
+        raise ValueError("Hierarchy is missing an edge a shortcut relies on")
+
+    def find_shortest_path_with_distance(self, start_id, target_id):
+        """
+        Find the shortest weighted path from a start vertex to a destination.
+
+        Returns:
+        tuple(number, list<string>): The total weight of the path and the
+        vertex ids along it, from start to end, or None if there is no path.
+        """
+        if not self.contains_id(start_id) or not self.contains_id(target_id):
+            raise KeyError("One or both vertices are not in the graph!")
+        start, target = self._index_of[start_id], self._index_of[target_id]
+        result = self._search(start, target)
+
+        if result is None: # path not found
+            return None
+        distance, meeting, forward_parents, backward_parents = result
+
+        # Walk the forward search back to the start, then unpack its edges
+        hops = []
+        vertex = meeting
+
+        while forward_parents[vertex] is not None:
+            previous, edge = forward_parents[vertex]
+            hops.append((self._up, edge, previous, vertex))
+            vertex = previous
+        hops.reverse()
+        vertex = meeting
+
+        while backward_parents[vertex] is not None:
+            following, edge = backward_parents[vertex]
+            hops.append((self._down, edge, vertex, following))
+            vertex = following
+
+        path = [start]
+
+        for edges, edge, source, target in hops:
+            path.extend(self._unpack(edges, edge, source, target))
+        vertex_ids = self._vertex_ids
+        return distance, [vertex_ids[index] for index in path]
+
+    def find_shortest_path(self, start_id, target_id):
+        """
+        Return the total weight of the shortest path from a start vertex to a
+        destination, or None if it is unreachable.
+        """
+        if not self.contains_id(start_id) or not self.contains_id(target_id):
+            raise KeyError("One or both vertices are not in the graph!")
+        result = self._search(self._index_of[start_id],
+                              self._index_of[target_id])
+        return None if result is None else result[0]
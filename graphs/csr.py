@@ -0,0 +1,692 @@
+from array import array
+from collections import deque
+from heapq import heappop, heappush
+
+from graphs.parallel_components import label_components
+
+# Sources expanded together by find_vertices_n_away_batch, one bit each
+BFS_BATCH_WIDTH = 256
+
+
+def _positions(vertices, index_bound):
+    """
+    Map the graph's interned vertex indices, which may have gaps left by
+    removed vertices, to dense positions 0..len(vertices)-1.
+    """
+    positions = array('q', [-1]) * index_bound
+
+    for position, vertex in enumerate(vertices):
+        positions[vertex.index] = position
+    return positions
+
+
+def _check_targets(targets):
+    """
+    Raise ValueError if an edge led to a vertex the graph no longer holds,
+    which _positions leaves mapped to -1.
+    """
+    if -1 in targets:
+        raise ValueError("Graph has an edge to a vertex that is not in it")
+
+
+class CSRGraph:
+    """ CSRGraph Class
+    An immutable, array-backed snapshot of a Graph in compressed sparse row
+    form. Vertices are numbered 0..n-1 in the order given by `vertex_ids`; the
+    neighbors of vertex `i` are `targets[offsets[i]:offsets[i+1]]`.
+
+    Traversals walk the integer arrays directly, so read-heavy workloads don't
+    pay for Vertex objects, per-visit tuples or string hashing.
+    """
+    def __init__(self, vertex_ids, offsets, targets, is_directed=True):
+        """
+        Initialize a snapshot from prebuilt arrays.
+
+        Parameters:
+        vertex_ids (iterable): Vertex ids, in index order.
+        offsets (sequence<int>): len(vertex_ids) + 1 row offsets into targets.
+        targets (sequence<int>): Neighbor indices, grouped by source vertex.
+        is_directed (boolean): Whether the source graph was directed.
+        """
+        self._vertex_ids = tuple(vertex_ids)
+        self._index_of = {vertex_id: index
+                          for index, vertex_id in enumerate(self._vertex_ids)}
+        self._offsets = offsets
+        self._targets = targets
+        self._is_directed = is_directed
+
+        if len(offsets) != len(self._vertex_ids) + 1:
+            raise ValueError("offsets must have one entry per vertex plus one")
+
+    @classmethod
+    def from_graph(cls, graph):
+        """
+        Build a snapshot of `graph`. Later changes to `graph` are not
+        reflected in the snapshot.
+
+        Parameters:
+        graph (Graph): The graph to freeze.
+
+        Returns:
+        CSRGraph: The frozen graph.
+        """
+        vertices = graph.get_vertices()
+        positions = _positions(vertices, graph.index_bound)
+        offsets = array('q', [0])
+        targets = array('q')
+
+        for vertex in vertices:
+            targets.extend(positions[neighbor.index]
+                           for neighbor in vertex.get_neighbors())
+            offsets.append(len(targets))
+        _check_targets(targets)
+        return cls((vertex.get_id() for vertex in vertices), offsets, targets,
+                   graph.is_directed)
+
+    @property
+    def is_directed(self):
+        return self._is_directed
+
+    @property
+    def vertex_ids(self):
+        """Return the vertex ids, in index order."""
+        return self._vertex_ids
+
+    @property
+    def offsets(self):
+        return self._offsets
+
+    @property
+    def targets(self):
+        return self._targets
+
+    def __len__(self):
+        return len(self._vertex_ids)
+
+    def __str__(self):
+        """Return a string representation of the graph."""
+        return (f'CSRGraph with {len(self)} vertices and '
+                f'{len(self._targets)} adjacency entries')
+
+    def __repr__(self):
+        """Return a string representation of the graph."""
+        return self.__str__()
+
+    def contains_id(self, vertex_id):
+        return vertex_id in self._index_of
+
+    def index_of(self, vertex_id):
+        """Return the integer index of `vertex_id`."""
+        if vertex_id not in self._index_of:
+            raise KeyError(f"Vertex {vertex_id!r} is not in the graph!")
+        return self._index_of[vertex_id]
+
+    def get_neighbors(self, vertex_id):
+        """Return the ids of the neighbors of `vertex_id`."""
+        index = self.index_of(vertex_id)
+        vertex_ids, targets = self._vertex_ids, self._targets
+        return tuple(vertex_ids[targets[edge]]
+                     for edge in range(self._offsets[index],
+                                       self._offsets[index+1]))
+
+    def _bfs_order(self, start, max_depth=None):
+        """
+        Yield (index, depth, parent index) triples in breadth-first order from
+        `start`, whose parent is -1.
+        """
+        offsets, targets = self._offsets, self._targets
+        seen = bytearray(len(self._vertex_ids))
+        seen[start] = 1
+        queue = deque(((start, 0, -1),))
+
+        while queue:
+            current, depth, parent = queue.popleft()
+            yield current, depth, parent
+
+            if max_depth is not None and depth >= max_depth:
+                continue
+
+            for edge in range(offsets[current], offsets[current+1]):
+                neighbor = targets[edge]
+
+                if not seen[neighbor]:
+                    seen[neighbor] = 1
+                    queue.append((neighbor, depth+1, current))
+
+    def iter_bfs(self, start_id, max_depth=None):
+        """
+        Lazily traverse the graph using breadth-first search.
+
+        Parameters:
+        start_id (string): The id of the start vertex.
+        max_depth (integer): Optional limit on the depth of yielded vertices.
+
+        Yields:
+        tuple(string, integer, string): The vertex id, its depth and its
+        parent's id (None for the start).
+        """
+        vertex_ids = self._vertex_ids
+
+        for index, depth, parent in self._bfs_order(self.index_of(start_id),
+                                                    max_depth):
+            yield (vertex_ids[index], depth,
+                   vertex_ids[parent] if parent != -1 else None)
+
+    def iter_dfs(self, start_id, max_depth=None):
+        """
+        Lazily traverse the graph using depth-first search, visiting neighbors
+        in adjacency order.
+
+        Parameters:
+        start_id (string): The id of the start vertex.
+        max_depth (integer): Optional limit on the depth of yielded vertices.
+
+        Yields:
+        tuple(string, integer, string): The vertex id, its depth in the DFS
+        tree and its parent's id (None for the start).
+        """
+        offsets, targets, vertex_ids = (self._offsets, self._targets,
+                                        self._vertex_ids)
+        seen = bytearray(len(vertex_ids))
+        stack = [(self.index_of(start_id), 0, -1)]
+
+        while stack:
+            current, depth, parent = stack.pop()
+
+            if seen[current]:
+                continue
+            seen[current] = 1
+            yield (vertex_ids[current], depth,
+                   vertex_ids[parent] if parent != -1 else None)
+
+            if max_depth is not None and depth >= max_depth:
+                continue
+            # Push in reverse so the first neighbor is visited first
+            stack.extend((targets[edge], depth+1, current)
+                         for edge in reversed(range(offsets[current],
+                                                    offsets[current+1]))
+                         if not seen[targets[edge]])
+
+    def bfs_traversal(self, start_id, visitor=None, max_depth=None):
+        """
+        Traverse the graph using breadth-first search.
+
+        Parameters:
+        start_id (string): The id of the start vertex.
+        visitor (callable): Called as visitor(vertex_id, depth, parent_id) for
+                            each vertex; returning False stops the traversal.
+                            Defaults to printing each vertex id.
+        max_depth (integer): Optional limit on the depth of visited vertices.
+        """
+        if not self.contains_id(start_id):
+            raise KeyError("One or both vertices are not in the graph!")
+        if visitor is None:
+            visitor = lambda vertex_id, depth, parent_id: print(
+                'Processing vertex {}'.format(vertex_id))
+
+        for vertex_id, depth, parent_id in self.iter_bfs(start_id, max_depth):
+            if visitor(vertex_id, depth, parent_id) is False:
+                break
+
+    def find_shortest_path(self, start_id, target_id):
+        """
+        Find and return the shortest (fewest edges) path from start_id to
+        target_id.
+
+        Parameters:
+        start_id (string): The id of the start vertex.
+        target_id (string): The id of the target (end) vertex.
+
+        Returns:
+        list<string>: A list of all vertex ids in the shortest path, from start
+        to end, or None if there is no path.
+        """
+        if not self.contains_id(start_id) or not self.contains_id(target_id):
+            raise KeyError("One or both vertices are not in the graph!")
+        offsets, targets = self._offsets, self._targets
+        start, target = self._index_of[start_id], self._index_of[target_id]
+        # -1 marks unvisited; the start vertex is its own parent
+        parents = array('q', [-1]) * len(self._vertex_ids)
+        parents[start] = start
+        queue = deque((start,))
+
+        while queue and parents[target] == -1:
+            current = queue.popleft()
+
+            for edge in range(offsets[current], offsets[current+1]):
+                neighbor = targets[edge]
+
+                if parents[neighbor] == -1:
+                    parents[neighbor] = current
+                    queue.append(neighbor)
+
+        if parents[target] == -1: # path not found
+            return None
+        return self._walk_parents(parents, start, target)
+
+    def _walk_parents(self, parents, start, target):
+        """Rebuild the id path from start to target out of a parent array."""
+        path = [target]
+
+        while path[-1] != start:
+            path.append(parents[path[-1]])
+        return [self._vertex_ids[index] for index in reversed(path)]
+
+    def find_vertices_n_away(self, start_id, target_distance):
+        """
+        Find and return all vertices n distance away.
+
+        Arguments:
+        start_id (string): The id of the start vertex.
+        target_distance (integer): The distance from the start vertex we are looking for
+
+        Returns:
+        list<string>: All vertex ids that are `target_distance` away from the start vertex
+        """
+        if not self.contains_id(start_id):
+            raise KeyError("One or both vertices are not in the graph!")
+        vertices = []
+
+        for index, depth, _ in self._bfs_order(self._index_of[start_id],
+                                               target_distance):
+            if depth == target_distance:
+                vertices.append(self._vertex_ids[index])
+        return vertices
+
+    def find_vertices_n_away_batch(self, queries):
+        """
+        Answer many find_vertices_n_away queries at once. Sources are expanded
+        together by a bit-parallel breadth-first search: every vertex carries
+        an integer bitmask with one bit per source, so a vertex reached from
+        several sources in the same level is expanded once for all of them.
+
+        Arguments:
+        queries (iterable): (start_id, target_distance) pairs.
+
+        Returns:
+        list<list<string>>: For each query, in order, the vertex ids exactly
+        `target_distance` away from its start vertex, in index order rather
+        than discovery order.
+        """
+        queries = list(queries)
+
+        for start_id, _ in queries:
+            if not self.contains_id(start_id):
+                raise KeyError(f"{start_id!r} is not in the graph!")
+        results = [[] for _ in queries]
+
+        for first in range(0, len(queries), BFS_BATCH_WIDTH):
+            self._n_away_batch(queries[first:first+BFS_BATCH_WIDTH],
+                               results[first:first+BFS_BATCH_WIDTH])
+        return results
+
+    def _n_away_batch(self, queries, results):
+        """
+        Run one bit-parallel search for up to BFS_BATCH_WIDTH queries, bit `i`
+        standing for queries[i], and append the answers to results[i].
+        """
+        offsets, targets = self._offsets, self._targets
+        seen = [0] * len(self._vertex_ids)
+        level_bits = [0] * len(self._vertex_ids) # bits first reached this level
+        frontier = []
+        finishing = {} # distance -> bits of the queries answered there
+        active = 0
+
+        for position, (start_id, target_distance) in enumerate(queries):
+            bit = 1 << position
+            start = self._index_of[start_id]
+
+            if not level_bits[start]:
+                frontier.append(start)
+            seen[start] |= bit
+            level_bits[start] |= bit
+
+            if target_distance >= 0:
+                finishing[target_distance] = (finishing.get(target_distance, 0)
+                                              | bit)
+                active |= bit
+        depth = 0
+
+        while frontier:
+            done = finishing.get(depth, 0)
+
+            if done:
+                for index in sorted(frontier):
+                    hits = level_bits[index] & done
+
+                    while hits:
+                        lowest = hits & -hits
+                        results[lowest.bit_length() - 1].append(
+                            self._vertex_ids[index])
+                        hits ^= lowest
+                active &= ~done
+
+            if not active:
+                break
+            next_bits = [0] * len(self._vertex_ids)
+            next_frontier = []
+
+            # Advance every source still short of its distance by one level
+            for index in frontier:
+                bits = level_bits[index] & active
+
+                if not bits:
+                    continue
+                for neighbor in targets[offsets[index]:offsets[index+1]]:
+                    seen_bits = seen[neighbor]
+
+                    if bits | seen_bits != seen_bits:
+                        if not next_bits[neighbor]:
+                            next_frontier.append(neighbor)
+                        seen[neighbor] = bits | seen_bits
+                        next_bits[neighbor] |= bits & ~seen_bits
+            level_bits = next_bits
+            frontier = next_frontier
+            depth += 1
+
+    def find_connected_components(self):
+        """
+        Return a list of all connected components, with each connected component
+        represented as a list of vertex ids.
+        """
+        offsets, targets = self._offsets, self._targets
+        seen = bytearray(len(self._vertex_ids))
+        connected_components = []
+
+        for root in range(len(self._vertex_ids)):
+            if seen[root]:
+                continue
+            seen[root] = 1
+            component = [root]
+            stack = [root]
+
+            while stack:
+                current = stack.pop()
+
+                for edge in range(offsets[current], offsets[current+1]):
+                    neighbor = targets[edge]
+
+                    if not seen[neighbor]:
+                        seen[neighbor] = 1
+                        component.append(neighbor)
+                        stack.append(neighbor)
+            connected_components.append([self._vertex_ids[index]
+                                         for index in component])
+        return connected_components
+
+    def component_labels(self, processes=None):
+        """
+        Label the connected components (weakly connected, if directed) using
+        a pool of worker processes; see graphs.parallel_components.
+
+        Parameters:
+        processes (integer): Worker processes to use, defaulting to the CPU
+                             count. Small graphs are labelled in-process.
+
+        Returns:
+        ComponentLabels: `labels[i]` is the component of `vertex_ids[i]` and
+        `sizes[c]` is the number of vertices in component `c`.
+        """
+        return label_components(self, processes)
+
+    def topological_sort(self):
+        """
+        Use Kahn's Algorithm by working through vertices with an in-degree of
+        0, counting in-degrees with one pass over the targets array.
+        """
+        offsets, targets = self._offsets, self._targets
+        indegrees = array('q', [0]) * len(self._vertex_ids)
+
+        for target in targets:
+            indegrees[target] += 1
+        ready = [index for index, indegree in enumerate(indegrees)
+                 if indegree == 0]
+        order = []
+
+        while ready:
+            current = ready.pop()
+            order.append(current)
+
+            for edge in range(offsets[current], offsets[current+1]):
+                neighbor = targets[edge]
+                indegrees[neighbor] -= 1
+
+                if indegrees[neighbor] == 0:
+                    ready.append(neighbor)
+
+        if len(order) != len(self._vertex_ids):
+            raise ValueError("Graph must be acyclic")
+        return [self._vertex_ids[index] for index in order]
+
+    def _tarjan(self, break_on_cycle=False):
+        """
+        Tarjan's Algorithm with an explicit stack of (vertex, neighbor
+        iterator) frames instead of recursion, so path length is bounded only
+        by memory. Time: O(|V| + |E|)
+
+        Returns:
+        list<list<int>>: Components as vertex indices, in reverse topological
+        order, or None if break_on_cycle is True and a cycle is detected.
+        """
+        offsets, targets = self._offsets, self._targets
+        vertex_count = len(self._vertex_ids)
+        # Discovery order of each vertex; -1 marks unvisited
+        discovery = array('q', [-1]) * vertex_count
+        lowlink = array('q', [0]) * vertex_count
+        on_stack = bytearray(vertex_count)
+        stack = [] # Tarjan's stack of vertices in the current search
+        components = []
+        counter = 0
+
+        for root in range(vertex_count):
+            if discovery[root] != -1:
+                continue
+            discovery[root] = lowlink[root] = counter
+            counter += 1
+            stack.append(root)
+            on_stack[root] = 1
+            frames = [(root, iter(targets[offsets[root]:offsets[root+1]]))]
+
+            while frames:
+                vertex, neighbors = frames[-1]
+
+                for neighbor in neighbors:
+                    if discovery[neighbor] == -1:
+                        ## Descend into the unvisited neighbor; this frame
+                        ## resumes from its iterator once the neighbor is done
+                        discovery[neighbor] = lowlink[neighbor] = counter
+                        counter += 1
+                        stack.append(neighbor)
+                        on_stack[neighbor] = 1
+                        frames.append((neighbor, iter(
+                            targets[offsets[neighbor]:offsets[neighbor+1]])))
+                        break
+                    if on_stack[neighbor] and discovery[neighbor] < lowlink[vertex]:
+                        lowlink[vertex] = discovery[neighbor]
+                else:
+                    ## All neighbors are finished: propagate the low-link value
+                    ## to the parent frame and close the component if this
+                    ## vertex started it
+                    frames.pop()
+
+                    if frames:
+                        parent = frames[-1][0]
+
+                        if lowlink[vertex] < lowlink[parent]:
+                            lowlink[parent] = lowlink[vertex]
+
+                    if lowlink[vertex] == discovery[vertex]:
+                        component = []
+                        member = -1
+
+                        while member != vertex:
+                            member = stack.pop()
+                            on_stack[member] = 0
+                            component.append(member)
+
+                        if break_on_cycle and (len(component) > 1 or vertex in
+                                               targets[offsets[vertex]:offsets[vertex+1]]):
+                            # Cycle (or self-loop) detected
+                            return
+                        components.append(component)
+        return components
+
+    def strongly_connected_components(self, break_on_cycle=False):
+        """
+        Return the strongly connected components of the graph.
+
+        Arguments:
+            break_on_cycle: If graph is detected to be cyclic, exit function
+                            early.
+
+        Returns:
+            Tuple of strongly connected components, each a tuple of vertex ids,
+            in reverse topological order (every edge between two components
+            points from a later component to an earlier one), or None if
+            break_on_cycle is True and a cycle is detected.
+        """
+        components = self._tarjan(break_on_cycle)
+
+        if components is None:
+            return
+        vertex_ids = self._vertex_ids
+        return tuple(tuple(vertex_ids[index] for index in component)
+                     for component in components)
+
+    def condensation(self):
+        """
+        Collapse every strongly connected component into a single vertex.
+
+        Returns:
+        tuple(tuple, CSRGraph): The components, as returned by
+        strongly_connected_components, and a directed acyclic CSRGraph whose
+        vertex ids are positions in that tuple.
+        """
+        offsets, targets = self._offsets, self._targets
+        components = self._tarjan()
+        component_of = array('q', [0]) * len(self._vertex_ids)
+
+        for component_id, component in enumerate(components):
+            for index in component:
+                component_of[index] = component_id
+
+        dag_offsets = array('q', [0])
+        dag_targets = array('q')
+
+        for component_id, component in enumerate(components):
+            successors = {component_of[targets[edge]]
+                          for index in component
+                          for edge in range(offsets[index], offsets[index+1])}
+            successors.discard(component_id)
+            dag_targets.extend(sorted(successors))
+            dag_offsets.append(len(dag_targets))
+
+        vertex_ids = self._vertex_ids
+        return (tuple(tuple(vertex_ids[index] for index in component)
+                      for component in components),
+                CSRGraph(range(len(components)), dag_offsets, dag_targets))
+
+
+class WeightedCSRGraph(CSRGraph):
+    """ WeightedCSRGraph Class
+    A CSRGraph with a `weights` array parallel to `targets`. Snapshots of
+    graphs whose weights are all integers keep them in an array('q'), so
+    distances stay exact integers; any other weight makes it an array('d').
+    """
+    def __init__(self, vertex_ids, offsets, targets, weights, is_directed=True):
+        """
+        Initialize a snapshot from prebuilt arrays.
+
+        Parameters:
+        vertex_ids (iterable): Vertex ids, in index order.
+        offsets (sequence<int>): len(vertex_ids) + 1 row offsets into targets.
+        targets (sequence<int>): Neighbor indices, grouped by source vertex.
+        weights (sequence<number>): Edge weights, parallel to targets.
+        is_directed (boolean): Whether the source graph was directed.
+        """
+        super().__init__(vertex_ids, offsets, targets, is_directed)
+
+        if len(weights) != len(targets):
+            raise ValueError("weights must be parallel to targets")
+        self._weights = weights
+
+    @classmethod
+    def from_graph(cls, graph):
+        """
+        Build a snapshot of the weighted `graph`. Later changes to `graph` are
+        not reflected in the snapshot.
+
+        Parameters:
+        graph (WeightedGraph): The graph to freeze.
+
+        Returns:
+        WeightedCSRGraph: The frozen graph.
+        """
+        vertices = graph.get_vertices()
+        positions = _positions(vertices, graph.index_bound)
+        offsets = array('q', [0])
+        targets = array('q')
+        weights = array('q')
+
+        for vertex in vertices:
+            for neighbor, weight in vertex.get_neighbors_with_weights():
+                targets.append(positions[neighbor.index])
+
+                try:
+                    weights.append(weight)
+                except (TypeError, OverflowError): # not a 64-bit integer
+                    weights = array('d', weights)
+                    weights.append(weight)
+            offsets.append(len(targets))
+        _check_targets(targets)
+        return cls((vertex.get_id() for vertex in vertices), offsets, targets,
+                   weights, graph.is_directed)
+
+    @property
+    def weights(self):
+        return self._weights
+
+    @property
+    def weight_typecode(self):
+        """Return the typecode of the weights: 'q' (integers) or 'd'."""
+        weights = self._weights
+        # Memory-mapped snapshots hold a memoryview, which has no typecode
+        return getattr(weights, 'typecode', None) or weights.format
+
+    def get_neighbors_with_weights(self, vertex_id):
+        """Return (neighbor id, weight) pairs for `vertex_id`."""
+        index = self.index_of(vertex_id)
+        vertex_ids, targets, weights = (self._vertex_ids, self._targets,
+                                        self._weights)
+        return [(vertex_ids[targets[edge]], weights[edge])
+                for edge in range(self._offsets[index], self._offsets[index+1])]
+
+    def find_shortest_path(self, start_id, target_id):
+        """
+        Use Dijkstra's Algorithm to return the total weight of the shortest path
+        from a start vertex to a destination, or None if it is unreachable.
+        """
+        if not self.contains_id(start_id) or not self.contains_id(target_id):
+            raise KeyError("One or both vertices are not in the graph!")
+        offsets, targets, weights = self._offsets, self._targets, self._weights
+        start, target = self._index_of[start_id], self._index_of[target_id]
+        # A list rather than an array('d'), so integer distances stay exact
+        distances = [float('inf')] * len(self._vertex_ids)
+        distances[start] = 0
+        heap = [(0, start)]
+
+        while heap:
+            distance, current = heappop(heap)
+
+            if distance > distances[current]:
+                continue # stale entry
+            if current == target:
+                return distance
+
+            for edge in range(offsets[current], offsets[current+1]):
+                neighbor = targets[edge]
+                new_distance = distance + weights[edge]
+
+                if new_distance < distances[neighbor]:
+                    distances[neighbor] = new_distance
+                    heappush(heap, (new_distance, neighbor))
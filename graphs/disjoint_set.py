@@ -0,0 +1,82 @@
+from array import array
+
+
+class DisjointSet:
+    """ DisjointSet Class
+    Union-find over the integers 0..n-1, stored in flat arrays. `find` is
+    iterative with full path compression and `union` links the smaller tree
+    under the larger one, so operations run in near-constant amortized time
+    without recursion.
+    """
+    def __init__(self, size=0):
+        """
+        Initialize `size` singleton sets.
+
+        Parameters:
+        size (integer): The number of elements to start with.
+        """
+        self.__parents = array('q', range(size))
+        self.__sizes = array('q', [1]) * size
+        self.__component_count = size
+
+    def __len__(self):
+        """Return the number of elements."""
+        return len(self.__parents)
+
+    @property
+    def component_count(self):
+        """Return the number of disjoint sets."""
+        return self.__component_count
+
+    def add(self):
+        """
+        Add a new singleton set and return its element.
+
+        Returns:
+        integer: The new element.
+        """
+        element = len(self.__parents)
+        self.__parents.append(element)
+        self.__sizes.append(1)
+        self.__component_count += 1
+        return element
+
+    def find(self, element):
+        """Get the root (or, group label) for element."""
+        parents = self.__parents
+        root = element
+
+        while parents[root] != root:
+            root = parents[root]
+
+        # Point every element on the walked path straight at the root
+        while parents[element] != root:
+            parents[element], element = root, parents[element]
+        return root
+
+    def union(self, element1, element2):
+        """
+        Combine element1 and element2 into the same group.
+
+        Returns:
+        boolean: True if they were in different groups before the call.
+        """
+        root1 = self.find(element1)
+        root2 = self.find(element2)
+
+        if root1 == root2:
+            return False
+        if self.__sizes[root1] < self.__sizes[root2]:
+            root1, root2 = root2, root1
+        self.__parents[root2] = root1
+        self.__sizes[root1] += self.__sizes[root2]
+        self.__component_count -= 1
+        return True
+
+    def connected(self, element1, element2):
+        """Return True if element1 and element2 are in the same group."""
+        return self.find(element1) == self.find(element2)
+
+    def component_size(self, element):
+        """Return the size of the group containing element."""
+        return self.__sizes[self.find(element)]
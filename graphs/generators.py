@@ -0,0 +1,186 @@
+"""
+Seeded synthetic graphs for tests and benchmarks. Vertex ids are the integers
+0..vertex_count-1 and every generator is deterministic for a given seed.
+"""
+import random
+
+from graphs.graph import Graph
+from graphs.weighted_graph import WeightedGraph
+
+
+def _build(vertex_count, edges, is_directed, weighted, rng):
+    """
+    Create a Graph, or a WeightedGraph with uniform random weights in
+    [1, 100], holding vertices 0..vertex_count-1 and `edges`.
+    """
+    if weighted:
+        graph = WeightedGraph(is_directed=is_directed)
+        edges = [(id1, id2, rng.randint(1, 100)) for id1, id2 in edges]
+    else:
+        graph = Graph(is_directed=is_directed)
+    graph.add_vertices_from(range(vertex_count))
+    graph.add_edges_from(edges)
+    return graph
+
+
+def erdos_renyi(vertex_count, edge_count, is_directed=True, weighted=False,
+                seed=0):
+    """
+    Uniform random graph with exactly `edge_count` distinct edges and no
+    self-loops (the G(n, m) model).
+
+    Parameters:
+    vertex_count (integer): The number of vertices.
+    edge_count (integer): The number of edges.
+    is_directed (boolean): Whether the graph is directed.
+    weighted (boolean): Whether to return a WeightedGraph.
+    seed (integer): Seed for the random number generator.
+
+    Returns:
+    Graph: The generated graph.
+    """
+    rng = random.Random(seed)
+    pair_count = vertex_count * (vertex_count - 1)
+
+    if not is_directed:
+        pair_count //= 2
+    if edge_count > pair_count:
+        raise ValueError(f"At most {pair_count} edges fit in "
+                         f"{vertex_count} vertices")
+    seen = set()
+    edges = []
+
+    while len(edges) < edge_count:
+        id1 = rng.randrange(vertex_count)
+        id2 = rng.randrange(vertex_count)
+
+        if id1 == id2:
+            continue
+        key = (id1, id2) if is_directed or id1 < id2 else (id2, id1)
+
+        if key not in seen:
+            seen.add(key)
+            edges.append((id1, id2))
+    return _build(vertex_count, edges, is_directed, weighted, rng)
+
+
+def barabasi_albert(vertex_count, edges_per_vertex, is_directed=False,
+                    weighted=False, seed=0):
+    """
+    Scale-free graph grown by preferential attachment: each new vertex links
+    to `edges_per_vertex` distinct earlier vertices chosen with probability
+    proportional to their degree. Directed edges point from new to old.
+
+    Parameters:
+    vertex_count (integer): The number of vertices.
+    edges_per_vertex (integer): Edges added with each new vertex.
+    is_directed (boolean): Whether the graph is directed.
+    weighted (boolean): Whether to return a WeightedGraph.
+    seed (integer): Seed for the random number generator.
+
+    Returns:
+    Graph: The generated graph.
+    """
+    if not 1 <= edges_per_vertex < vertex_count:
+        raise ValueError("edges_per_vertex must be between 1 and "
+                         "vertex_count - 1")
+    rng = random.Random(seed)
+    ## Every vertex appears here once per edge it touches
+    endpoints = list(range(edges_per_vertex))
+    edges = []
+
+    for new_id in range(edges_per_vertex, vertex_count):
+        targets = set()
+
+        while len(targets) < edges_per_vertex:
+            targets.add(rng.choice(endpoints))
+
+        for target_id in sorted(targets):
+            edges.append((new_id, target_id))
+            endpoints.append(target_id)
+            endpoints.append(new_id)
+    return _build(vertex_count, edges, is_directed, weighted, rng)
+
+
+def grid(rows, columns, is_directed=False, weighted=False, seed=0):
+    """
+    Rows x columns lattice; vertex r*columns+c is joined to its right and
+    lower neighbors.
+
+    Parameters:
+    rows (integer): The number of rows.
+    columns (integer): The number of columns.
+    is_directed (boolean): Whether the graph is directed.
+    weighted (boolean): Whether to return a WeightedGraph.
+    seed (integer): Seed for the random weights.
+
+    Returns:
+    Graph: The generated graph.
+    """
+    edges = []
+
+    for row in range(rows):
+        for column in range(columns):
+            vertex_id = row * columns + column
+
+            if column + 1 < columns:
+                edges.append((vertex_id, vertex_id + 1))
+            if row + 1 < rows:
+                edges.append((vertex_id, vertex_id + columns))
+    return _build(rows * columns, edges, is_directed, weighted,
+                  random.Random(seed))
+
+
+def chain(vertex_count, is_directed=True, weighted=False, seed=0):
+    """
+    A single path 0 -> 1 -> ... -> vertex_count-1, the worst case for
+    recursive searches.
+
+    Parameters:
+    vertex_count (integer): The number of vertices.
+    is_directed (boolean): Whether the graph is directed.
+    weighted (boolean): Whether to return a WeightedGraph.
+    seed (integer): Seed for the random weights.
+
+    Returns:
+    Graph: The generated graph.
+    """
+    edges = [(vertex_id, vertex_id + 1) for vertex_id in range(vertex_count - 1)]
+    return _build(vertex_count, edges, is_directed, weighted,
+                  random.Random(seed))
+
+
+def random_dag(vertex_count, edge_count, weighted=False, seed=0):
+    """
+    Directed acyclic graph with `edge_count` distinct edges, each from a
+    smaller id to a larger one.
+
+    Parameters:
+    vertex_count (integer): The number of vertices.
+    edge_count (integer): The number of edges.
+    weighted (boolean): Whether to return a WeightedGraph.
+    seed (integer): Seed for the random number generator.
+
+    Returns:
+    Graph: The generated graph.
+    """
+    rng = random.Random(seed)
+
+    if edge_count > vertex_count * (vertex_count - 1) // 2:
+        raise ValueError(f"At most {vertex_count * (vertex_count - 1) // 2} "
+                         f"edges fit in a DAG of {vertex_count} vertices")
+    seen = set()
+    edges = []
+
+    while len(edges) < edge_count:
+        id1 = rng.randrange(vertex_count)
+        id2 = rng.randrange(vertex_count)
+
+        if id1 == id2:
+            continue
+        edge = (min(id1, id2), max(id1, id2))
+
+        if edge not in seen:
+            seen.add(edge)
+            edges.append(edge)
+    return _build(vertex_count, edges, True, weighted, rng)
@@ -1,19 +1,33 @@
-from collections import defaultdict, deque, namedtuple
+from array import array
+from collections import deque
+
+from graphs import serialization
+from graphs.csr import CSRGraph
+from graphs.query_cache import QueryCache, cached_query
 
 class Vertex(object):
     """
     Defines a single vertex and its neighbors.
     """
+    ## Slots instead of a per-instance __dict__; large graphs hold millions
+    __slots__ = ('id', 'index', 'neighbors_dict', '__predecessors_dict',
+                 '__in_degree')
 
-    def __init__(self, vertex_id):
+    def __init__(self, vertex_id, track_predecessors=False, index=None):
         """
         Initialize a vertex and its neighbors dictionary.
 
         Parameters:
         vertex_id (string): A unique identifier to identify this vertex.
+        track_predecessors (boolean): Whether to also store the vertices with
+                                      an edge into this one.
+        index (integer): The dense integer the owning graph interned the id to.
         """
         self.id = vertex_id
-        self.__neighbors_dict = {} # id -> object
+        self.index = index
+        self.neighbors_dict = {} # object -> edge weight (None if unweighted)
+        self.__predecessors_dict = {} if track_predecessors else None # object -> None
+        self.__in_degree = 0
 
     def __lt__(self, other_vertex):
         return self.get_id() < other_vertex.get_id()
@@ -24,14 +38,79 @@ class Vertex(object):
 
         Parameters:
         vertex_obj (Vertex): An instance of Vertex to be stored as a neighbor.
+
+        Returns:
+        boolean: True if the neighbor was not already present.
         """
-        if vertex_obj.get_id() in self.__neighbors_dict:
-            return
-        self.__neighbors_dict[vertex_obj.get_id()] = vertex_obj
+        if vertex_obj in self.neighbors_dict:
+            return False
+        self.neighbors_dict[vertex_obj] = None
+        vertex_obj.add_predecessor(self)
+        return True
+
+    def remove_neighbor(self, vertex_obj):
+        """
+        Remove a neighbor from the neighbors dictionary.
+
+        Parameters:
+        vertex_obj (Vertex): The neighbor to remove.
+
+        Returns:
+        boolean: True if it was a neighbor.
+        """
+        if vertex_obj not in self.neighbors_dict:
+            return False
+        del self.neighbors_dict[vertex_obj]
+        vertex_obj.remove_predecessor(self)
+        return True
+
+    def add_predecessor(self, vertex_obj):
+        """
+        Record a new edge from `vertex_obj` into this vertex. Called by
+        `add_neighbor`, which guarantees the edge is new.
+
+        Parameters:
+        vertex_obj (Vertex): The vertex the edge starts at.
+        """
+        self.__in_degree += 1
+
+        if self.__predecessors_dict is not None:
+            self.__predecessors_dict[vertex_obj] = None
+
+    def remove_predecessor(self, vertex_obj):
+        """
+        Forget an edge from `vertex_obj` into this vertex. Called by
+        `remove_neighbor`, which guarantees the edge existed.
+
+        Parameters:
+        vertex_obj (Vertex): The vertex the edge started at.
+        """
+        self.__in_degree -= 1
+
+        if self.__predecessors_dict is not None:
+            del self.__predecessors_dict[vertex_obj]
+
+    def has_predecessors_tracked(self):
+        """Return True if this vertex stores its predecessors."""
+        return self.__predecessors_dict is not None
+
+    def get_predecessors(self):
+        """Return the vertices with an edge into this vertex."""
+        if self.__predecessors_dict is None:
+            raise ValueError(f"Predecessors of {self.id!r} are not tracked")
+        return tuple(self.__predecessors_dict)
+
+    def get_in_degree(self):
+        """Return the number of edges into this vertex."""
+        return self.__in_degree
+
+    def get_out_degree(self):
+        """Return the number of edges out of this vertex."""
+        return len(self.neighbors_dict)
 
     def __str__(self):
         """Output the list of neighbors of this vertex."""
-        neighbor_ids = list(self.neighbors_dict.keys())
+        neighbor_ids = [neighbor.get_id() for neighbor in self.neighbors_dict]
         return f'{self.id} adjacent to {neighbor_ids}'
 
     def __repr__(self):
@@ -40,7 +119,7 @@ class Vertex(object):
 
     def get_neighbors(self):
         """Return the neighbors of this vertex."""
-        return tuple(self.__neighbors_dict.values())
+        return tuple(self.neighbors_dict)
 
     def get_id(self):
         """Return the id of this vertex."""
@@ -52,32 +131,148 @@ class Graph:
     """ Graph Class
     Represents a directed or undirected graph.
     """
-    def __init__(self, is_directed=True):
+    # Number of recent changes kept for changes_since
+    CHANGE_LOG_SIZE = 1024
+
+    # Class of the vertex objects the graph creates
+    vertex_class = Vertex
+
+    # Class of the snapshots returned by freeze
+    snapshot_class = CSRGraph
+
+    def __init__(self, is_directed=True, track_predecessors=False):
         """
         Initialize a graph object with an empty vertex dictionary.
 
         Parameters:
         is_directed (boolean): Whether the graph is directed (edges go in only one direction).
+        track_predecessors (boolean): Whether every vertex keeps a reverse
+                                      adjacency index of its predecessors.
         """
         self.__vertex_dict = {} # id -> object
         self.__is_directed = is_directed
+        self.__track_predecessors = track_predecessors
+        self.__version = 0
+        self.__changes = deque(maxlen=self.CHANGE_LOG_SIZE)
+        self.__index_bound = 0
+        self.__query_cache = None
+        # (version, predecessor lists) built by _adjacent(reverse=True)
+        self.__reverse_index = (None, None)
+        # (version, snapshot) last returned by freeze
+        self.__snapshot = (None, None)
 
     @property
     def is_directed(self):
         return self.__is_directed
 
+    @property
+    def track_predecessors(self):
+        return self.__track_predecessors
+
+    @property
+    def index_bound(self):
+        """
+        Return one more than the largest vertex index handed out so far.
+        Vertex ids are interned to dense integers (`Vertex.index`) when they
+        are added, so algorithms can keep per-vertex state in arrays of this
+        length instead of dictionaries keyed by id.
+        """
+        return self.__index_bound
+
+    def _new_index(self):
+        """Intern a new vertex by handing out the next free index."""
+        self.__index_bound += 1
+        return self.__index_bound - 1
+
+    @property
+    def version(self):
+        """
+        Return a counter that increases every time the graph is mutated.
+        Derived results can store the version they were computed at and
+        compare it to tell whether they are stale.
+        """
+        return self.__version
+
+    def _record_change(self, operation, *args):
+        """Bump the version and log the mutation for changes_since."""
+        self.__version += 1
+        self.__changes.append((self.__version, operation, args))
+
+    @property
+    def query_cache(self):
+        """Return the graph's QueryCache, or None if caching is disabled."""
+        return self.__query_cache
+
+    def enable_query_cache(self, maxsize=128):
+        """
+        Start caching the results of find_shortest_path, topological_sort and
+        strongly_connected_components, keyed by method and arguments. Results
+        are discarded as soon as the graph is mutated.
+
+        Parameters:
+        maxsize (integer): The most results to keep; the least recently used
+                           one is evicted first.
+
+        Returns:
+        QueryCache: The new cache.
+        """
+        self.__query_cache = QueryCache(maxsize)
+        return self.__query_cache
+
+    def disable_query_cache(self):
+        """Stop caching query results and drop the cache."""
+        self.__query_cache = None
+
+    def cache_info(self):
+        """
+        Return the query cache statistics, or None if caching is disabled.
+
+        Returns:
+        CacheInfo: Hits, misses, evictions, invalidations, maxsize and
+        currsize.
+        """
+        if self.__query_cache is None:
+            return None
+        return self.__query_cache.info()
+
+    def changes_since(self, version):
+        """
+        Return the mutations made after `version`, so derived structures can
+        apply them incrementally instead of recomputing from scratch.
+
+        Parameters:
+        version (integer): A value previously read from `version`.
+
+        Returns:
+        list<tuple>: (version, operation, args) tuples, oldest first, where
+        operation is the name of the mutating method and args its arguments.
+        None if the log no longer reaches back to `version`.
+        """
+        if version >= self.__version:
+            return []
+        if not self.__changes or self.__changes[0][0] > version + 1:
+            return None # older changes have been discarded
+        return [change for change in self.__changes if change[0] > version]
+
     def add_vertex(self, vertex_id):
         """
         Add a new vertex object to the graph with the given key and return the vertex.
+        If the id is already in the graph, the existing vertex is returned unchanged.
 
         Parameters:
         vertex_id (string): The unique identifier for the new vertex.
 
         Returns:
-        Vertex: The new vertex object.
+        Vertex: The new (or existing) vertex object.
         """
-        new_vertex = Vertex(vertex_id)
+        existing = self.__vertex_dict.get(vertex_id)
+
+        if existing is not None:
+            return existing
+        new_vertex = self.vertex_class(vertex_id, self.__track_predecessors,
+                                       self._new_index())
         self.__vertex_dict[vertex_id] = new_vertex
+        self._record_change('add_vertex', vertex_id)
         return new_vertex
 
 
@@ -97,10 +292,153 @@ class Graph:
             return
         vertex1 = self.get_vertex(vertex_id1)
         vertex2 = self.get_vertex(vertex_id2)
-        vertex1.add_neighbor(vertex2)
+
+        if not vertex1.add_neighbor(vertex2):
+            return # the edge already exists
 
         if not self.__is_directed:
             vertex2.add_neighbor(vertex1)
+        self._record_change('add_edge', vertex_id1, vertex_id2)
+
+    def remove_edge(self, vertex_id1, vertex_id2):
+        """
+        Remove the edge from vertex with id `vertex_id1` to vertex with id
+        `vertex_id2`. Time: O(1)
+
+        Parameters:
+        vertex_id1 (string): The unique identifier of the first vertex.
+        vertex_id2 (string): The unique identifier of the second vertex.
+
+        Returns:
+        boolean: True if the edge existed.
+        """
+        if not (self.contains_id(vertex_id1) and self.contains_id(vertex_id2)):
+            return False
+        vertex1 = self.get_vertex(vertex_id1)
+        vertex2 = self.get_vertex(vertex_id2)
+
+        if not vertex1.remove_neighbor(vertex2):
+            return False
+
+        if not self.is_directed:
+            vertex2.remove_neighbor(vertex1)
+        self._record_change('remove_edge', vertex_id1, vertex_id2)
+        return True
+
+    def _detach_vertex(self, vertex_id):
+        """
+        Remove every edge into and out of the vertex with id `vertex_id`.
+        O(degree) for undirected graphs or when predecessors are tracked;
+        otherwise the vertices are scanned for edges into it, stopping once
+        its in-degree's worth are found, which is O(|V|) at worst.
+        """
+        if not self.contains_id(vertex_id):
+            raise KeyError(f"Vertex {vertex_id!r} is not in the graph!")
+        vertex = self.get_vertex(vertex_id)
+
+        if not self.__is_directed or self.__track_predecessors:
+            predecessors = self._adjacent(reverse=True)(vertex)
+        else:
+            predecessors = []
+            remaining = vertex.get_in_degree()
+
+            for other in self.__vertex_dict.values():
+                if not remaining:
+                    break
+                if vertex in other.neighbors_dict:
+                    predecessors.append(other)
+                    remaining -= 1
+
+        for predecessor in list(predecessors):
+            predecessor.remove_neighbor(vertex)
+
+        for neighbor in vertex.get_neighbors():
+            vertex.remove_neighbor(neighbor)
+
+    def remove_vertex(self, vertex_id):
+        """
+        Remove the vertex with id `vertex_id` and all of its edges.
+
+        Parameters:
+        vertex_id (string): The unique identifier of the vertex.
+        """
+        self._detach_vertex(vertex_id)
+        del self.__vertex_dict[vertex_id]
+        self._record_change('remove_vertex', vertex_id)
+
+    def add_vertices_from(self, vertex_ids):
+        """
+        Add a vertex for every id in `vertex_ids` that isn't already in the
+        graph.
+
+        Parameters:
+        vertex_ids (iterable<string>): The unique identifiers of the vertices.
+        """
+        vertex_dict = self.__vertex_dict
+        vertex_class = self.vertex_class
+        track_predecessors = self.__track_predecessors
+        record_change = self._record_change
+
+        for vertex_id in vertex_ids:
+            if vertex_id not in vertex_dict:
+                vertex_dict[vertex_id] = vertex_class(vertex_id,
+                                                      track_predecessors,
+                                                      self._new_index())
+                record_change('add_vertex', vertex_id)
+
+    def add_edges_from(self, edges, create_missing=False):
+        """
+        Add many edges at once. Vertex lookups go straight to the vertex
+        dictionary, per-call attribute lookups are hoisted out of the loop and
+        the whole call is logged as a single change. Each edge still goes
+        through Vertex.add_neighbor, so this is only modestly faster than
+        repeated add_edge (about 1.1-1.6x, depending on the graph).
+
+        changes_since reports the call as one 'add_edges_from' change whose
+        only argument is the number of edges added, so bulk loads don't fill
+        the change log. If a row raises, the edges added before it are still
+        recorded.
+
+        Parameters:
+        edges (iterable): (vertex_id1, vertex_id2) pairs, or for a
+                          WeightedGraph (vertex_id1, vertex_id2, weight)
+                          triples, or an array-like of such rows with a
+                          `tolist` method, such as a NumPy array.
+        create_missing (boolean): Whether to add endpoints that aren't in the
+                                  graph yet; otherwise such edges are skipped,
+                                  as in add_edge.
+
+        Returns:
+        integer: The number of edges that were added.
+        """
+        if hasattr(edges, 'tolist'):
+            edges = edges.tolist()
+        get_vertex = self.__vertex_dict.get
+        is_directed = self.__is_directed
+        added = 0
+
+        try:
+            # `weight` is empty for unweighted edges and (weight,) otherwise
+            for vertex_id1, vertex_id2, *weight in edges:
+                vertex1 = get_vertex(vertex_id1)
+                vertex2 = get_vertex(vertex_id2)
+
+                if vertex1 is None or vertex2 is None:
+                    if not create_missing:
+                        continue
+                    self.add_vertices_from((vertex_id1, vertex_id2))
+                    vertex1 = get_vertex(vertex_id1)
+                    vertex2 = get_vertex(vertex_id2)
+
+                if vertex1.add_neighbor(vertex2, *weight):
+                    if not is_directed:
+                        vertex2.add_neighbor(vertex1, *weight)
+                    added += 1
+        finally:
+            # Edges already applied must invalidate caches even on error
+            if added:
+                self._record_change('add_edges_from', added)
+        return added
 
     def get_vertices(self):
         """
@@ -114,6 +452,69 @@ class Graph:
     def contains_id(self, vertex_id):
         return vertex_id in self.__vertex_dict
 
+    def get_predecessors(self, vertex_id):
+        """
+        Return the vertices with an edge into the vertex with id `vertex_id`.
+        This is a lookup when predecessors are tracked, and a scan of every
+        edge otherwise.
+
+        Parameters:
+        vertex_id (string): The unique identifier of the vertex.
+
+        Returns:
+        tuple<Vertex>: The predecessor vertex objects.
+        """
+        if not self.contains_id(vertex_id):
+            raise KeyError(f"Vertex {vertex_id!r} is not in the graph!")
+        vertex = self.get_vertex(vertex_id)
+
+        if vertex.has_predecessors_tracked():
+            return vertex.get_predecessors()
+        return tuple(other for other in self.get_vertices()
+                     if vertex in other.get_neighbors())
+
+    def freeze(self):
+        """
+        Return an immutable, array-backed snapshot of the graph for read-heavy
+        traversal. Later changes to this graph are not reflected in it.
+
+        Building a snapshot takes O(|V| + |E|), so the last one is kept and
+        returned again until the graph changes.
+
+        Returns:
+        CSRGraph: The frozen graph (a WeightedCSRGraph for weighted graphs).
+        """
+        version, snapshot = self.__snapshot
+
+        if version != self.__version:
+            snapshot = self.snapshot_class.from_graph(self)
+            self.__snapshot = (self.__version, snapshot)
+        return snapshot
+
+    def save(self, filename):
+        """
+        Write a snapshot of the graph to `filename` in the binary graph
+        format. Vertex ids are stored as strings.
+
+        Parameters:
+        filename (string): The path of the file to write.
+        """
+        serialization.save(self.freeze(), filename)
+
+    @staticmethod
+    def load(filename):
+        """
+        Memory-map a graph saved with `save`. Loading only maps the file, so
+        it is near-instant and processes loading the same file share memory.
+
+        Parameters:
+        filename (string): The path of the file to read.
+
+        Returns:
+        CSRGraph: The read-only graph (a WeightedCSRGraph if it has weights).
+        """
+        return serialization.load(filename)
+
     def __str__(self):
         """Return a string representation of the graph."""
         return f'Graph with vertices: {self.get_vertices()}'
@@ -122,122 +523,273 @@ class Graph:
         """Return a string representation of the graph."""
         return self.__str__()
 
-    def bfs_traversal(self, start_id):
+    def _adjacent(self, reverse=False):
         """
-        Traverse the graph using breadth-first search.
+        Return a function mapping a vertex object to the vertices one edge away
+        from it, following edges backward if `reverse` is True. Without
+        tracked predecessors, reversing builds a reverse index with a single
+        pass over every edge, which is kept until the graph next changes.
+        """
+        if not reverse or not self.is_directed:
+            return lambda vertex: vertex.get_neighbors()
+        if self.track_predecessors:
+            return lambda vertex: vertex.get_predecessors()
+        version, predecessors = self.__reverse_index
+
+        if version != self.__version:
+            predecessors = [[] for _ in range(self.index_bound)]
+
+            for vertex in self.get_vertices():
+                for neighbor in vertex.get_neighbors():
+                    predecessors[neighbor.index].append(vertex)
+            self.__reverse_index = (self.__version, predecessors)
+        return lambda vertex: predecessors[vertex.index]
+
+    def iter_bfs(self, start_id, max_depth=None, reverse=False):
+        """
+        Lazily traverse the graph using breadth-first search. Neighbors of a
+        vertex are only expanded once the caller asks for the next vertex, so
+        breaking out of the loop stops the traversal.
+
+        Parameters:
+        start_id (string): The id of the start vertex.
+        max_depth (integer): Optional limit on the depth of yielded vertices.
+        reverse (boolean): Whether to follow edges backward.
+
+        Yields:
+        tuple(string, integer, string): The vertex id, its depth (number of
+        edges from the start) and its parent's id (None for the start).
         """
         if not self.contains_id(start_id):
             raise KeyError("One or both vertices are not in the graph!")
+        adjacent = self._adjacent(reverse)
 
-        # Keep a set to denote which vertices we've seen before
-        seen = set()
-        seen.add(start_id)
+        # Flag the indices of the vertices we've seen before
+        seen = bytearray(self.index_bound)
+        start_vertex = self.get_vertex(start_id)
+        seen[start_vertex.index] = 1
 
         # Keep a queue so that we visit vertices in the appropriate order
-        queue = deque()
-        queue.append(self.get_vertex(start_id))
+        queue = deque(((start_vertex, 0, None),))
 
         while queue:
-            current_vertex_obj = queue.popleft()
+            current_vertex_obj, depth, parent_id = queue.popleft()
             current_vertex_id = current_vertex_obj.get_id()
+            yield current_vertex_id, depth, parent_id
 
-            # Process current node
-            print('Processing vertex {}'.format(current_vertex_id))
+            if max_depth is not None and depth >= max_depth:
+                continue
 
             # Add its neighbors to the queue
-            for neighbor in current_vertex_obj.get_neighbors():
-                if neighbor.get_id() not in seen:
-                    seen.add(neighbor.get_id())
-                    queue.append(neighbor)
+            for neighbor in adjacent(current_vertex_obj):
+                index = neighbor.index
 
-        return # everything has been processed
+                if not seen[index]:
+                    seen[index] = 1
+                    queue.append((neighbor, depth+1, current_vertex_id))
 
-    def is_bipartite(self):
+    def iter_dfs(self, start_id, max_depth=None, reverse=False):
         """
-        Return True if the graph is bipartite, and False otherwise.
+        Lazily traverse the graph using depth-first search, visiting neighbors
+        in insertion order.
+
+        Parameters:
+        start_id (string): The id of the start vertex.
+        max_depth (integer): Optional limit on the depth of yielded vertices.
+        reverse (boolean): Whether to follow edges backward.
+
+        Yields:
+        tuple(string, integer, string): The vertex id, its depth in the DFS
+        tree and its parent's id (None for the start).
         """
-        def bfs(node):
-            queue = deque(((node, 0),))
+        if not self.contains_id(start_id):
+            raise KeyError("One or both vertices are not in the graph!")
+        adjacent = self._adjacent(reverse)
+        seen = bytearray(self.index_bound)
+        stack = [(self.get_vertex(start_id), 0, None)]
 
-            while len(queue):
-                cur_node, parity = queue.popleft()
-                cur_node_id = cur_node.get_id()
+        while stack:
+            current_vertex_obj, depth, parent_id = stack.pop()
 
-                for neighbor in cur_node.get_neighbors():
-                    neighbor_id = neighbor.get_id()
+            if seen[current_vertex_obj.index]:
+                continue
+            seen[current_vertex_obj.index] = 1
+            current_vertex_id = current_vertex_obj.get_id()
+            yield current_vertex_id, depth, parent_id
 
-                    if neighbor_id in node_to_parity:
+            if max_depth is not None and depth >= max_depth:
+                continue
+            # Push in reverse so the first neighbor is visited first
+            stack.extend((neighbor, depth+1, current_vertex_id)
+                         for neighbor in reversed(adjacent(current_vertex_obj))
+                         if not seen[neighbor.index])
 
-                        if node_to_parity[neighbor_id] == parity:
-                            return False
-                    else:
-                        queue.append((neighbor, parity^1))
-                node_to_parity[cur_node_id] = parity
-        node_to_parity = {}
+    def bfs_traversal(self, start_id, visitor=None, max_depth=None):
+        """
+        Traverse the graph using breadth-first search.
 
-        for node in self.get_vertices():
+        Parameters:
+        start_id (string): The id of the start vertex.
+        visitor (callable): Called as visitor(vertex_id, depth, parent_id) for
+                            each vertex; returning False stops the traversal.
+                            Defaults to printing each vertex id.
+        max_depth (integer): Optional limit on the depth of visited vertices.
+        """
+        if visitor is None:
+            visitor = lambda vertex_id, depth, parent_id: print(
+                'Processing vertex {}'.format(vertex_id))
 
-            if node.get_id() not in node_to_parity:
-                if bfs(node) is False:
-                    print(node_to_parity)
-                    return False
+        for vertex_id, depth, parent_id in self.iter_bfs(start_id, max_depth):
+            if visitor(vertex_id, depth, parent_id) is False:
+                break
 
-        return True
+    def two_coloring(self):
+        """
+        Split the vertices into two sides so that every edge joins the two
+        sides, treating the edges of a directed graph as undirected. Each
+        vertex is colored when it is first reached and enqueued only once.
+        Time: O(|V| + |E|)
+
+        Returns:
+        tuple(boolean, object): (True, (side0, side1)) with the two lists of
+        vertex ids if the graph is bipartite, and otherwise (False, cycle)
+        with the vertex ids of an odd cycle, in order around the cycle.
+        """
+        # Follow edges both ways, unless they already go both ways
+        adjacents = (self._adjacent(),)
+
+        if self.is_directed:
+            adjacents += (self._adjacent(reverse=True),)
+        # 0 while uncolored, then 1 or 2
+        colors = bytearray(self.index_bound)
+        # Vertex each vertex was colored from, by index
+        parents = [None] * self.index_bound
+        sides = ([], [])
+
+        for root in self.get_vertices():
+            if colors[root.index]:
+                continue
+            colors[root.index] = 1
+            sides[0].append(root.get_id())
+            queue = deque((root,))
+
+            while queue:
+                vertex = queue.popleft()
+                color = colors[vertex.index]
+                neighbor_color = 3 - color
+
+                for adjacent in adjacents:
+                    for neighbor in adjacent(vertex):
+                        index = neighbor.index
+
+                        if not colors[index]:
+                            colors[index] = neighbor_color
+                            parents[index] = vertex
+                            sides[neighbor_color - 1].append(neighbor.get_id())
+                            queue.append(neighbor)
+                        elif colors[index] == color:
+                            return False, self._odd_cycle(parents, vertex,
+                                                          neighbor)
+        return True, sides
+
+    @staticmethod
+    def _odd_cycle(parents, vertex1, vertex2):
+        """
+        Return the odd cycle closed by an edge between two same-colored
+        vertices of a breadth-first coloring. Both are at the same depth of
+        the search tree, so walking their parents in step reaches the common
+        ancestor at the same time.
+        """
+        path1, path2 = [vertex1.get_id()], [vertex2.get_id()]
+
+        while vertex1 is not vertex2:
+            vertex1 = parents[vertex1.index]
+            vertex2 = parents[vertex2.index]
+            path1.append(vertex1.get_id())
+            path2.append(vertex2.get_id())
+        # path1 and path2 both end at the common ancestor
+        return path1 + path2[-2::-1]
+
+    def is_bipartite(self):
+        """
+        Return True if the graph is bipartite, and False otherwise. Edges of
+        a directed graph are treated as undirected; see two_coloring.
+        """
+        return self.two_coloring()[0]
 
 
     def find_path_dfs_iter(self, start_id, target_id):
         """
         Use DFS with a stack to find a path from start_id to target_id.
         """
-        stack = [(start_id, [])]
-        seen = set()
+        if not self.contains_id(start_id) or not self.contains_id(target_id):
+            raise KeyError("One or both vertices are not in the graph!")
+        # Vertex each visited vertex was first reached from, keyed by index; a
+        # dictionary keeps short searches from paying for the whole graph
+        parents = {}
+        stack = [(self.get_vertex(start_id), None)]
 
         while len(stack):
-            cur_id, path = stack.pop()
+            cur_node, parent = stack.pop()
+
+            if cur_node.index in parents:
+                continue
+            parents[cur_node.index] = parent
 
-            if cur_id not in seen:
-                path.append(cur_id)
+            if cur_node.get_id() == target_id:
+                path = []
 
-                if cur_id == target_id:
-                    return path
-                stack.extend(map(lambda node: (node.get_id(), path),
-                                 self.get_vertex(cur_id).get_neighbors()))
-                seen.add(cur_id)
+                while cur_node is not None:
+                    path.append(cur_node.get_id())
+                    cur_node = parents[cur_node.index]
+                return path[::-1]
+            stack.extend((neighbor, cur_node)
+                         for neighbor in reversed(cur_node.get_neighbors())
+                         if neighbor.index not in parents)
 
     def find_connected_components(self):
         """
         Return a list of all connected components, with each connected component
         represented as a list of vertex ids.
         """
-        def bfs(node):
-            visited = []
-            stack = [node]
-
-            while len(stack):
-                cur_node = stack.pop()
-                cur_node_id = cur_node.get_id()
-
-                if cur_node_id not in seen:
-                    visited.append(cur_node_id)
-                    stack.extend(cur_node.get_neighbors())
-                    seen.add(cur_node_id)
-            return visited
-        seen = set()
+        seen = bytearray(self.index_bound)
         connected_components = []
 
         for node in self.get_vertices():
+            if seen[node.index]:
+                continue
+            # Depth-first walk of everything reachable from `node`
+            seen[node.index] = 1
+            component = [node.get_id()]
+            stack = [node]
 
-            if node.get_id() not in seen:
-                component = bfs(node)
-
-                if len(component):
-                    connected_components.append(component)
+            while len(stack):
+                for neighbor in stack.pop().get_neighbors():
+                    index = neighbor.index
+
+                    if not seen[index]:
+                        seen[index] = 1
+                        component.append(neighbor.get_id())
+                        stack.append(neighbor)
+            connected_components.append(component)
         return connected_components
 
+    @cached_query
     def find_shortest_path(self, start_id, target_id):
         """
         Find and return the shortest path from start_id to target_id.
 
+        Runs a bidirectional breadth-first search: one search forward from the
+        start and one backward (along reversed edges) from the target, always
+        expanding whichever frontier is smaller, until they meet. Each vertex
+        only stores its parent, and the path is rebuilt from the meeting point.
+
+        On a directed graph the backward search needs each vertex's
+        predecessors. Unless the graph tracks them (`track_predecessors`), the
+        first query after each change builds a reverse index in O(|V| + |E|);
+        later queries reuse it until the graph changes again. Workloads that
+        interleave edits and queries should track predecessors instead.
+
         Parameters:
         start_id (string): The id of the start vertex.
         target_id (string): The id of the target (end) vertex.
@@ -247,39 +799,77 @@ class Graph:
         """
         if not self.contains_id(start_id) or not self.contains_id(target_id):
             raise KeyError("One or both vertices are not in the graph!")
-
-        # vertex keys we've seen before and their paths from the start vertex
-        vertex_id_to_path = {
-            start_id: [start_id] # only one thing in the path
-        }
-
-        # queue of vertices to visit next
-        queue = deque()
-        queue.append(self.get_vertex(start_id))
-
-        # while queue is not empty
-        while queue:
-            current_vertex_obj = queue.pop() # vertex obj to visit next
-            current_vertex_id = current_vertex_obj.get_id()
-
-            # found target, can stop the loop early
-            if current_vertex_id == target_id:
-                break
-
-            neighbors = current_vertex_obj.get_neighbors()
-            for neighbor in neighbors:
-                if neighbor.get_id() not in vertex_id_to_path:
-                    current_path = vertex_id_to_path[current_vertex_id]
-                    # extend the path by 1 vertex
-                    next_path = current_path + [neighbor.get_id()]
-                    vertex_id_to_path[neighbor.get_id()] = next_path
-                    queue.append(neighbor)
-                    # print(vertex_id_to_path)
-
-        if target_id not in vertex_id_to_path: # path not found
-            return None
-
-        return vertex_id_to_path[target_id]
+        start_vertex = self.get_vertex(start_id)
+        target_vertex = self.get_vertex(target_id)
+
+        if start_vertex is target_vertex:
+            return [start_id]
+        successors = self._adjacent()
+        predecessors = self._adjacent(reverse=True)
+
+        # Parent and distance of every vertex reached by each search, keyed by
+        # vertex index; dictionaries keep the cost proportional to the number
+        # of vertices touched rather than the size of the graph.
+        forward_parents = {start_vertex.index: None}
+        backward_parents = {target_vertex.index: None}
+        forward_depths = {start_vertex.index: 0}
+        backward_depths = {target_vertex.index: 0}
+        forward_frontier, backward_frontier = [start_vertex], [target_vertex]
+
+        while forward_frontier and backward_frontier:
+            if len(forward_frontier) <= len(backward_frontier):
+                frontier, expand = forward_frontier, successors
+                parents, depths = forward_parents, forward_depths
+                other_depths = backward_depths
+            else:
+                frontier, expand = backward_frontier, predecessors
+                parents, depths = backward_parents, backward_depths
+                other_depths = forward_depths
+
+            # Expand one whole level, then pick the best meeting point in it
+            next_frontier = []
+            meeting_vertex = None
+            best_length = None
+
+            for vertex in frontier:
+                depth = depths[vertex.index] + 1
+
+                for neighbor in expand(vertex):
+                    index = neighbor.index
+
+                    if index in parents:
+                        continue
+                    parents[index] = vertex
+                    depths[index] = depth
+                    next_frontier.append(neighbor)
+
+                    if index in other_depths:
+                        length = depth + other_depths[index]
+
+                        if best_length is None or length < best_length:
+                            meeting_vertex, best_length = neighbor, length
+
+            if meeting_vertex is not None:
+                path = []
+                vertex = meeting_vertex
+
+                while vertex is not None:
+                    path.append(vertex.get_id())
+                    vertex = forward_parents[vertex.index]
+                path.reverse()
+                vertex = backward_parents[meeting_vertex.index]
+
+                while vertex is not None:
+                    path.append(vertex.get_id())
+                    vertex = backward_parents[vertex.index]
+                return path
+
+            if frontier is forward_frontier:
+                forward_frontier = next_frontier
+            else:
+                backward_frontier = next_frontier
+
+        return None # path not found
 
     def find_vertices_n_away(self, start_id, target_distance):
         """
@@ -292,68 +882,85 @@ class Graph:
         Returns:
         list<string>: All vertex ids that are `target_distance` away from the start vertex
         """
-        queue = deque([(start_id, 0)])
-        vertices = []
-        seen = set()
+        if not self.contains_id(start_id):
+            raise KeyError("One or both vertices are not in the graph!")
+        if target_distance < 0:
+            return []
+        start_vertex = self.get_vertex(start_id)
+        seen = bytearray(self.index_bound)
+        seen[start_vertex.index] = 1
+        frontier = [start_vertex]
+
+        # Advance one whole BFS level per step
+        for _ in range(target_distance):
+            next_frontier = []
+
+            for vertex in frontier:
+                for neighbor in vertex.get_neighbors():
+                    index = neighbor.index
+
+                    if not seen[index]:
+                        seen[index] = 1
+                        next_frontier.append(neighbor)
+            frontier = next_frontier
+
+            if not frontier:
+                break
+        return [vertex.get_id() for vertex in frontier]
 
-        while len(queue):
-            cur_id, cur_dist = queue.popleft()
+    def find_vertices_n_away_batch(self, queries):
+        """
+        Answer many find_vertices_n_away queries with one bit-parallel
+        multi-source search over a frozen snapshot; see
+        CSRGraph.find_vertices_n_away_batch. The snapshot is reused until the
+        graph changes, so only the first batch after a change pays to build it.
 
-            if cur_id not in seen:
-                if cur_dist == target_distance:
-                    vertices.append(cur_id)
-                elif cur_dist < target_distance:
-                    vertex = self.get_vertex(cur_id)
-                    queue.extend(map(lambda neighbor: (neighbor.get_id(), cur_dist+1),
-                                     vertex.get_neighbors()))
-                seen.add(cur_id)
-        return vertices
+        Arguments:
+        queries (iterable): (start_id, target_distance) pairs.
 
+        Returns:
+        list<list<string>>: The answer to each query, in order.
+        """
+        return self.freeze().find_vertices_n_away_batch(queries)
 
+    @cached_query
     def topological_sort(self):
         """
-        Use Khan's Algorithm by working through nodes with an indegree of 0
+        Use Khan's Algorithm by working through nodes with an indegree of 0.
+        In-degrees are maintained by add_edge, so no pass over the edges is
+        needed to find them.
         """
         sorted_nodes = []
-        seen = set()
-        node_id_to_indegree = {node.get_id(): 0 for node in self.get_vertices()}
+        vertices = self.get_vertices()
+        indegrees = array('q', [0]) * self.index_bound
 
-        for node in self.get_vertices():
-
-            for neighbor in node.get_neighbors():
-                neighbor_id = neighbor.get_id()
-                node_id_to_indegree[neighbor_id] += 1
-        indegree0_nodes = [id for id,indegree in node_id_to_indegree.items()
-                           if indegree == 0]
+        for node in vertices:
+            indegrees[node.index] = node.get_in_degree()
+        indegree0_nodes = [node for node in vertices if indegrees[node.index] == 0]
 
         while len(indegree0_nodes):
-            node_id = indegree0_nodes.pop()
-
-            if node_id not in seen:
-                sorted_nodes.append(node_id)
+            node = indegree0_nodes.pop()
+            sorted_nodes.append(node.get_id())
 
-                for neighbor in self.get_vertex(node_id).get_neighbors():
-                    neighbor_id = neighbor.get_id()
-                    node_id_to_indegree[neighbor_id] -= 1
+            for neighbor in node.get_neighbors():
+                indegrees[neighbor.index] -= 1
 
-                    if node_id_to_indegree[neighbor_id] == 0:
-                        indegree0_nodes.append(neighbor_id)
-                seen.add(node_id)
+                if indegrees[neighbor.index] == 0:
+                    indegree0_nodes.append(neighbor)
 
-        if any(node_id_to_indegree.values()):
+        if len(sorted_nodes) != len(vertices):
             raise ValueError("Graph must be acyclic")
         return sorted_nodes
 
-
-
     def contains_cycle(self):
         return self.strongly_connected_components(break_on_cycle=True) is None
 
+    @cached_query
     def strongly_connected_components(self, break_on_cycle=False):
         """
         Use Tarjan's Algorithm to detect strongly connected components by
-        propogating low-link values thoughout cycles. This fixes the randomness
-        of DFS that restricts low-link values to special cases.
+        propogating low-link values thoughout cycles. The search keeps its own
+        stack, so it works on paths far longer than the recursion limit.
         Time: O(|V| + |E|)
 
         Arguments:
@@ -361,87 +968,18 @@ class Graph:
                             early.
 
         Returns:
-            Tuple of strongly connected components or None if break_on_cycle
-            is True and a cycle is detected.
-        """
-        def dfs(vertex_id):
-            ## When DFS finishes visiting all neighbors of node, check if previous
-            ## node is on stack. If it is, min current node's low-link value
-            ## with previous node's low-link value.
-            nonlocal cur_scc_id, scc_count
-            stack.append(vertex_id)
-            # By creating the vertex_id key in vertexid_to_node_data, it's
-            # incidentally marked as visited
-            vertexid_to_node_data[vertex_id] = NodeData(cur_scc_id, cur_scc_id,
-                                                    True)
-            cur_scc_id += 1
-
-            for neighbor in self.get_vertex(vertex_id).get_neighbors():
-                neighbor_vertex_id = neighbor.get_id()
-
-                if neighbor_vertex_id not in vertexid_to_node_data:
-                    ## neighbor is unvisited
-                    dfs(neighbor_vertex_id)
-
-                if vertexid_to_node_data[neighbor_vertex_id].is_on_stack:
-                    # Change current node's low-link value to min of
-                    # current node's low-link value and neighbor's low-link
-                    # value.
-                    vertexid_to_node_data[vertex_id].lowlink_val = min(
-                        vertexid_to_node_data[vertex_id].lowlink_val,
-                        vertexid_to_node_data[neighbor_vertex_id].lowlink_val)
-
-            cur_node_scc_id = vertexid_to_node_data[vertex_id].scc_id
-            cur_node_lowlink_val = vertexid_to_node_data[vertex_id].lowlink_val
-
-            if (cur_node_scc_id == cur_node_lowlink_val):
-                ## If current node's id equals its low-link value (it has
-                ## started a strongly connected component), then pop nodes off
-                ## stack until current node is reached.
-                scc_count += 1 # New scc found.
-                _vertex_id = stack.pop()
-
-                while _vertex_id != vertex_id:
-                    ## Backtrack; change _vertex_id's low-link value to
-                    ## current vertex_id's scc_id
-                    vertexid_to_node_data[_vertex_id].is_on_stack = False
-                    vertexid_to_node_data[_vertex_id].lowlink_val = cur_node_scc_id
-                    _vertex_id = stack.pop()
-
-                    if break_on_cycle:
-                        # Cycle detected
-                        return
-                    
-        class NodeData:
-            __slots__ = ("scc_id", "lowlink_val", "is_on_stack")
-
-            def __init__(self, scc_id, lowlink_val, is_on_stack):
-                self.scc_id = scc_id
-                self.lowlink_val = lowlink_val
-                self.is_on_stack = is_on_stack
-        node_count = len(self.__vertex_dict)
-        # Map vertex id to strongly connected component (scc) id
-        vertexid_to_node_data = {}
-        stack = [] # Global DFS stack
-        cur_scc_id = 0 # Track current scc id to be assigned
-        scc_count = 0 # Track number of strongly connected components
-
-        for vertex_id, node in self.__vertex_dict.items():
-            if vertex_id not in vertexid_to_node_data:
-                ## Node hasn't been visited
-                ## Use DFS to visit a node, assign it a low-link value and id,
-                ## mark it as visited, and add it to stack
-                dfs(vertex_id)
-
-        if (break_on_cycle and scc_count < node_count or
-            (node_count == 1 and len(self.get_vertices()[0].get_neighbors()) == 1)):
-            # Handle special case where the entire graph is a single connected
-            # component or graph consists of a single node that has a self-loop
-            return
-        # Low-link values which represent distinct strongly connected components
-        lowlink_val_to_vertex_id = defaultdict(list)
+            Tuple of strongly connected components in reverse topological
+            order, or None if break_on_cycle is True and a cycle is detected.
+        """
+        return self.freeze().strongly_connected_components(break_on_cycle)
+
+    def condensation(self):
+        """
+        Collapse every strongly connected component into a single vertex.
 
-        for vertex_id, nodedata in vertexid_to_node_data.items():
-            lowlink_val_to_vertex_id[nodedata.lowlink_val].append(vertex_id)
-        return tuple(map(lambda scc: tuple(scc),
-                         lowlink_val_to_vertex_id.values()))
+        Returns:
+        tuple(tuple, CSRGraph): The strongly connected components in reverse
+        topological order, and the directed acyclic graph between them, whose
+        vertex ids are positions in that tuple.
+        """
+        return self.freeze().condensation()
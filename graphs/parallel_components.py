@@ -0,0 +1,222 @@
+"""
+Connected-component labelling for large frozen graphs, spread over a process
+pool.
+
+The CSR rows are cut into chunks holding roughly equal numbers of edges. Each
+worker runs union-find over its chunk alone and sends back only the edges that
+joined two of its local components: a spanning forest, which has at most
+|V| - 1 edges however many edges the chunk held. The parent process unions
+those forests into one DisjointSet and numbers the resulting components.
+
+That merge is serial, and on sparse graphs each forest is nearly as large as
+its chunk, so the pool is only used when a cost estimate says it beats
+labelling in-process; in practice that takes dense graphs and several CPUs.
+Run benchmarks.bench_components to compare the two on a given machine.
+"""
+from array import array
+from bisect import bisect_left
+from collections import namedtuple
+from multiprocessing import Pool, cpu_count
+
+from graphs.disjoint_set import DisjointSet
+
+ComponentLabels = namedtuple("ComponentLabels", "labels sizes")
+ComponentLabels.__doc__ = """
+Connected-component labels over the vertices of a frozen graph.
+
+`labels[i]` is the component of `vertex_ids[i]`, numbered 0..k-1 in order of
+each component's first vertex, and `sizes[c]` is the number of vertices in
+component `c`.
+"""
+
+# Graphs with fewer edges than this are labelled in-process
+PARALLEL_MIN_EDGES = 200000
+
+# Chunks handed out per worker. Every chunk adds up to |V| - 1 forest edges
+# to the serial merge, so workers get one chunk each.
+CHUNKS_PER_PROCESS = 1
+
+# Per-edge costs, relative to one edge of the in-process depth-first walk,
+# measured with benchmarks.bench_components: an edge unioned by
+# _spanning_forest, and a forest edge unioned by the parent in _merge.
+UNION_FIND_EDGE_COST = 6
+MERGE_EDGE_COST = 5
+
+
+def _spanning_forest(first_row, offsets, targets, vertex_count):
+    """
+    Union-find over one chunk of CSR rows.
+
+    Parameters:
+    first_row (integer): The vertex index of the chunk's first row.
+    offsets (sequence<int>): The chunk's row offsets, not rebased.
+    targets (sequence<int>): The chunk's neighbor indices.
+    vertex_count (integer): The number of vertices in the whole graph.
+
+    Returns:
+    tuple(array, array): The sources and targets of the edges that merged two
+    components of the chunk.
+    """
+    parents = array('q', range(vertex_count))
+    sources = array('q')
+    ends = array('q')
+    base = offsets[0]
+
+    for row in range(len(offsets) - 1):
+        vertex = first_row + row
+
+        for edge in range(offsets[row] - base, offsets[row+1] - base):
+            neighbor = targets[edge]
+            root1 = vertex
+            root2 = neighbor
+
+            # Path halving keeps the trees shallow without recursion
+            while parents[root1] != root1:
+                parents[root1] = parents[parents[root1]]
+                root1 = parents[root1]
+            while parents[root2] != root2:
+                parents[root2] = parents[parents[root2]]
+                root2 = parents[root2]
+
+            if root1 != root2:
+                parents[root1] = root2
+                sources.append(vertex)
+                ends.append(neighbor)
+    return sources, ends
+
+
+def _spanning_forest_task(task):
+    """Unpack a pool task for _spanning_forest."""
+    return _spanning_forest(*task)
+
+
+def _copy(sequence, start, stop):
+    """Copy sequence[start:stop] of a CSR array into a picklable array."""
+    chunk = array('q')
+    chunk.frombytes(memoryview(sequence)[start:stop].cast('B'))
+    return chunk
+
+
+def _chunks(offsets, targets, chunk_count):
+    """Yield (first_row, offsets, targets, vertex_count) pool tasks."""
+    vertex_count = len(offsets) - 1
+    edge_count = offsets[-1]
+    first_row = 0
+
+    for chunk in range(1, chunk_count + 1):
+        last_row = min(vertex_count,
+                       bisect_left(offsets, edge_count * chunk // chunk_count))
+
+        if chunk == chunk_count:
+            last_row = vertex_count
+        if last_row > first_row:
+            yield (first_row, _copy(offsets, first_row, last_row + 1),
+                   _copy(targets, offsets[first_row], offsets[last_row]),
+                   vertex_count)
+            first_row = last_row
+
+
+def _pooled_forests(offsets, targets, processes):
+    """Yield the spanning forest of every chunk, computed over a pool."""
+    with Pool(processes) as pool:
+        tasks = _chunks(offsets, targets, processes * CHUNKS_PER_PROCESS)
+        yield from pool.imap_unordered(_spanning_forest_task, tasks)
+
+
+def _merge(groups, forests):
+    """Union every spanning forest edge into `groups`."""
+    union = groups.union
+
+    for sources, ends in forests:
+        for vertex, neighbor in zip(sources, ends):
+            union(vertex, neighbor)
+
+
+def _pool_pays_off(edge_count, vertex_count, is_directed, processes):
+    """
+    Estimate whether labelling over the pool beats labelling in-process. The
+    pool splits the union-find work but the parent merges every forest edge
+    alone, and each chunk's forest is bounded by both its edges and |V| - 1.
+    """
+    if processes == 1 or edge_count < PARALLEL_MIN_EDGES:
+        return False
+    chunk_count = processes * CHUNKS_PER_PROCESS
+    forest_edges = min(edge_count, chunk_count * max(vertex_count - 1, 0))
+    pooled = (edge_count * UNION_FIND_EDGE_COST / processes +
+              forest_edges * MERGE_EDGE_COST)
+    in_process = edge_count * (UNION_FIND_EDGE_COST if is_directed else 1)
+    return pooled < in_process
+
+
+def _walk_labels(offsets, targets, vertex_count):
+    """
+    Label an undirected graph in-process with a depth-first walk, which beats
+    union-find when every edge is stored in both directions.
+    """
+    labels = array('q', [-1]) * vertex_count
+    sizes = array('q')
+
+    for root in range(vertex_count):
+        if labels[root] >= 0:
+            continue
+        label = len(sizes)
+        labels[root] = label
+        size = 1
+        stack = [root]
+
+        while stack:
+            current = stack.pop()
+
+            for edge in range(offsets[current], offsets[current+1]):
+                neighbor = targets[edge]
+
+                if labels[neighbor] < 0:
+                    labels[neighbor] = label
+                    size += 1
+                    stack.append(neighbor)
+        sizes.append(size)
+    return ComponentLabels(labels, sizes)
+
+
+def label_components(frozen, processes=None):
+    """
+    Label the connected components of a frozen graph (the weakly connected
+    components, for directed graphs).
+
+    Parameters:
+    frozen (CSRGraph): The graph to label.
+    processes (integer): Worker processes to use. Defaults to the CPU count;
+                         1, a graph under PARALLEL_MIN_EDGES edges, or one
+                         too sparse for the pool to pay off runs in-process.
+
+    Returns:
+    ComponentLabels: The label of every vertex and the size of every
+    component.
+    """
+    offsets, targets = frozen.offsets, frozen.targets
+    vertex_count = len(frozen)
+    processes = processes or cpu_count()
+    groups = DisjointSet(vertex_count)
+
+    if not _pool_pays_off(len(targets), vertex_count, frozen.is_directed,
+                          processes):
+        if not frozen.is_directed:
+            return _walk_labels(offsets, targets, vertex_count)
+        _merge(groups, [_spanning_forest(0, offsets, targets, vertex_count)])
+    else:
+        _merge(groups, _pooled_forests(offsets, targets, processes))
+
+    labels = array('q', [-1]) * vertex_count
+    root_labels = array('q', [-1]) * vertex_count
+    sizes = array('q')
+
+    for vertex in range(vertex_count):
+        root = groups.find(vertex)
+        label = root_labels[root]
+
+        if label < 0:
+            label = root_labels[root] = len(sizes)
+            sizes.append(0)
+        labels[vertex] = label
+        sizes[label] += 1
+    return ComponentLabels(labels, sizes)
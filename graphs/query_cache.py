@@ -0,0 +1,110 @@
+from collections import OrderedDict, namedtuple
+from copy import deepcopy
+from functools import wraps
+
+CacheInfo = namedtuple("CacheInfo",
+                       "hits misses evictions invalidations maxsize currsize")
+
+
+class QueryCache:
+    """ QueryCache Class
+    A size-bounded, least-recently-used store of query results for one graph.
+    Every entry is valid for a single graph version: the first lookup after
+    the graph is mutated finds a different version and empties the cache.
+    """
+    def __init__(self, maxsize=128):
+        """
+        Initialize an empty cache.
+
+        Parameters:
+        maxsize (integer): The most results to keep before evicting the least
+                           recently used one.
+        """
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self.__maxsize = maxsize
+        self.__entries = OrderedDict() # key -> result
+        self.__version = None
+        self.__hits = self.__misses = 0
+        self.__evictions = self.__invalidations = 0
+
+    def __len__(self):
+        """Return the number of cached results."""
+        return len(self.__entries)
+
+    def lookup(self, version, key):
+        """
+        Return (True, result) if `key` is cached for graph version `version`,
+        and (False, None) otherwise.
+        """
+        if version != self.__version:
+            if self.__entries:
+                self.__invalidations += 1
+            self.__entries.clear()
+            self.__version = version
+
+        if key not in self.__entries:
+            self.__misses += 1
+            return False, None
+        self.__hits += 1
+        self.__entries.move_to_end(key)
+        return True, self.__entries[key]
+
+    def store(self, version, key, result):
+        """Cache `result` under `key` for graph version `version`."""
+        if version != self.__version:
+            return # the graph changed while the result was computed
+        self.__entries[key] = result
+
+        if len(self.__entries) > self.__maxsize:
+            self.__entries.popitem(last=False)
+            self.__evictions += 1
+
+    def clear(self):
+        """Drop every cached result, keeping the counters."""
+        self.__entries.clear()
+
+    def info(self):
+        """
+        Return the cache statistics.
+
+        Returns:
+        CacheInfo: Hit, miss, eviction and invalidation counts, and the
+        maximum and current number of cached results.
+        """
+        return CacheInfo(self.__hits, self.__misses, self.__evictions,
+                         self.__invalidations, self.__maxsize,
+                         len(self.__entries))
+
+
+def cached_query(method):
+    """
+    Decorate a read-only graph method so that, when the graph has a query
+    cache enabled, results are looked up by method and arguments. Calls that
+    raise, or whose arguments are unhashable, are not cached. The cache keeps
+    its own copy of each result and every hit returns a fresh copy, so
+    callers may modify what they get back.
+    """
+    name = method.__qualname__
+
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        cache = self.query_cache
+
+        if cache is None:
+            return method(self, *args, **kwargs)
+        key = (name, args, tuple(sorted(kwargs.items())))
+
+        try:
+            hash(key)
+        except TypeError: # unhashable arguments can't be looked up
+            return method(self, *args, **kwargs)
+        version = self.version
+        found, result = cache.lookup(version, key)
+
+        if found:
+            return deepcopy(result)
+        result = method(self, *args, **kwargs)
+        cache.store(version, key, deepcopy(result))
+        return result
+    return wrapper
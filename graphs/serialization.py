@@ -0,0 +1,209 @@
+"""
+Compact binary on-disk format for frozen graphs.
+
+Layout (all sections start on an 8-byte boundary):
+    header          magic, format version, flags, vertex count, adjacency
+                    entry count and string table size
+    id offsets      vertex_count + 1 int64 byte offsets into the string table
+    string table    UTF-8 vertex ids, back to back
+    offsets         vertex_count + 1 int64 CSR row offsets
+    targets         int64 neighbor indices
+    weights         float64 edge weights (weighted graphs only)
+
+The arrays are stored in native byte order so `load` can memory-map them
+without copying; several processes loading the same file share its pages.
+
+Contraction hierarchies use the same layout with their own magic; after the
+string table come the ranks, then offsets, targets, weights and middles for
+the upward edges and again for the downward edges.
+"""
+import mmap
+import struct
+import sys
+from array import array
+
+from graphs.contraction import ContractionHierarchy
+from graphs.csr import CSRGraph, WeightedCSRGraph
+
+MAGIC = b'CSRG'
+HIERARCHY_MAGIC = b'CHRG'
+FORMAT_VERSION = 1
+HEADER = struct.Struct('<4sHHQQQ')
+HIERARCHY_HEADER = struct.Struct('<4sHHQQQQ')
+
+IS_DIRECTED = 1
+IS_WEIGHTED = 2
+IS_BIG_ENDIAN = 4
+
+
+def _padding(size):
+    """Return the number of bytes needed to pad `size` to 8 bytes."""
+    return -size % 8
+
+
+def _encode_ids(vertex_ids):
+    """
+    Return the int64 byte offsets and the UTF-8 string table of `vertex_ids`.
+    """
+    encoded_ids = [str(vertex_id).encode('utf-8') for vertex_id in vertex_ids]
+    id_offsets = array('q', [0])
+
+    for encoded_id in encoded_ids:
+        id_offsets.append(id_offsets[-1] + len(encoded_id))
+    return id_offsets, b''.join(encoded_ids)
+
+
+def _write_ids(file, header_size, id_offsets, table):
+    """Write the padding after the header, then the vertex ids."""
+    file.write(bytes(_padding(header_size)))
+    file.write(id_offsets)
+    file.write(table)
+    file.write(bytes(_padding(len(table))))
+
+
+def save(frozen, filename):
+    """
+    Write a frozen graph to `filename`. Vertex ids are stored as strings.
+
+    Parameters:
+    frozen (CSRGraph): The graph to save.
+    filename (string): The path of the file to write.
+    """
+    id_offsets, table = _encode_ids(frozen.vertex_ids)
+    is_weighted = isinstance(frozen, WeightedCSRGraph)
+    flags = ((IS_DIRECTED if frozen.is_directed else 0) |
+             (IS_WEIGHTED if is_weighted else 0) |
+             (IS_BIG_ENDIAN if sys.byteorder == 'big' else 0))
+
+    with open(filename, 'wb') as file:
+        file.write(HEADER.pack(MAGIC, FORMAT_VERSION, flags, len(frozen),
+                               len(frozen.targets), len(table)))
+        _write_ids(file, HEADER.size, id_offsets, table)
+        file.write(array('q', frozen.offsets))
+        file.write(array('q', frozen.targets))
+
+        if is_weighted:
+            file.write(array('d', frozen.weights))
+
+
+def save_hierarchy(hierarchy, filename):
+    """
+    Write a contraction hierarchy to `filename`. Vertex ids are stored as
+    strings.
+
+    Parameters:
+    hierarchy (ContractionHierarchy): The hierarchy to save.
+    filename (string): The path of the file to write.
+    """
+    id_offsets, table = _encode_ids(hierarchy.vertex_ids)
+    flags = ((IS_DIRECTED if hierarchy.is_directed else 0) |
+             (IS_BIG_ENDIAN if sys.byteorder == 'big' else 0))
+
+    with open(filename, 'wb') as file:
+        file.write(HIERARCHY_HEADER.pack(
+            HIERARCHY_MAGIC, FORMAT_VERSION, flags, len(hierarchy),
+            len(hierarchy.up[1]), len(hierarchy.down[1]), len(table)))
+        _write_ids(file, HIERARCHY_HEADER.size, id_offsets, table)
+        file.write(array('q', hierarchy.ranks))
+
+        for offsets, targets, weights, middles in (hierarchy.up,
+                                                   hierarchy.down):
+            file.write(array('q', offsets))
+            file.write(array('q', targets))
+            file.write(array('d', weights))
+            file.write(array('q', middles))
+
+
+class _Reader:
+    """
+    Sequential reader of the sections of a memory-mapped file, returning
+    views into the mapping rather than copies.
+    """
+    def __init__(self, filename, header, magic):
+        """
+        Map `filename` and unpack its header, checking the magic, format
+        version and byte order.
+        """
+        self.filename = filename
+
+        with open(filename, 'rb') as file:
+            self.buffer = memoryview(mmap.mmap(file.fileno(), 0,
+                                               access=mmap.ACCESS_READ))
+
+        if len(self.buffer) < header.size:
+            raise ValueError(f'{filename} is not a graph file')
+        self.fields = header.unpack_from(self.buffer)
+        file_magic, version, self.flags = self.fields[:3]
+
+        if file_magic != magic:
+            raise ValueError(f'{filename} is not a graph file')
+        if version != FORMAT_VERSION:
+            raise ValueError(f'{filename} has unsupported format version {version}')
+        if bool(self.flags & IS_BIG_ENDIAN) != (sys.byteorder == 'big'):
+            raise ValueError(f'{filename} was written with a different byte order')
+        self.position = header.size + _padding(header.size)
+
+    def take(self, count, typecode):
+        """Return the next `count` 8-byte values as a typed view."""
+        size = count * 8
+        view = self.buffer[self.position:self.position+size]
+
+        if len(view) != size:
+            raise ValueError(f'{self.filename} is truncated')
+        self.position += size
+        return view.cast(typecode)
+
+    def take_ids(self, vertex_count, table_size):
+        """Return the list of vertex ids."""
+        id_offsets = self.take(vertex_count + 1, 'q')
+        table = self.buffer[self.position:self.position+table_size]
+        self.position += table_size + _padding(table_size)
+        return [str(table[id_offsets[index]:id_offsets[index+1]], 'utf-8')
+                for index in range(vertex_count)]
+
+
+def load(filename):
+    """
+    Memory-map a graph written by `save`. The offsets, targets and weights are
+    views straight into the mapped file, so nothing is copied until a page is
+    touched.
+
+    Parameters:
+    filename (string): The path of the file to read.
+
+    Returns:
+    CSRGraph: A CSRGraph, or WeightedCSRGraph if the file holds weights.
+    """
+    reader = _Reader(filename, HEADER, MAGIC)
+    vertex_count, entry_count, table_size = reader.fields[3:]
+    vertex_ids = reader.take_ids(vertex_count, table_size)
+    offsets = reader.take(vertex_count + 1, 'q')
+    targets = reader.take(entry_count, 'q')
+    is_directed = bool(reader.flags & IS_DIRECTED)
+
+    if reader.flags & IS_WEIGHTED:
+        weights = reader.take(entry_count, 'd')
+        return WeightedCSRGraph(vertex_ids, offsets, targets, weights,
+                                is_directed)
+    return CSRGraph(vertex_ids, offsets, targets, is_directed)
+
+
+def load_hierarchy(filename):
+    """
+    Memory-map a contraction hierarchy written by `save_hierarchy`.
+
+    Parameters:
+    filename (string): The path of the file to read.
+
+    Returns:
+    ContractionHierarchy: The hierarchy, with string vertex ids.
+    """
+    reader = _Reader(filename, HIERARCHY_HEADER, HIERARCHY_MAGIC)
+    vertex_count, up_count, down_count, table_size = reader.fields[3:]
+    vertex_ids = reader.take_ids(vertex_count, table_size)
+    ranks = reader.take(vertex_count, 'q')
+    edges = [(reader.take(vertex_count + 1, 'q'), reader.take(count, 'q'),
+              reader.take(count, 'd'), reader.take(count, 'q'))
+             for count in (up_count, down_count)]
+    return ContractionHierarchy(vertex_ids, ranks, edges[0], edges[1],
+                                bool(reader.flags & IS_DIRECTED))
@@ -0,0 +1,236 @@
+"""
+Asyncio query server: loads a graph once and answers queries over a TCP or
+Unix socket with a JSON-lines protocol.
+
+Each request is one JSON object per line,
+    {"id": 1, "query": "shortest_path", "args": ["A", "F"]}
+and each response is one line carrying the same id and either a result or an
+error,
+    {"id": 1, "result": ["A", "B", "F"]}
+    {"id": 2, "error": "KeyError: 'One or both vertices are not in the graph!'"}
+
+Queries on one connection run concurrently, so responses can arrive out of
+order. Graph queries run in a pool of worker processes, each of which loads
+the graph once at startup (files in the binary graph format are memory-mapped,
+so workers share their pages), keeping the event loop free to accept requests.
+
+Queries:
+    shortest_path [start, target]    fewest-edge path, or weighted distance
+    n_away [start, distance]         vertex ids exactly `distance` edges away
+    components []                    connected components
+    toposort []                      a topological order
+    stats []                         latency percentiles per query, in ms
+
+Run from the repository root:
+    python -m graphs.server GRAPH_FILE [--host HOST] [--port PORT]
+                                       [--unix PATH] [--processes N]
+"""
+import argparse
+import asyncio
+import json
+import time
+from collections import defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+from graphs import serialization
+from util.file_reader import read_graph_from_file
+
+# Latencies kept per query for the percentiles reported by `stats`
+LATENCY_WINDOW = 10000
+
+PERCENTILES = (50, 90, 99)
+
+QUERIES = {
+    'shortest_path': lambda graph, start_id, target_id:
+        graph.find_shortest_path(start_id, target_id),
+    'n_away': lambda graph, start_id, target_distance:
+        graph.find_vertices_n_away(start_id, target_distance),
+    'components': lambda graph: graph.find_connected_components(),
+    'toposort': lambda graph: graph.topological_sort(),
+}
+
+# The graph loaded by each worker process
+_worker_graph = None
+
+
+def load_graph(filename):
+    """
+    Load a frozen graph from a binary graph file (memory-mapped) or a text
+    graph file.
+
+    Parameters:
+    filename (string): The path of the file to read.
+
+    Returns:
+    CSRGraph: The read-only graph.
+    """
+    with open(filename, 'rb') as file:
+        is_binary = file.read(len(serialization.MAGIC)) == serialization.MAGIC
+
+    if is_binary:
+        return serialization.load(filename)
+    return read_graph_from_file(filename).freeze()
+
+
+def _load_worker(filename):
+    """Pool initializer: load the graph once per worker process."""
+    global _worker_graph
+    _worker_graph = load_graph(filename)
+
+
+def _run_in_worker(query, args):
+    """Answer a query against the worker's graph."""
+    return QUERIES[query](_worker_graph, *args)
+
+
+def _percentile(ordered, percent):
+    """Return the nearest-rank percentile of a sorted, non-empty list."""
+    rank = max(1, -(-len(ordered) * percent // 100)) # ceiling division
+    return ordered[rank - 1]
+
+
+class GraphServer:
+    """ GraphServer Class
+    Serves queries against one graph. With `processes=0` queries run in the
+    event loop's thread, which suits small graphs and tests.
+    """
+    def __init__(self, filename, processes=None):
+        """
+        Load the graph and start the worker processes.
+
+        Parameters:
+        filename (string): The graph file, binary or text.
+        processes (integer): Worker processes to use, defaulting to the CPU
+                             count; 0 answers queries in-process.
+        """
+        self.__graph = load_graph(filename)
+        # Workers are started on demand; spawning rather than forking them
+        # keeps them from inheriting open client sockets, which would stop
+        # closed connections from reaching the client.
+        self.__pool = (None if processes == 0 else
+                       ProcessPoolExecutor(processes, get_context('spawn'),
+                                           initializer=_load_worker,
+                                           initargs=(filename,)))
+        self.__latencies = defaultdict(lambda: deque(maxlen=LATENCY_WINDOW))
+
+    @property
+    def graph(self):
+        return self.__graph
+
+    def stats(self):
+        """
+        Return per-query latency statistics over the recent window.
+
+        Returns:
+        dict: query -> {'count': n, 'p50': ms, 'p90': ms, 'p99': ms}.
+        """
+        stats = {}
+
+        for query, latencies in self.__latencies.items():
+            ordered = sorted(latencies)
+            stats[query] = {'count': len(ordered)}
+            stats[query].update(
+                (f'p{percent}', _percentile(ordered, percent) * 1000)
+                for percent in PERCENTILES)
+        return stats
+
+    async def answer(self, query, args):
+        """
+        Answer one query, recording its latency whether or not it fails.
+
+        Parameters:
+        query (string): The query name; see the module docstring.
+        args (list): The query's arguments.
+
+        Returns:
+        object: The JSON-serializable result.
+        """
+        if query == 'stats':
+            return self.stats()
+        if query not in QUERIES:
+            raise ValueError(f"Unknown query {query!r}")
+        start = time.perf_counter()
+
+        try:
+            if self.__pool is None:
+                return QUERIES[query](self.__graph, *args)
+            return await asyncio.get_running_loop().run_in_executor(
+                self.__pool, _run_in_worker, query, args)
+        finally:
+            self.__latencies[query].append(time.perf_counter() - start)
+
+    async def __respond(self, line, writer):
+        """Parse one request line, answer it and write the response."""
+        request_id = None
+
+        try:
+            request = json.loads(line)
+            request_id = request.get('id')
+            response = {'id': request_id,
+                        'result': await self.answer(request['query'],
+                                                    request.get('args', []))}
+        except Exception as error:
+            response = {'id': request_id,
+                        'error': f'{type(error).__name__}: {error}'}
+        writer.write(json.dumps(response).encode('utf-8') + b'\n')
+        await writer.drain()
+
+    async def handle_connection(self, reader, writer):
+        """Answer every request on one connection until it closes."""
+        pending = set()
+
+        try:
+            async for line in reader:
+                if not line.strip():
+                    continue
+                task = asyncio.create_task(self.__respond(line, writer))
+                pending.add(task)
+                task.add_done_callback(pending.discard)
+
+            if pending:
+                await asyncio.wait(pending)
+        finally:
+            writer.close()
+
+    async def start(self, host=None, port=None, path=None):
+        """
+        Start listening on a Unix socket at `path` if given, and otherwise on
+        TCP `host`:`port`.
+
+        Returns:
+        asyncio.Server: The listening server.
+        """
+        if path is not None:
+            return await asyncio.start_unix_server(self.handle_connection,
+                                                   path)
+        return await asyncio.start_server(self.handle_connection, host, port)
+
+    def close(self):
+        """Shut down the worker processes."""
+        if self.__pool is not None:
+            self.__pool.shutdown()
+
+
+async def _serve(arguments):
+    """Run a server until cancelled."""
+    server = GraphServer(arguments.graph_file, arguments.processes)
+
+    try:
+        listener = await server.start(arguments.host, arguments.port,
+                                      arguments.unix)
+        async with listener:
+            await listener.serve_forever()
+    finally:
+        server.close()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('graph_file')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=7474)
+    parser.add_argument('--unix', help='listen on this Unix socket path')
+    parser.add_argument('--processes', type=int,
+                        help='worker processes (0 answers queries in-process)')
+    asyncio.run(_serve(parser.parse_args()))
@@ -1,18 +1,20 @@
 from collections import namedtuple
-
+from heapq import heapify, heappop, heappush
+
+from graphs import a_star, serialization
+from graphs.all_pairs import floyd_warshall_dense, johnson, use_dense_kernel
+from graphs.bellman_ford import bellman_ford, spfa
+from graphs.contraction import ContractionHierarchy
+from graphs.csr import WeightedCSRGraph
+from graphs.disjoint_set import DisjointSet
 from graphs.graph import Graph, Vertex
+from graphs.query_cache import cached_query
 
-class WeightedVertex(Vertex):
-
-    def __init__(self, vertex_id):
-        """
-        Initialize a vertex and its neighbors dictionary.
+SpanningForest = namedtuple("SpanningForest", "edges total")
 
-        Parameters:
-        vertex_id (string): A unique identifier to identify this vertex.
-        """
-        self.id = vertex_id
-        self.neighbors_dict = {} # id -> (obj, weight)
+class WeightedVertex(Vertex):
+    ## Weights live as the values of neighbors_dict, so no extra slots
+    __slots__ = ()
 
     def add_neighbor(self, vertex_obj, weight):
         """
@@ -21,75 +23,53 @@ class WeightedVertex(Vertex):
         Parameters:
         vertex_obj (Vertex): An instance of Vertex to be stored as a neighbor.
         weight (number): The weight of this edge.
+
+        Returns:
+        boolean: True if the neighbor was not already present.
         """
-        if vertex_obj.get_id() in self.neighbors_dict.keys():
-            return # it's already a neighbor
+        if vertex_obj in self.neighbors_dict:
+            return False # it's already a neighbor
 
-        self.neighbors_dict[vertex_obj.get_id()] = (vertex_obj, weight)
+        self.neighbors_dict[vertex_obj] = weight
+        vertex_obj.add_predecessor(self)
+        return True
 
-    def get_neighbors(self):
-        """Return the neighbors of this vertex."""
-        return [neighbor for (neighbor, weight) in self.neighbors_dict.values()]
+    def set_neighbor_weight(self, vertex_obj, weight):
+        """
+        Change the weight of the edge to an existing neighbor.
+
+        Returns:
+        boolean: True if `vertex_obj` is a neighbor.
+        """
+        if vertex_obj not in self.neighbors_dict:
+            return False
+        self.neighbors_dict[vertex_obj] = weight
+        return True
 
     def get_neighbors_with_weights(self):
         """Return the neighbors of this vertex."""
-        return list(self.neighbors_dict.values())
-
-    def get_id(self):
-        """Return the id of this vertex."""
-        return self.id
-
-    def __str__(self):
-        """Output the list of neighbors of this vertex."""
-        neighbor_ids = [neighbor.get_id() for neighbor in self.get_neighbors()]
-        return f'{self.id} adjacent to {neighbor_ids}'
-
-    def __repr__(self):
-        """Output the list of neighbors of this vertex."""
-        neighbor_ids = [neighbor.get_id() for neighbor in self.get_neighbors()]
-        return f'{self.id} adjacent to {neighbor_ids}'
+        return list(self.neighbors_dict.items())
 
 
 class WeightedGraph(Graph):
 
     INFINITY = float('inf')
 
-    def __init__(self, is_directed=True):
-        """
-        Initialize a graph object with an empty vertex dictionary.
-
-        Parameters:
-        is_directed (boolean): Whether the graph is directed (edges go in only one direction).
-        """
-        self.vertex_dict = {}
-        self.__is_directed = is_directed
+    vertex_class = WeightedVertex
 
-    @property
-    def is_directed(self):
-        return self.__is_directed
+    snapshot_class = WeightedCSRGraph
 
-    def add_vertex(self, vertex_id):
+    def __init__(self, is_directed=True, track_predecessors=False):
         """
-        Add a new vertex object to the graph with the given key and return the vertex.
+        Initialize a graph object with an empty vertex dictionary.
 
         Parameters:
-        vertex_id (string): The unique identifier for the new vertex.
-
-        Returns:
-        Vertex: The new vertex object.
+        is_directed (boolean): Whether the graph is directed (edges go in only one direction).
+        track_predecessors (boolean): Whether every vertex keeps a reverse
+                                      adjacency index of its predecessors.
         """
-        if vertex_id in self.vertex_dict.keys():
-            return False # it's already there
-        vertex_obj = WeightedVertex(vertex_id)
-        self.vertex_dict[vertex_id] = vertex_obj
-        return True
-
-    def get_vertex(self, vertex_id):
-        """Return the vertex if it exists."""
-        if vertex_id not in self.vertex_dict.keys():
-            return None
-        vertex_obj = self.vertex_dict[vertex_id]
-        return vertex_obj
+        super().__init__(is_directed, track_predecessors)
+        self.__negative_weights = (None, False) # (version, has negative)
 
     def add_edge(self, vertex_id1, vertex_id2, weight):
         """
@@ -100,158 +80,358 @@ class WeightedGraph(Graph):
         vertex_id2 (string): The unique identifier of the second vertex.
         weight (number): The edge weight.
         """
-        all_ids = self.vertex_dict.keys()
-        if vertex_id1 not in all_ids or vertex_id2 not in all_ids:
+        if not (self.contains_id(vertex_id1) and self.contains_id(vertex_id2)):
             return False
         vertex_obj1 = self.get_vertex(vertex_id1)
         vertex_obj2 = self.get_vertex(vertex_id2)
-        vertex_obj1.add_neighbor(vertex_obj2, weight)
+        if not vertex_obj1.add_neighbor(vertex_obj2, weight):
+            return False # the edge already exists
         if not self.is_directed:
             vertex_obj2.add_neighbor(vertex_obj1, weight)
+        self._record_change('add_edge', vertex_id1, vertex_id2, weight)
 
-    def get_vertices(self):
-        """Return all the vertices in the graph"""
-        return list(self.vertex_dict.values())
+    def set_edge_weight(self, vertex_id1, vertex_id2, weight):
+        """
+        Change the weight of the existing edge from vertex with id
+        `vertex_id1` to vertex with id `vertex_id2`.
 
-    def __iter__(self):
-        """Iterate over the vertex objects in the graph, to use sytax:
-        for vertex in graph"""
-        return iter(self.vertex_dict.values())
+        Returns:
+        boolean: True if the edge exists.
+        """
+        if not (self.contains_id(vertex_id1) and self.contains_id(vertex_id2)):
+            return False
+        vertex_obj1 = self.get_vertex(vertex_id1)
+        vertex_obj2 = self.get_vertex(vertex_id2)
+        if not vertex_obj1.set_neighbor_weight(vertex_obj2, weight):
+            return False
+        if not self.is_directed:
+            vertex_obj2.set_neighbor_weight(vertex_obj1, weight)
+        self._record_change('set_edge_weight', vertex_id1, vertex_id2, weight)
+        return True
+
+    def contraction_hierarchy(self, filename=None):
+        """
+        Preprocess a snapshot of the graph into a contraction hierarchy, which
+        answers point-to-point shortest path queries far faster than
+        find_shortest_path. Later changes to this graph are not reflected in
+        it. Edge weights must not be negative.
+
+        Parameters:
+        filename (string): Optional path to also save the hierarchy to, for
+                           load_contraction_hierarchy.
+
+        Returns:
+        ContractionHierarchy: The hierarchy.
+        """
+        hierarchy = ContractionHierarchy.build(self.freeze())
+
+        if filename is not None:
+            serialization.save_hierarchy(hierarchy, filename)
+        return hierarchy
+
+    @staticmethod
+    def load_contraction_hierarchy(filename):
+        """
+        Memory-map a hierarchy saved by contraction_hierarchy. Vertex ids are
+        loaded as strings.
 
-    def union(self, parent_map, vertex_id1, vertex_id2):
-        """Combine vertex_id1 and vertex_id2 into the same group."""
-        vertex1_root = self.find(parent_map, vertex_id1)
-        vertex2_root = self.find(parent_map, vertex_id2)
-        parent_map[vertex1_root] = vertex2_root
+        Parameters:
+        filename (string): The path of the file to read.
 
+        Returns:
+        ContractionHierarchy: The hierarchy.
+        """
+        return serialization.load_hierarchy(filename)
 
-    def find(self, parent_map, vertex_id):
-        """Get the root (or, group label) for vertex_id."""
-        if(parent_map[vertex_id] == vertex_id):
-            return vertex_id
-        return self.find(parent_map, parent_map[vertex_id])
+    def __iter__(self):
+        """Iterate over the vertex objects in the graph, to use sytax:
+        for vertex in graph"""
+        return iter(self.get_vertices())
 
     def minimum_spanning_tree_kruskal(self):
         """
         Use Kruskal's Algorithm to return a list of edges, as tuples of
-        (start_id, dest_id, weight) in the graph's minimum spanning tree.
+        (start_id, dest_id, weight) in the graph's minimum spanning tree (or
+        spanning forest, if it is disconnected).
         """
-        # Create a list of all edges in the graph, sort them by weight
-        # from smallest to largest
-        Edge = namedtuple("Edge", "start end weight")
-        edges = set()
+        vertices = self.get_vertices()
+
+        # Create a list of all edges in the graph, as
+        # (weight, start index, end index, start id, end id), and sort them by
+        # weight from smallest to largest
+        edges = []
 
-        for vertex in self.get_vertices():
+        for vertex in vertices:
             for neighbor, weight in vertex.get_neighbors_with_weights():
                 if self.is_directed:
-                    edges.add(Edge(vertex.get_id(), neighbor.get_id(), weight))
-                else:
-                    edges.add(Edge(*sorted((vertex.get_id(), neighbor.get_id())),
-                                   weight))
-        edges = list(edges)
-        edges.sort(reverse=True, key=lambda edge: edge.weight)
+                    edges.append((weight, vertex.index, neighbor.index,
+                                  vertex.get_id(), neighbor.get_id()))
+                elif vertex.index < neighbor.index:
+                    # Each undirected edge is stored twice; keep one copy
+                    edges.append((weight, vertex.index, neighbor.index,
+                                  *sorted((vertex.get_id(), neighbor.get_id()))))
+        edges.sort()
 
-        # Create a dictionary `parent_map` to map vertex -> its "parent".
-        # Initialize it so that each vertex is its own parent.
-        parent_map = {vertex.get_id(): vertex.get_id() for vertex in self.get_vertices()}
+        # Each vertex starts out in its own group
+        groups = DisjointSet(self.index_bound)
 
         # Create an empty list to hold the solution (i.e. all edges in the
         # final spanning tree)
         min_spanning_tree = []
 
-        while len(min_spanning_tree) < len(self.vertex_dict) - 1:
-            # While the spanning tree holds < V-1 edges, get the smallest
-            # edge.
-            edge = edges.pop()
-
-            if self.find(parent_map, edge.start) != self.find(parent_map, edge.end):
-                # If the two vertices connected by the edge are in different sets
-                # (i.e. calling `find()` gets two different roots), then it will not
-                # create a cycle, so add it to the solution set and call `union()` on
-                # the two vertices.
-                self.union(parent_map, edge.start, edge.end)
-                min_spanning_tree.append((edge.start, edge.end, edge.weight))
+        for weight, start_index, end_index, start_id, end_id in edges:
+            if len(min_spanning_tree) == len(vertices) - 1:
+                break # the spanning tree is complete
 
+            if groups.union(start_index, end_index):
+                # The two vertices connected by the edge were in different
+                # groups, so it does not create a cycle.
+                min_spanning_tree.append((start_id, end_id, weight))
 
         # Return the solution list.
         return min_spanning_tree
 
+    def minimum_spanning_forest_prim(self):
+        """
+        Use Prim's Algorithm, driven by a binary heap of candidate edges, to
+        find a minimum spanning forest: one minimum spanning tree per connected
+        component. Time: O(|E| log |E|)
+
+        Returns:
+        SpanningForest: The forest's edges, as tuples of
+        (start_id, dest_id, weight), and their total weight.
+        """
+        in_forest = bytearray(self.index_bound)
+        forest_edges = []
+        total = 0
+
+        for root in self.get_vertices():
+            if in_forest[root.index]:
+                continue
+            # Grow a new tree from the first vertex of an unreached component
+            in_forest[root.index] = 1
+            # Both indices come before the vertices, so ties never compare
+            # Vertex objects (whose ids may not be comparable)
+            heap = [(weight, neighbor.index, root.index, root, neighbor)
+                    for neighbor, weight in root.get_neighbors_with_weights()]
+            heapify(heap)
+
+            while heap:
+                # Take the lightest edge leaving the tree; edges whose far end
+                # has been reached since they were pushed are skipped.
+                weight, index, _, start_vertex, vertex = heappop(heap)
+
+                if in_forest[index]:
+                    continue
+                in_forest[index] = 1
+                forest_edges.append((start_vertex.get_id(), vertex.get_id(),
+                                     weight))
+                total += weight
+
+                for neighbor, weight in vertex.get_neighbors_with_weights():
+                    if not in_forest[neighbor.index]:
+                        heappush(heap, (weight, neighbor.index, vertex.index,
+                                        vertex, neighbor))
+
+        return SpanningForest(forest_edges, total)
+
     def minimum_spanning_tree_prim(self):
         """
         Use Prim's Algorithm to return the total weight of all edges in the
-        graph's spanning tree.
+        graph's spanning tree (or spanning forest, if it is disconnected).
+        """
+        return self.minimum_spanning_forest_prim().total
 
-        Assume that the graph is connected.
+    def dijkstra(self, start_id, target_id=None):
         """
-        vertex_to_weight = {vertex: float('inf')
-                            for vertex in self.get_vertices()}
-        # Choose one vertex and set its weight to 0
-        vertex_to_weight[tuple(vertex_to_weight.keys())[0]] = 0
-        total = 0
+        Run Dijkstra's Algorithm from `start_id` using a binary heap with lazy
+        deletion of stale entries. Time: O((|V| + |E|) log |V|)
+
+        Parameters:
+        start_id (string): The id of the start vertex.
+        target_id (string): Optional id of a target vertex; the search stops as
+                            soon as its distance is final.
+
+        Returns:
+        tuple(dict, dict): The final distance of every settled vertex id, and
+        the previous vertex id on its shortest path (None for the start).
+        """
+        if not self.contains_id(start_id):
+            raise KeyError("One or both vertices are not in the graph!")
+        start_vertex = self.get_vertex(start_id)
+        target_vertex = self.get_vertex(target_id)
+        # Search state is keyed by vertex index; ids are only looked at again
+        # when building the result.
+        settled = []
+        distances = {}
+        previous = {start_vertex.index: None}
+        # Best distance found so far for vertices that are still on the heap
+        tentative = {start_vertex.index: 0}
+        heap = [(0, start_vertex.index, start_vertex)]
+
+        while heap:
+            distance, index, vertex = heappop(heap)
+
+            if index in distances:
+                continue # stale entry for an already settled vertex
+            distances[index] = distance
+            settled.append(vertex)
+
+            if vertex is target_vertex:
+                break
 
-        while len(vertex_to_weight):
-            # While `vertex_to_weight` is not empty:
-            # 1. Get the minimum-weighted remaining vertex, remove it from the
-            #    dictionary, & add its weight to the total MST weight
-            # 2. Update that vertex's neighbors, if edge weights are smaller than
-            #    previous weights
-            min_weighted_vertex = None
-            min_weight = float('inf')
-
-            for vertex, weight in vertex_to_weight.items():
-                if weight < min_weight:
-                    min_weighted_vertex = vertex
-                    min_weight = weight
-            del vertex_to_weight[min_weighted_vertex]
-            total += min_weight
-
-            for neighbor, weight in min_weighted_vertex.get_neighbors_with_weights():
-                if neighbor in vertex_to_weight:
-                    vertex_to_weight[neighbor] = min(vertex_to_weight[neighbor],
-                                                     weight)
-
-        return total
+            for neighbor, weight in vertex.get_neighbors_with_weights():
+                neighbor_index = neighbor.index
+                new_distance = distance + weight
+
+                if (neighbor_index not in distances and
+                    new_distance < tentative.get(neighbor_index, self.INFINITY)):
+                    tentative[neighbor_index] = new_distance
+                    previous[neighbor_index] = vertex
+                    heappush(heap, (new_distance, neighbor_index, neighbor))
+
+        vertex_to_distance = {vertex.get_id(): distances[vertex.index]
+                              for vertex in settled}
+        vertex_to_previous = {vertex.get_id(): (previous[vertex.index].get_id()
+                                                if previous[vertex.index] is not None
+                                                else None)
+                              for vertex in settled}
+        return vertex_to_distance, vertex_to_previous
+
+    def has_negative_weights(self):
+        """
+        Return True if any edge has a negative weight. The answer is kept
+        until the graph is next mutated.
+        """
+        version, has_negative = self.__negative_weights
+
+        if version != self.version:
+            has_negative = any(weight < 0 for vertex in self.get_vertices()
+                               for _, weight in
+                               vertex.get_neighbors_with_weights())
+            self.__negative_weights = (self.version, has_negative)
+        return has_negative
+
+    def bellman_ford(self, start_id, method='spfa'):
+        """
+        Find the shortest distance from `start_id` to every reachable vertex,
+        allowing negative edge weights; see graphs.bellman_ford.
+
+        Parameters:
+        start_id (string): The id of the start vertex.
+        method (string): 'spfa' (queue-based, fastest on sparse graphs) or
+                         'bellman_ford' (whole-edge-list rounds).
+
+        Returns:
+        tuple(dict, dict): The distance of every reachable vertex id, and the
+        previous vertex id on its shortest path (None for the start).
+
+        Raises:
+        NegativeCycleError: If a negative cycle is reachable from the start;
+                            its `cycle` attribute lists the vertex ids.
+        """
+        if not self.contains_id(start_id):
+            raise KeyError("One or both vertices are not in the graph!")
+        engines = {'spfa': spfa, 'bellman_ford': bellman_ford}
+
+        if method not in engines:
+            raise ValueError(f"Unknown shortest path method {method!r}")
+        frozen = self.freeze()
+        distances, previous = engines[method](frozen,
+                                              frozen.index_of(start_id))
+        vertex_ids = frozen.vertex_ids
+        reachable = [index for index, distance in enumerate(distances)
+                     if distance != self.INFINITY]
+        vertex_to_distance = {vertex_ids[index]: distances[index]
+                              for index in reachable}
+        vertex_to_previous = {vertex_ids[index]: (vertex_ids[previous[index]]
+                                                  if previous[index] >= 0
+                                                  else None)
+                              for index in reachable}
+        return vertex_to_distance, vertex_to_previous
+
+    @cached_query
+    def find_shortest_path_with_distance(self, start_id, target_id):
+        """
+        Use Dijkstra's Algorithm to find the shortest weighted path from a start
+        vertex to a destination. Graphs with negative edge weights use the
+        SPFA variant of Bellman-Ford instead, which raises
+        NegativeCycleError if a negative cycle is reachable.
+
+        Returns:
+        tuple(number, list<string>): The total weight of the path and the
+        vertex ids along it, from start to end, or None if there is no path.
+        """
+        if not self.contains_id(target_id):
+            raise KeyError("One or both vertices are not in the graph!")
+        if self.has_negative_weights():
+            vertex_to_distance, vertex_to_previous = self.bellman_ford(start_id)
+        else:
+            vertex_to_distance, vertex_to_previous = self.dijkstra(start_id,
+                                                                   target_id)
+
+        if target_id not in vertex_to_distance: # path not found
+            return None
+        path = [target_id]
+
+        while vertex_to_previous[path[-1]] is not None:
+            path.append(vertex_to_previous[path[-1]])
+        path.reverse()
+        return vertex_to_distance[target_id], path
 
     def find_shortest_path(self, start_id, target_id):
         """
         Use Dijkstra's Algorithm to return the total weight of the shortest path
-        from a start vertex to a destination.
+        from a start vertex to a destination, or None if it is unreachable.
         """
-        # Create a dictionary `vertex_to_distance` and initialize all
-        # vertices to INFINITY - hint: use `float('inf')`
-        vertex_to_distance = {vertex: float('inf')
-                              for vertex in self.get_vertices()}
-        vertex_to_distance[self.get_vertex(start_id)] = 0
-        total = 0
+        result = self.find_shortest_path_with_distance(start_id, target_id)
+        return None if result is None else result[0]
 
-        while len(vertex_to_distance):
-            # While `vertex_to_distance` is not empty:
-            # 1. Get the minimum-distance remaining vertex, remove it from the
-            #    dictionary. If it is the target vertex, return its distance.
-            # 2. Update that vertex's neighbors by adding the edge weight to the
-            #    vertex's distance, if it is lower than previous.
-            closest_vertex = None
-            min_distance = float('inf')
-
-            for vertex, distance in vertex_to_distance.items():
-                if distance < min_distance:
-                    closest_vertex = vertex
-                    min_distance = distance
-            del vertex_to_distance[closest_vertex]
-            total += min_distance
-
-            if closest_vertex.get_id() == target_id:
-                return min_distance
-
-            for neighbor, weight in closest_vertex.get_neighbors_with_weights():
-                if neighbor in vertex_to_distance:
-                    vertex_to_distance[neighbor] = min(vertex_to_distance[neighbor],
-                                                       min_distance+weight)
-        # Return None if target vertex not found.
-
-    def floyd_warshall(self):
-        """
-        Return the All-Pairs-Shortest-Paths dictionary, containing the shortest
-        paths from each vertex to each other vertex.
-        """
-        pass
+    def a_star(self, start_id, target_id, heuristic=None):
+        """
+        Use A* to find the shortest weighted path from a start vertex to a
+        destination, guided towards it by `heuristic`; see graphs.a_star for
+        the built-in euclidean and manhattan heuristics.
+
+        Parameters:
+        start_id (string): The id of the start vertex.
+        target_id (string): The id of the target vertex.
+        heuristic (callable): heuristic(vertex_id, target_id) -> an estimate
+                              of the remaining distance that never
+                              overestimates it. Defaults to 0, which expands
+                              vertices like Dijkstra's Algorithm.
+
+        Returns:
+        SearchResult: The total weight of the path, the vertex ids along it
+        and the number of vertices expanded, or None if there is no path.
+        """
+        return a_star.a_star(self, start_id, target_id,
+                             heuristic or a_star.zero)
+
+    def floyd_warshall(self, method='auto'):
+        """
+        Return the All-Pairs-Shortest-Paths matrices, containing the shortest
+        distances from each vertex to each other vertex.
+
+        Small or dense graphs use a row-at-a-time Floyd-Warshall kernel; large
+        sparse graphs switch to Johnson's Algorithm (one heap Dijkstra per
+        source), which is much cheaper when |E| is far below |V|^2.
+
+        Parameters:
+        method (string): 'auto', 'dense' (Floyd-Warshall) or 'johnson'.
+
+        Returns:
+        AllPairsShortestPaths: `vertex_ids` plus `distances` and `predecessors`
+        matrices indexed by position in `vertex_ids`.
+        """
+        frozen = self.freeze()
+
+        if method == 'auto':
+            method = ('dense' if use_dense_kernel(len(frozen),
+                                                  len(frozen.targets))
+                      else 'johnson')
+        if method == 'dense':
+            return floyd_warshall_dense(frozen)
+        if method == 'johnson':
+            return johnson(frozen)
+        raise ValueError(f"Unknown all-pairs method {method!r}")
@@ -0,0 +1,81 @@
+import threading
+import unittest
+from graphs.concurrent import ConcurrentGraph
+from graphs.weighted_graph import WeightedGraph
+
+
+class TestConcurrentGraph(unittest.TestCase):
+
+    def test_batch_publishes_once(self):
+        graph = ConcurrentGraph()
+        empty = graph.snapshot
+
+        with graph.batch() as writable:
+            writable.add_vertices_from('ABC')
+            writable.add_edge('A', 'B')
+            self.assertIs(graph.snapshot, empty)
+
+        self.assertEqual(len(empty), 0)
+        self.assertEqual(graph.snapshot.find_shortest_path('A', 'B'), ['A', 'B'])
+        self.assertEqual(graph.version, 4)
+
+        # A batch that changes nothing keeps the same snapshot
+        snapshot = graph.snapshot
+        with graph.batch():
+            pass
+        self.assertIs(graph.snapshot, snapshot)
+
+    def test_publishes_on_error(self):
+        graph = ConcurrentGraph(WeightedGraph(is_directed=False))
+
+        with self.assertRaises(RuntimeError):
+            with graph.batch() as writable:
+                writable.add_vertex('A')
+                raise RuntimeError
+
+        self.assertEqual(graph.snapshot.vertex_ids, ('A',))
+        self.assertEqual(graph.add_edges_from([('A', 'B', 2)],
+                                              create_missing=True), 1)
+        self.assertEqual(graph.snapshot.find_shortest_path('B', 'A'), 2)
+
+    def test_readers_see_whole_batches(self):
+        """Readers racing a writer only ever see complete batches."""
+        graph = ConcurrentGraph()
+        graph.add_vertex(0)
+        batch_count = 200
+        errors = []
+        done = threading.Event()
+
+        def write():
+            for batch in range(batch_count):
+                # Each batch extends the chain by two vertices
+                start = 2 * batch
+                graph.add_edges_from([(start, start + 1), (start + 1, start + 2)],
+                                     create_missing=True)
+            done.set()
+
+        def read():
+            while not done.is_set():
+                snapshot = graph.snapshot
+                vertex_count = len(snapshot)
+
+                if vertex_count % 2 != 1 or len(snapshot.targets) != vertex_count - 1:
+                    errors.append(vertex_count)
+                path = snapshot.find_shortest_path(0, vertex_count - 1)
+
+                if path != list(range(vertex_count)):
+                    errors.append(path)
+
+        threads = [threading.Thread(target=read) for _ in range(4)]
+        threads.append(threading.Thread(target=write))
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        self.assertEqual(len(graph.snapshot), 2 * batch_count + 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+import os
+import random
+import tempfile
+import unittest
+from graphs.generators import erdos_renyi, grid
+from graphs.weighted_graph import WeightedGraph
+
+
+class TestContractionHierarchy(unittest.TestCase):
+
+    def assert_matches_dijkstra(self, graph, hierarchy, query_count=200):
+        rng = random.Random(0)
+        vertex_ids = [vertex.get_id() for vertex in graph.get_vertices()]
+
+        for _ in range(query_count):
+            start_id, target_id = rng.choice(vertex_ids), rng.choice(vertex_ids)
+            expected = graph.find_shortest_path_with_distance(start_id,
+                                                              target_id)
+            result = hierarchy.find_shortest_path_with_distance(start_id,
+                                                                target_id)
+            if expected is None:
+                self.assertIsNone(result)
+                continue
+            distance, path = result
+            self.assertEqual(distance, expected[0])
+            self.assertEqual(hierarchy.find_shortest_path(start_id, target_id),
+                             distance)
+            self.assertEqual((path[0], path[-1]), (start_id, target_id))
+            # The unpacked path only uses original edges and adds up
+            total = 0
+            for vertex_id1, vertex_id2 in zip(path, path[1:]):
+                weights = dict(graph.get_vertex(vertex_id1)
+                               .get_neighbors_with_weights())
+                total += weights[graph.get_vertex(vertex_id2)]
+            self.assertEqual(total, distance)
+
+    def test_grid(self):
+        graph = grid(15, 15, weighted=True)
+        hierarchy = graph.contraction_hierarchy()
+
+        self.assertGreater(hierarchy.shortcut_count, 0)
+        self.assert_matches_dijkstra(graph, hierarchy)
+
+    def test_directed(self):
+        graph = erdos_renyi(200, 600, weighted=True)
+        self.assert_matches_dijkstra(graph, graph.contraction_hierarchy())
+
+    def test_unreachable_and_missing(self):
+        graph = WeightedGraph()
+        for vertex_id in 'ABC':
+            graph.add_vertex(vertex_id)
+        graph.add_edge('A', 'B', 1)
+        hierarchy = graph.contraction_hierarchy()
+
+        self.assertEqual(hierarchy.find_shortest_path_with_distance('A', 'A'),
+                         (0, ['A']))
+        self.assertIsNone(hierarchy.find_shortest_path('B', 'A'))
+        self.assertIsNone(hierarchy.find_shortest_path_with_distance('A', 'C'))
+        self.assertRaises(KeyError, hierarchy.find_shortest_path, 'A', 'Z')
+
+    def test_negative_weight(self):
+        graph = WeightedGraph()
+        graph.add_vertex('A')
+        graph.add_vertex('B')
+        graph.add_edge('A', 'B', -1)
+
+        self.assertRaises(ValueError, graph.contraction_hierarchy)
+
+    def test_save_and_load(self):
+        graph = grid(8, 8, weighted=True)
+        handle, filename = tempfile.mkstemp(suffix='.ch')
+        os.close(handle)
+        self.addCleanup(os.remove, filename)
+        hierarchy = graph.contraction_hierarchy(filename)
+        loaded = WeightedGraph.load_contraction_hierarchy(filename)
+
+        self.assertEqual(loaded.vertex_ids,
+                         tuple(str(vertex_id) for vertex_id in hierarchy.vertex_ids))
+        self.assertEqual(list(loaded.ranks), list(hierarchy.ranks))
+        distance, path = hierarchy.find_shortest_path_with_distance(0, 63)
+        self.assertEqual(loaded.find_shortest_path_with_distance('0', '63'),
+                         (distance, [str(vertex_id) for vertex_id in path]))
+
+if __name__ == '__main__':
+    unittest.main()
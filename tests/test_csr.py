@@ -0,0 +1,190 @@
+import unittest
+from unittest import mock
+from graphs import csr, generators, parallel_components
+from graphs.graph import Graph
+from graphs.weighted_graph import WeightedGraph
+from util.file_reader import read_graph_from_file
+
+
+class TestCSRGraph(unittest.TestCase):
+
+    def test_freeze_arrays(self):
+        graph = Graph(is_directed=True)
+        graph.add_vertex('A')
+        graph.add_vertex('B')
+        graph.add_vertex('C')
+        graph.add_edge('A','B')
+        graph.add_edge('A','C')
+        graph.add_edge('B','C')
+        frozen = graph.freeze()
+
+        self.assertEqual(frozen.vertex_ids, ('A', 'B', 'C'))
+        self.assertEqual(list(frozen.offsets), [0, 2, 3, 3])
+        self.assertEqual(list(frozen.targets), [1, 2, 2])
+        self.assertEqual(frozen.get_neighbors('A'), ('B', 'C'))
+        self.assertTrue(frozen.is_directed)
+
+    def test_snapshot_is_not_affected_by_later_edges(self):
+        graph = Graph(is_directed=True)
+        graph.add_vertex('A')
+        graph.add_vertex('B')
+        frozen = graph.freeze()
+        graph.add_edge('A','B')
+
+        self.assertEqual(frozen.get_neighbors('A'), ())
+        self.assertIsNone(frozen.find_shortest_path('A', 'B'))
+
+    def test_snapshot_reused_until_change(self):
+        graph = Graph(is_directed=True)
+        graph.add_vertex('A')
+        graph.add_vertex('B')
+        frozen = graph.freeze()
+
+        self.assertIs(graph.freeze(), frozen)
+        graph.add_edge('A','B')
+        self.assertIsNot(graph.freeze(), frozen)
+        self.assertEqual(graph.freeze().get_neighbors('A'), ('B',))
+
+    def test_find_shortest_path(self):
+        filename = 'test_files/graph_medium_undirected.txt'
+        frozen = read_graph_from_file(filename).freeze()
+
+        path_from_A_to_F = frozen.find_shortest_path('A', 'F')
+
+        self.assertEqual(len(path_from_A_to_F), 4)
+        self.assertEqual(path_from_A_to_F[0], 'A')
+        self.assertEqual(path_from_A_to_F[-1], 'F')
+
+    def test_get_all_vertices_n_away(self):
+        filename = 'test_files/graph_medium_undirected.txt'
+        frozen = read_graph_from_file(filename).freeze()
+
+        self.assertEqual(sorted(frozen.find_vertices_n_away('A', 1)), ['B','C'])
+        self.assertEqual(sorted(frozen.find_vertices_n_away('A', 2)), ['D','E'])
+        self.assertEqual(frozen.find_vertices_n_away('A', 3), ['F'])
+
+    def test_n_away_batch(self):
+        frozen = generators.barabasi_albert(300, 2, seed=4).freeze()
+        queries = [(vertex_id, distance) for vertex_id in range(0, 300, 7)
+                   for distance in (0, 1, 3)]
+        queries.append((5, 3))
+        expected = [sorted(frozen.find_vertices_n_away(*query))
+                    for query in queries]
+
+        ## A narrow batch also covers queries split across several searches
+        for width in (csr.BFS_BATCH_WIDTH, 5):
+            with self.subTest(width=width), \
+                    mock.patch.object(csr, 'BFS_BATCH_WIDTH', width):
+                self.assertEqual(frozen.find_vertices_n_away_batch(queries),
+                                 expected)
+
+        with self.assertRaises(KeyError):
+            frozen.find_vertices_n_away_batch([(0, 1), ('missing', 1)])
+
+    def test_connected_components(self):
+        graph = Graph(is_directed=False)
+        for vertex_id in 'ABCDEF':
+            graph.add_vertex(vertex_id)
+        graph.add_edge('A','B')
+        graph.add_edge('A','C')
+        graph.add_edge('B','C')
+        graph.add_edge('D', 'E')
+
+        actual_components = [sorted(comp) for comp in
+                             graph.freeze().find_connected_components()]
+
+        self.assertCountEqual(actual_components,
+                              [['A', 'B', 'C'], ['D', 'E'], ['F']])
+
+    def test_component_labels(self):
+        graph = Graph(is_directed=False)
+        for vertex_id in 'ABCDEF':
+            graph.add_vertex(vertex_id)
+        graph.add_edge('A','B')
+        graph.add_edge('D','C')
+
+        labels, sizes = graph.freeze().component_labels(processes=1)
+
+        self.assertEqual(list(labels), [0, 0, 1, 1, 2, 3])
+        self.assertEqual(list(sizes), [2, 2, 1, 1])
+
+    def test_parallel_component_labels(self):
+        """The pool's merged forests agree with a sequential walk."""
+        frozen = generators.erdos_renyi(2000, 1500, is_directed=False,
+                                        seed=3).freeze()
+        expected = {frozenset(component) for component
+                    in frozen.find_connected_components()}
+
+        with mock.patch.object(parallel_components, '_pool_pays_off',
+                               return_value=True):
+            labels, sizes = frozen.component_labels(processes=2)
+        components = {}
+
+        for vertex_id, label in zip(frozen.vertex_ids, labels):
+            components.setdefault(label, set()).add(vertex_id)
+
+        self.assertEqual({frozenset(component)
+                          for component in components.values()}, expected)
+        self.assertEqual([len(components[label]) for label in range(len(sizes))],
+                         list(sizes))
+
+    def test_sparse_graphs_label_in_process(self):
+        """Forests of sparse chunks are too big for the pool to pay off."""
+        pays_off = parallel_components._pool_pays_off
+
+        self.assertFalse(pays_off(1600000, 200000, False, 8))
+        self.assertFalse(pays_off(800000, 200000, True, 4))
+        self.assertFalse(pays_off(10**8, 10**5, False, 1))
+        self.assertTrue(pays_off(10**8, 10**5, False, 16))
+        self.assertTrue(pays_off(10**7, 10**5, True, 8))
+
+    def test_topological_sort(self):
+        frozen = generators.random_dag(200, 800, seed=2).freeze()
+        position = {vertex_id: index for index, vertex_id
+                    in enumerate(frozen.topological_sort())}
+
+        self.assertEqual(len(position), 200)
+        for vertex_id in frozen.vertex_ids:
+            for neighbor_id in frozen.get_neighbors(vertex_id):
+                self.assertLess(position[vertex_id], position[neighbor_id])
+
+        cyclic = read_graph_from_file(
+            'test_files/graph_medium_directed_cyclic.txt').freeze()
+        self.assertRaises(ValueError, cyclic.topological_sort)
+
+    def test_missing_vertex(self):
+        frozen = Graph().freeze()
+
+        with self.assertRaises(KeyError):
+            frozen.find_shortest_path('A', 'B')
+
+    def test_edge_to_missing_vertex(self):
+        graph = Graph(is_directed=True)
+        graph.add_vertex('A')
+        removed = graph.add_vertex('B')
+        graph.remove_vertex('B')
+        # A removed vertex has no position in the snapshot
+        graph.get_vertex('A').add_neighbor(removed)
+
+        self.assertRaises(ValueError, graph.freeze)
+
+
+class TestWeightedCSRGraph(unittest.TestCase):
+
+    def test_weighted_shortest_path(self):
+        graph = WeightedGraph(is_directed=False)
+        for vertex_id in 'ABCD':
+            graph.add_vertex(vertex_id)
+        graph.add_edge('A','B', 1)
+        graph.add_edge('B','C', 2)
+        graph.add_edge('A','C', 5)
+        frozen = graph.freeze()
+
+        self.assertEqual(frozen.find_shortest_path('A', 'C'), 3)
+        self.assertIsNone(frozen.find_shortest_path('A', 'D'))
+        self.assertEqual(sorted(frozen.get_neighbors_with_weights('B')),
+                         [('A', 1), ('C', 2)])
+
+
+if __name__ == '__main__':
+    unittest.main()
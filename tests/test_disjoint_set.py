@@ -0,0 +1,57 @@
+import unittest
+from graphs.disjoint_set import DisjointSet
+from graphs.weighted_graph import WeightedGraph
+
+
+class TestDisjointSet(unittest.TestCase):
+
+    def test_union_find(self):
+        groups = DisjointSet(5)
+
+        self.assertEqual(groups.component_count, 5)
+        self.assertTrue(groups.union(0, 1))
+        self.assertTrue(groups.union(3, 4))
+        self.assertFalse(groups.union(1, 0))
+        self.assertTrue(groups.connected(0, 1))
+        self.assertFalse(groups.connected(1, 3))
+        self.assertEqual(groups.component_count, 3)
+        self.assertEqual(groups.component_size(4), 2)
+
+    def test_add(self):
+        groups = DisjointSet()
+        first = groups.add()
+        second = groups.add()
+
+        self.assertEqual((first, second), (0, 1))
+        self.assertEqual(len(groups), 2)
+        groups.union(first, second)
+        self.assertEqual(groups.component_count, 1)
+
+    def test_long_chain(self):
+        """A chain far deeper than the recursion limit stays iterative."""
+        size = 100000
+        groups = DisjointSet(size)
+
+        for element in range(size - 1):
+            groups.union(element + 1, element)
+
+        self.assertEqual(groups.component_count, 1)
+        self.assertTrue(groups.connected(0, size - 1))
+        self.assertEqual(groups.component_size(0), size)
+
+
+class TestKruskalForest(unittest.TestCase):
+
+    def test_kruskal_disconnected(self):
+        graph = WeightedGraph(is_directed=False)
+        for vertex_id in 'ABCD':
+            graph.add_vertex(vertex_id)
+        graph.add_edge('A','B', 2)
+        graph.add_edge('C','D', 1)
+
+        self.assertEqual(sorted(graph.minimum_spanning_tree_kruskal()),
+                         [('A', 'B', 2), ('C', 'D', 1)])
+
+
+if __name__ == '__main__':
+    unittest.main()
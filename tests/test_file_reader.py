@@ -1,5 +1,6 @@
 import unittest
 
+from graphs.weighted_graph import WeightedGraph
 from util.file_reader import read_graph_from_file
 
 objs_to_ids = (lambda vertices:
@@ -50,3 +51,28 @@ class TestFileReader(unittest.TestCase):
 
         with self.assertRaises(ValueError):
             graph = read_graph_from_file(filename)
+
+    def test_weighted_graph(self):
+        filename = 'test_files/graph_small_weighted.txt'
+        graph = read_graph_from_file(filename)
+
+        self.assertIsInstance(graph, WeightedGraph)
+        self.assertFalse(graph.is_directed)
+        self.assertEqual(sorted((neighbor.get_id(), weight) for neighbor, weight
+                                in graph.get_vertex('C').get_neighbors_with_weights()),
+                         [('A', 9), ('B', 2), ('D', 1.5)])
+        self.assertEqual(graph.find_shortest_path('A', 'D'), 8.5)
+
+    def test_malformed_edge_line_number(self):
+        filename = 'test_files/malformed_edge.txt'
+
+        with self.assertRaisesRegex(ValueError, 'line 4'):
+            read_graph_from_file(filename)
+
+    def test_progress_callback(self):
+        filename = 'test_files/graph_medium_directed_cyclic.txt'
+        lines_read = []
+        read_graph_from_file(filename, progress=lines_read.append,
+                             progress_interval=5)
+
+        self.assertEqual(lines_read, [5, 10, 15, 15])
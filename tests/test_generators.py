@@ -0,0 +1,57 @@
+import unittest
+from graphs import generators
+from graphs.weighted_graph import WeightedGraph
+
+
+def edge_set(graph):
+    return {(vertex.get_id(), neighbor.get_id())
+            for vertex in graph.get_vertices()
+            for neighbor in vertex.get_neighbors()}
+
+
+class TestGenerators(unittest.TestCase):
+
+    def test_erdos_renyi(self):
+        graph = generators.erdos_renyi(50, 200, seed=1)
+        edges = edge_set(graph)
+
+        self.assertEqual(len(graph.get_vertices()), 50)
+        self.assertEqual(len(edges), 200)
+        self.assertFalse(any(id1 == id2 for id1, id2 in edges))
+        self.assertEqual(edges, edge_set(generators.erdos_renyi(50, 200, seed=1)))
+        self.assertNotEqual(edges, edge_set(generators.erdos_renyi(50, 200, seed=2)))
+
+        with self.assertRaises(ValueError):
+            generators.erdos_renyi(3, 4, is_directed=False)
+
+    def test_barabasi_albert(self):
+        graph = generators.barabasi_albert(100, 3)
+        degrees = [vertex.get_out_degree() for vertex in graph.get_vertices()]
+
+        ## Undirected: each of the 97 new vertices adds 3 edges, stored twice
+        self.assertEqual(sum(degrees), 2 * 97 * 3)
+        self.assertTrue(min(degrees) >= 3)
+
+    def test_grid(self):
+        graph = generators.grid(3, 4)
+        degrees = sorted(vertex.get_out_degree()
+                         for vertex in graph.get_vertices())
+
+        self.assertEqual(len(degrees), 12)
+        self.assertEqual(degrees, [2] * 4 + [3] * 6 + [4] * 2)
+
+    def test_chain_and_dag(self):
+        self.assertEqual(generators.chain(5).topological_sort(),
+                         [0, 1, 2, 3, 4])
+
+        dag = generators.random_dag(30, 100, weighted=True)
+        order = {vertex_id: position for position, vertex_id
+                 in enumerate(dag.topological_sort())}
+
+        self.assertIsInstance(dag, WeightedGraph)
+        self.assertTrue(all(order[id1] < order[id2]
+                            for id1, id2 in edge_set(dag)))
+
+
+if __name__ == '__main__':
+    unittest.main()
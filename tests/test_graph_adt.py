@@ -1,5 +1,8 @@
 import unittest
+from unittest import mock
+from graphs.components import ComponentIndex
 from graphs.graph import Graph
+from graphs.weighted_graph import WeightedGraph
 from util.file_reader import read_graph_from_file
 
 
@@ -37,6 +40,300 @@ class TestGraph(unittest.TestCase):
         self.assertEqual(len(vertex_b.get_neighbors()), 2)
         self.assertEqual(len(vertex_c.get_neighbors()), 2)
 
+    def test_degrees(self):
+        graph = Graph(is_directed=True)
+        vertex_a = graph.add_vertex('A')
+        vertex_b = graph.add_vertex('B')
+        vertex_c = graph.add_vertex('C')
+        graph.add_edge('A','B')
+        graph.add_edge('A','C')
+        graph.add_edge('B','C')
+        graph.add_edge('B','C')
+
+        self.assertEqual(vertex_a.get_in_degree(), 0)
+        self.assertEqual(vertex_a.get_out_degree(), 2)
+        self.assertEqual(vertex_c.get_in_degree(), 2)
+        self.assertEqual(vertex_c.get_out_degree(), 0)
+
+    def test_predecessors(self):
+        for track_predecessors in (True, False):
+            with self.subTest(track_predecessors=track_predecessors):
+                graph = Graph(is_directed=True,
+                              track_predecessors=track_predecessors)
+                graph.add_vertex('A')
+                graph.add_vertex('B')
+                graph.add_vertex('C')
+                graph.add_edge('A','C')
+                graph.add_edge('B','C')
+
+                self.assertEqual(sorted(vertex.get_id() for vertex in
+                                        graph.get_predecessors('C')),
+                                 ['A', 'B'])
+                self.assertEqual(graph.get_predecessors('A'), ())
+                self.assertEqual([visit[0] for visit in
+                                  graph.iter_bfs('C', reverse=True)],
+                                 ['C', 'A', 'B'])
+
+    def test_untracked_vertex_predecessors(self):
+        graph = Graph(is_directed=True)
+        vertex_a = graph.add_vertex('A')
+
+        with self.assertRaises(ValueError):
+            vertex_a.get_predecessors()
+
+    def test_weighted_predecessors(self):
+        graph = WeightedGraph(is_directed=True, track_predecessors=True)
+        graph.add_vertex('A')
+        graph.add_vertex('B')
+        graph.add_edge('A','B', 3)
+
+        self.assertEqual(graph.get_predecessors('B'), (graph.get_vertex('A'),))
+        self.assertEqual(graph.get_vertex('B').get_in_degree(), 1)
+        self.assertEqual(graph.get_vertex('A').get_out_degree(), 1)
+
+    def test_compact_vertices(self):
+        graph = WeightedGraph(is_directed=True)
+        graph.add_vertex('A')
+        graph.add_vertex('B')
+        graph.add_edge('A','B', 3)
+        vertex_a = graph.get_vertex('A')
+
+        self.assertFalse(hasattr(vertex_a, '__dict__'))
+        self.assertFalse(hasattr(Graph().add_vertex('A'), '__dict__'))
+        self.assertEqual(vertex_a.get_neighbors_with_weights(),
+                         [(graph.get_vertex('B'), 3)])
+        self.assertEqual(str(vertex_a), "A adjacent to ['B']")
+
+    def test_add_existing_vertex(self):
+        graph = Graph(is_directed=True)
+        graph.add_vertex('A')
+        vertex_b = graph.add_vertex('B')
+        graph.add_vertex('C')
+        graph.add_edge('A','B')
+        version = graph.version
+
+        self.assertIs(graph.add_vertex('B'), vertex_b)
+        self.assertEqual(graph.version, version)
+        self.assertEqual(graph.freeze().get_neighbors('A'), ('B',))
+        self.assertEqual(graph.find_shortest_path('A','B'), ['A','B'])
+
+class TestBulkIngestion(unittest.TestCase):
+
+    def test_add_edges_from(self):
+        graph = Graph(is_directed=False)
+        graph.add_vertices_from('ABC')
+        added = graph.add_edges_from([('A','B'), ('B','C'), ('C','D'),
+                                      ('B','A')])
+
+        self.assertEqual(added, 2)
+        self.assertEqual(len(graph.get_vertices()), 3)
+        self.assertEqual(graph.get_vertex('B').get_out_degree(), 2)
+
+    def test_add_edges_from_logs_one_change(self):
+        graph = Graph(is_directed=True)
+        graph.add_vertices_from('ABC')
+        version = graph.version
+        graph.add_edges_from([('A','B'), ('A','B'), ('B','C')])
+
+        self.assertEqual(graph.changes_since(version),
+                         [(version + 1, 'add_edges_from', (2,))])
+        graph.add_edges_from([('A','B')]) # nothing added, not a change
+        self.assertEqual(graph.version, version + 1)
+
+    def test_add_edges_from_records_partial_batch(self):
+        graph = Graph(is_directed=True)
+        graph.add_vertices_from('ABC')
+        frozen = graph.freeze()
+        version = graph.version
+
+        with self.assertRaises(TypeError):
+            graph.add_edges_from([('A','B'), ('B','C','oops')])
+        self.assertEqual(graph.changes_since(version),
+                         [(version + 1, 'add_edges_from', (1,))])
+        self.assertIsNot(graph.freeze(), frozen)
+        self.assertEqual(graph.freeze().get_neighbors('A'), ('B',))
+
+    def test_create_missing(self):
+        graph = Graph(is_directed=True)
+        graph.add_edges_from([(1, 2), (2, 3), (3, 3)], create_missing=True)
+
+        self.assertEqual(sorted(vertex.get_id() for vertex in graph.get_vertices()),
+                         [1, 2, 3])
+        self.assertEqual(graph.find_shortest_path(1, 3), [1, 2, 3])
+        self.assertTrue(graph.contains_cycle())
+
+    def test_add_vertices_from_keeps_existing(self):
+        graph = Graph(is_directed=True)
+        graph.add_vertices_from('AB')
+        graph.add_edge('A','B')
+        graph.add_vertices_from('AC')
+
+        self.assertEqual(len(graph.get_vertices()), 3)
+        self.assertEqual(len(graph.get_vertex('A').get_neighbors()), 1)
+
+    def test_weighted_add_edges_from(self):
+        graph = WeightedGraph(is_directed=True)
+        added = graph.add_edges_from([('A','B', 2), ('B','C', 3), ('A','C', 7)],
+                                     create_missing=True)
+
+        self.assertEqual(added, 3)
+        self.assertEqual(graph.find_shortest_path('A', 'C'), 5)
+        self.assertEqual(graph.add_edges_from([('A','D', 1)]), 0)
+
+
+class TestGraphRemoval(unittest.TestCase):
+
+    def make_graph(self, is_directed, track_predecessors=False):
+        graph = Graph(is_directed=is_directed,
+                      track_predecessors=track_predecessors)
+        for vertex_id in 'ABCD':
+            graph.add_vertex(vertex_id)
+        graph.add_edge('A','B')
+        graph.add_edge('B','C')
+        graph.add_edge('C','A')
+        graph.add_edge('C','D')
+        return graph
+
+    def test_remove_edge(self):
+        graph = self.make_graph(is_directed=True)
+
+        self.assertTrue(graph.remove_edge('C','A'))
+        self.assertFalse(graph.remove_edge('C','A'))
+        self.assertFalse(graph.contains_cycle())
+        self.assertEqual(graph.get_vertex('A').get_in_degree(), 0)
+
+    def test_remove_edge_undirected(self):
+        graph = self.make_graph(is_directed=False)
+        graph.remove_edge('A','B')
+
+        self.assertEqual(graph.get_vertex('A').get_neighbors(),
+                         (graph.get_vertex('C'),))
+        self.assertEqual(graph.get_vertex('B').get_out_degree(), 1)
+
+    def test_remove_vertex(self):
+        for is_directed in (True, False):
+            for track_predecessors in (True, False):
+                with self.subTest(is_directed=is_directed,
+                                  track_predecessors=track_predecessors):
+                    graph = self.make_graph(is_directed, track_predecessors)
+                    graph.remove_vertex('C')
+
+                    self.assertFalse(graph.contains_id('C'))
+                    self.assertEqual(len(graph.get_vertices()), 3)
+                    self.assertEqual(graph.get_vertex('B').get_neighbors(),
+                                     () if is_directed else (graph.get_vertex('A'),))
+                    self.assertEqual(graph.get_vertex('D').get_in_degree(), 0)
+                    self.assertEqual(graph.get_vertex('A').get_in_degree(),
+                                     0 if is_directed else 1)
+
+    def test_remove_vertex_without_reverse_index(self):
+        """Directed removal scans for predecessors instead of indexing."""
+        graph = self.make_graph(is_directed=True)
+        graph.add_edge('D','D')
+
+        with mock.patch.object(graph, '_adjacent') as adjacent:
+            graph.remove_vertex('D')
+            graph.remove_vertex('A')
+        adjacent.assert_not_called()
+
+        self.assertEqual(graph.get_vertex('C').get_neighbors(), ())
+        self.assertEqual(graph.get_vertex('B').get_in_degree(), 0)
+
+    def test_algorithms_after_removal(self):
+        """Removed vertices leave gaps in the interned indices."""
+        graph = self.make_graph(is_directed=True)
+        graph.remove_vertex('B')
+        graph.add_vertex('E')
+        graph.add_edge('A','E')
+        graph.add_edge('E','C')
+
+        self.assertEqual(graph.index_bound, 5)
+        self.assertEqual(graph.get_vertex('E').index, 4)
+        self.assertEqual(graph.find_shortest_path('A', 'D'), ['A', 'E', 'C', 'D'])
+        self.assertEqual(graph.find_vertices_n_away('A', 2), ['C'])
+        self.assertEqual(graph.freeze().find_shortest_path('A', 'D'),
+                         ['A', 'E', 'C', 'D'])
+        self.assertEqual(len(graph.strongly_connected_components()), 2)
+
+    def test_remove_missing_vertex(self):
+        with self.assertRaises(KeyError):
+            Graph().remove_vertex('A')
+
+    def test_weighted_removal_and_weights(self):
+        graph = WeightedGraph(is_directed=False)
+        for vertex_id in 'ABC':
+            graph.add_vertex(vertex_id)
+        graph.add_edge('A','B', 1)
+        graph.add_edge('B','C', 1)
+        graph.add_edge('A','C', 5)
+
+        self.assertEqual(graph.find_shortest_path('A', 'C'), 2)
+        self.assertTrue(graph.set_edge_weight('C','B', 10))
+        self.assertEqual(graph.find_shortest_path('A', 'C'), 5)
+        self.assertFalse(graph.set_edge_weight('A','D', 1))
+        graph.remove_vertex('A')
+        self.assertEqual(graph.find_shortest_path('B', 'C'), 10)
+        self.assertEqual(graph.get_vertex('C').get_in_degree(), 1)
+
+    def test_version_and_changes(self):
+        graph = Graph(is_directed=True)
+        graph.add_vertex('A')
+        graph.add_vertex('B')
+        version = graph.version
+        graph.add_edge('A','B')
+        graph.add_edge('A','B') # already present, not a change
+        graph.remove_edge('A','B')
+
+        self.assertEqual(graph.version, version + 2)
+        self.assertEqual(graph.changes_since(version),
+                         [(version + 1, 'add_edge', ('A', 'B')),
+                          (version + 2, 'remove_edge', ('A', 'B'))])
+        self.assertEqual(graph.changes_since(graph.version), [])
+
+    def test_changes_since_trimmed(self):
+        graph = Graph(is_directed=True)
+        for vertex_id in range(Graph.CHANGE_LOG_SIZE + 1):
+            graph.add_vertex(vertex_id)
+
+        self.assertIsNone(graph.changes_since(0))
+        self.assertEqual(len(graph.changes_since(1)), Graph.CHANGE_LOG_SIZE)
+
+
+class TestComponentIndex(unittest.TestCase):
+
+    def test_incremental_updates(self):
+        graph = Graph(is_directed=False)
+        for vertex_id in 'ABCD':
+            graph.add_vertex(vertex_id)
+        graph.add_edge('A','B')
+        components = ComponentIndex(graph)
+
+        self.assertEqual(components.component_count, 3)
+        graph.add_edge('C','D')
+        graph.add_vertex('E')
+        graph.add_edge('D','E')
+        self.assertTrue(components.refresh())
+        self.assertEqual(components.component_count, 2)
+        self.assertTrue(components.connected('C', 'E'))
+        self.assertFalse(components.connected('A', 'E'))
+        graph.add_edges_from([('E','F'), ('F','A')], create_missing=True)
+        self.assertFalse(components.refresh()) # bulk edges aren't logged
+        self.assertEqual(components.component_count, 1)
+
+    def test_removal_rebuilds(self):
+        graph = Graph(is_directed=False)
+        for vertex_id in 'ABC':
+            graph.add_vertex(vertex_id)
+        graph.add_edge('A','B')
+        graph.add_edge('B','C')
+        components = ComponentIndex(graph)
+        graph.remove_edge('B','C')
+
+        self.assertFalse(components.refresh())
+        self.assertEqual(components.component_count, 2)
+        self.assertFalse(components.connected('A', 'C'))
+
+
 class TestReadGraphFromFile(unittest.TestCase):
     def test_read_directed_graph_from_file(self):
         filename = 'test_files/graph_small_directed.txt'
@@ -97,6 +394,12 @@ class TestReadGraphFromFile(unittest.TestCase):
         vertices_3_away = graph.find_vertices_n_away('A', 3)
         self.assertEqual(vertices_3_away, ['F'])
 
+        self.assertEqual(graph.find_vertices_n_away('A', -1), [])
+
+        self.assertEqual(graph.find_vertices_n_away_batch([('A', 2), ('F', 1),
+                                                           ('A', 3)]),
+                         [['D','E'], ['D','E'], ['F']])
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
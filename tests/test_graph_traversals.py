@@ -1,5 +1,6 @@
 
 import unittest
+from unittest import mock
 #from gradescope_utils.autograder_utils.decorators import weight, visibility
 from graphs.graph import Graph
 from util.file_reader import read_graph_from_file
@@ -48,6 +49,46 @@ class TestBipartite(unittest.TestCase):
         self.assertTrue(graph.is_bipartite())
 
 
+    def test_two_coloring_partition(self):
+        """Test that a bipartite graph is split into its two sides."""
+        graph = Graph(is_directed=False)
+        graph.add_vertices_from('ABCDE')
+        graph.add_edges_from([('A','B'), ('B','C'), ('C','D'), ('A','D')])
+
+        is_bipartite, (side0, side1) = graph.two_coloring()
+        self.assertTrue(is_bipartite)
+        self.assertCountEqual(side0, ['A', 'C', 'E'])
+        self.assertCountEqual(side1, ['B', 'D'])
+
+
+    def test_two_coloring_odd_cycle(self):
+        """Test that a non-bipartite graph yields an odd cycle witness."""
+        graph = Graph(is_directed=False)
+        graph.add_vertices_from('ABCDEF')
+        graph.add_edges_from([('A','B'), ('B','C'), ('C','D'), ('D','E'),
+                              ('E','A'), ('A','F')])
+
+        is_bipartite, cycle = graph.two_coloring()
+        self.assertFalse(is_bipartite)
+        self.assertCountEqual(cycle, ['A', 'B', 'C', 'D', 'E'])
+        for vertex_id1, vertex_id2 in zip(cycle, cycle[1:] + cycle[:1]):
+            self.assertIn(graph.get_vertex(vertex_id2),
+                          graph.get_vertex(vertex_id1).get_neighbors())
+
+
+    def test_two_coloring_directed(self):
+        """Test that directed edges are treated as undirected."""
+        graph = Graph(is_directed=True)
+        graph.add_vertices_from('ABC')
+        graph.add_edges_from([('A','B'), ('C','B')])
+        self.assertTrue(graph.is_bipartite())
+
+        graph.add_edge('C','A')
+        is_bipartite, cycle = graph.two_coloring()
+        self.assertFalse(is_bipartite)
+        self.assertCountEqual(cycle, ['A', 'B', 'C'])
+
+
 class TestConnectedComponents(unittest.TestCase):
     def test_get_connected_components(self):
         """Get connected components of a graph."""
@@ -75,6 +116,116 @@ class TestConnectedComponents(unittest.TestCase):
         self.assertCountEqual(expected_components, actual_components)
 
 
+class TestTraversalIterators(unittest.TestCase):
+    def make_graph(self):
+        graph = Graph(is_directed=True)
+        for vertex_id in 'ABCDE':
+            graph.add_vertex(vertex_id)
+        graph.add_edge('A','B')
+        graph.add_edge('A','C')
+        graph.add_edge('B','D')
+        graph.add_edge('C','D')
+        graph.add_edge('D','E')
+        return graph
+
+    def test_iter_bfs(self):
+        for graph in (self.make_graph(), self.make_graph().freeze()):
+            with self.subTest(type(graph).__name__):
+                self.assertEqual(list(graph.iter_bfs('A')),
+                                 [('A', 0, None), ('B', 1, 'A'), ('C', 1, 'A'),
+                                  ('D', 2, 'B'), ('E', 3, 'D')])
+                self.assertEqual([visit[0] for visit in
+                                  graph.iter_bfs('A', max_depth=1)],
+                                 ['A', 'B', 'C'])
+
+    def test_iter_dfs(self):
+        for graph in (self.make_graph(), self.make_graph().freeze()):
+            with self.subTest(type(graph).__name__):
+                self.assertEqual(list(graph.iter_dfs('A')),
+                                 [('A', 0, None), ('B', 1, 'A'), ('D', 2, 'B'),
+                                  ('E', 3, 'D'), ('C', 1, 'A')])
+                self.assertEqual([visit[0] for visit in
+                                  graph.iter_dfs('A', max_depth=2)],
+                                 ['A', 'B', 'D', 'C'])
+
+    def test_early_termination(self):
+        traversal = self.make_graph().iter_bfs('A')
+
+        self.assertEqual(next(traversal), ('A', 0, None))
+        traversal.close()
+        self.assertEqual(list(traversal), [])
+
+    def test_visitor(self):
+        visited = []
+
+        def visitor(vertex_id, depth, parent_id):
+            visited.append(vertex_id)
+            return vertex_id != 'C'
+
+        self.make_graph().bfs_traversal('A', visitor=visitor)
+        self.assertEqual(visited, ['A', 'B', 'C'])
+
+
+class TestShortestPath(unittest.TestCase):
+    def test_directed_shortest_path(self):
+        filename = 'test_files/graph_medium_directed_cyclic.txt'
+        graph = read_graph_from_file(filename)
+
+        self.assertIn(graph.find_shortest_path('A', 'H'),
+                      (['A', 'B', 'F', 'G', 'H'], ['A', 'E', 'F', 'G', 'H']))
+        self.assertEqual(graph.find_shortest_path('C', 'C'), ['C'])
+        self.assertIsNone(graph.find_shortest_path('D', 'A'))
+
+    def test_shortest_not_first_found(self):
+        """A LIFO search would follow the long branch first."""
+        graph = Graph(is_directed=True)
+        for vertex_id in 'ABCDEF':
+            graph.add_vertex(vertex_id)
+        graph.add_edge('A','B')
+        graph.add_edge('B','C')
+        graph.add_edge('C','D')
+        graph.add_edge('D','F')
+        graph.add_edge('A','E')
+        graph.add_edge('E','F')
+
+        self.assertEqual(graph.find_shortest_path('A', 'F'), ['A', 'E', 'F'])
+
+    def test_reverse_index_reused_until_change(self):
+        graph = Graph(is_directed=True)
+        for vertex_id in 'ABCD':
+            graph.add_vertex(vertex_id)
+        graph.add_edge('A','B')
+        graph.add_edge('B','C')
+        graph.add_edge('C','D')
+
+        with mock.patch.object(graph, 'get_vertices',
+                               wraps=graph.get_vertices) as get_vertices:
+            self.assertEqual(graph.find_shortest_path('A', 'D'),
+                             ['A', 'B', 'C', 'D'])
+            self.assertEqual(graph.find_shortest_path('B', 'D'),
+                             ['B', 'C', 'D'])
+            self.assertEqual(get_vertices.call_count, 1)
+
+            graph.add_edge('A','D')
+            self.assertEqual(graph.find_shortest_path('A', 'D'), ['A', 'D'])
+            self.assertEqual(get_vertices.call_count, 2)
+
+    def test_matches_single_direction_bfs(self):
+        filename = 'test_files/graph_medium_undirected.txt'
+        graph = read_graph_from_file(filename)
+        frozen = graph.freeze()
+
+        for start_id in 'ABCDEF':
+            for target_id in 'ABCDEF':
+                with self.subTest((start_id, target_id)):
+                    path = graph.find_shortest_path(start_id, target_id)
+                    self.assertEqual(len(path), len(
+                        frozen.find_shortest_path(start_id, target_id)))
+                    self.assertEqual((path[0], path[-1]), (start_id, target_id))
+                    for vertex_id1, vertex_id2 in zip(path, path[1:]):
+                        self.assertIn(vertex_id2, frozen.get_neighbors(vertex_id1))
+
+
 class TestFindPathDfs(unittest.TestCase):
     def test_find_path_dfs(self):
         graph = Graph(is_directed=True)
@@ -88,6 +239,15 @@ class TestFindPathDfs(unittest.TestCase):
         path = graph.find_path_dfs_iter('A', 'C')
         self.assertEqual(path, ['A', 'B', 'C'])
 
+    def test_find_path_dfs_trivial_and_unreachable(self):
+        graph = Graph(is_directed=True)
+        graph.add_vertices_from('ABC')
+        graph.add_edge('A','B')
+
+        self.assertEqual(graph.find_path_dfs_iter('B', 'B'), ['B'])
+        self.assertIsNone(graph.find_path_dfs_iter('B', 'A'))
+        self.assertIsNone(graph.find_path_dfs_iter('A', 'C'))
+
 
 class TestContainsCycle(unittest.TestCase):
     def test_contains_cycle(self):
@@ -180,10 +340,55 @@ class TestStronglyConnectedComponents(unittest.TestCase):
         graph = read_graph_from_file(filename)
         scc = graph.strongly_connected_components()
 
-        for actual, expected in zip(scc, (('A', 'E'), ('B', 'C', 'F'),
-                                          ('D', 'G', 'H'))):
+        # Components come out in reverse topological order
+        for actual, expected in zip(scc, (('D', 'G', 'H'), ('B', 'C', 'F'),
+                                          ('A', 'E'))):
             with self.subTest(expected):
                 self.assertCountEqual(actual, expected)
 
+    def test_long_chain_scc(self):
+        """A path far longer than the recursion limit."""
+        graph = Graph(is_directed=True)
+        length = 50000
+        for vertex_id in range(length):
+            graph.add_vertex(vertex_id)
+        for vertex_id in range(length - 1):
+            graph.add_edge(vertex_id, vertex_id + 1)
+
+        scc = graph.strongly_connected_components()
+
+        self.assertEqual(len(scc), length)
+        self.assertEqual(scc[0], (length - 1,))
+        self.assertFalse(graph.contains_cycle())
+
+        graph.add_edge(length - 1, 0)
+        self.assertEqual(len(graph.strongly_connected_components()), 1)
+        self.assertTrue(graph.contains_cycle())
+
+    def test_self_loop(self):
+        graph = Graph(is_directed=True)
+        graph.add_vertex('A')
+        graph.add_edge('A','A')
+
+        self.assertEqual(graph.strongly_connected_components(), (('A',),))
+        self.assertTrue(graph.contains_cycle())
+
+    def test_condensation(self):
+        filename = 'test_files/graph_medium_directed_cyclic.txt'
+        graph = read_graph_from_file(filename)
+        components, dag = graph.condensation()
+        position = {frozenset(component): index
+                    for index, component in enumerate(components)}
+        a_e = position[frozenset('AE')]
+        b_c_f = position[frozenset('BCF')]
+        d_g_h = position[frozenset('DGH')]
+
+        self.assertEqual(len(dag), 3)
+        self.assertEqual(dag.get_neighbors(a_e), (b_c_f,))
+        self.assertEqual(dag.get_neighbors(b_c_f), (d_g_h,))
+        self.assertEqual(dag.get_neighbors(d_g_h), ())
+        self.assertIsNotNone(
+            dag.strongly_connected_components(break_on_cycle=True))
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,73 @@
+import unittest
+from graphs.graph import Graph
+from graphs.query_cache import QueryCache
+from graphs.weighted_graph import WeightedGraph
+
+
+class TestQueryCache(unittest.TestCase):
+
+    def test_lru_eviction(self):
+        cache = QueryCache(maxsize=2)
+        self.assertEqual(cache.lookup(0, 'a'), (False, None))
+        cache.store(0, 'a', 1)
+        cache.store(0, 'b', 2)
+        self.assertEqual(cache.lookup(0, 'a'), (True, 1))
+        cache.store(0, 'c', 3) # evicts 'b', the least recently used
+
+        self.assertEqual(cache.lookup(0, 'b'), (False, None))
+        self.assertEqual(cache.lookup(0, 'c'), (True, 3))
+        info = cache.info()
+        self.assertEqual((info.hits, info.misses, info.evictions), (2, 2, 1))
+        self.assertEqual((info.maxsize, info.currsize), (2, 2))
+
+    def test_disabled_by_default(self):
+        graph = Graph()
+        graph.add_vertices_from('AB')
+        graph.add_edge('A', 'B')
+
+        self.assertEqual(graph.find_shortest_path('A', 'B'), ['A', 'B'])
+        self.assertIsNone(graph.query_cache)
+        self.assertIsNone(graph.cache_info())
+
+    def test_hits_and_invalidation(self):
+        graph = Graph()
+        graph.add_vertices_from('ABC')
+        graph.add_edges_from([('A', 'B'), ('B', 'C')])
+        graph.enable_query_cache()
+
+        path = graph.find_shortest_path('A', 'C')
+        path.append('Z') # callers own their results
+        hit = graph.find_shortest_path('A', 'C')
+        self.assertEqual(hit, ['A', 'B', 'C'])
+        hit.clear()
+        self.assertEqual(graph.find_shortest_path('A', 'C'), ['A', 'B', 'C'])
+        self.assertEqual(graph.topological_sort(), ['A', 'B', 'C'])
+        graph.strongly_connected_components()
+        info = graph.cache_info()
+        self.assertEqual((info.hits, info.misses, info.currsize), (2, 3, 3))
+
+        graph.add_edge('A', 'C')
+        self.assertEqual(graph.find_shortest_path('A', 'C'), ['A', 'C'])
+        info = graph.cache_info()
+        self.assertEqual((info.invalidations, info.currsize), (1, 1))
+
+        graph.add_vertex('D')
+        graph.add_edge('C', 'A')
+        self.assertRaises(ValueError, graph.topological_sort)
+        self.assertEqual(graph.cache_info().currsize, 0)
+
+    def test_weighted_graph(self):
+        graph = WeightedGraph()
+        graph.add_vertex('A')
+        graph.add_vertex('B')
+        graph.add_edge('A', 'B', 5)
+        graph.enable_query_cache(maxsize=4)
+
+        self.assertEqual(graph.find_shortest_path('A', 'B'), 5)
+        self.assertEqual(graph.find_shortest_path('A', 'B'), 5)
+        self.assertEqual(graph.cache_info().hits, 1)
+
+        graph.set_edge_weight('A', 'B', 2)
+        self.assertEqual(graph.find_shortest_path('A', 'B'), 2)
+        graph.disable_query_cache()
+        self.assertIsNone(graph.cache_info())
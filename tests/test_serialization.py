@@ -0,0 +1,56 @@
+import os
+import tempfile
+import unittest
+from graphs.graph import Graph
+from graphs.weighted_graph import WeightedGraph
+from util.file_reader import read_graph_from_file
+
+
+class TestSerialization(unittest.TestCase):
+
+    def setUp(self):
+        handle, self.filename = tempfile.mkstemp(suffix='.graph')
+        os.close(handle)
+
+    def tearDown(self):
+        os.remove(self.filename)
+
+    def test_round_trip(self):
+        graph = read_graph_from_file('test_files/graph_medium_directed_cyclic.txt')
+        graph.save(self.filename)
+        loaded = Graph.load(self.filename)
+        frozen = graph.freeze()
+
+        self.assertTrue(loaded.is_directed)
+        self.assertEqual(loaded.vertex_ids, frozen.vertex_ids)
+        self.assertEqual(list(loaded.offsets), list(frozen.offsets))
+        self.assertEqual(list(loaded.targets), list(frozen.targets))
+        self.assertEqual(loaded.find_shortest_path('A', 'H'),
+                         frozen.find_shortest_path('A', 'H'))
+        self.assertEqual(len(loaded.strongly_connected_components()), 3)
+
+    def test_weighted_round_trip(self):
+        graph = WeightedGraph(is_directed=False)
+        for vertex_id in ('A', 'B', 'Ç'):
+            graph.add_vertex(vertex_id)
+        graph.add_edge('A','B', 1.5)
+        graph.add_edge('B','Ç', 2)
+        graph.save(self.filename)
+        loaded = WeightedGraph.load(self.filename)
+
+        self.assertFalse(loaded.is_directed)
+        self.assertEqual(loaded.vertex_ids, ('A', 'B', 'Ç'))
+        self.assertEqual(sorted(loaded.get_neighbors_with_weights('B')),
+                         [('A', 1.5), ('Ç', 2.0)])
+        self.assertEqual(loaded.find_shortest_path('A', 'Ç'), 3.5)
+
+    def test_not_a_graph_file(self):
+        with open(self.filename, 'wb') as file:
+            file.write(b'D\n1,2\n' * 10)
+
+        with self.assertRaises(ValueError):
+            Graph.load(self.filename)
+
+
+if __name__ == '__main__':
+    unittest.main()
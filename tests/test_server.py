@@ -0,0 +1,70 @@
+import asyncio
+import json
+import os
+import tempfile
+import unittest
+from graphs.server import GraphServer
+from util.file_reader import read_graph_from_file
+
+
+class TestGraphServer(unittest.IsolatedAsyncioTestCase):
+
+    filename = 'test_files/graph_medium_undirected.txt'
+
+    async def query(self, lines):
+        reader, writer = await asyncio.open_connection(*self.address)
+        writer.write(''.join(line + '\n' for line in lines).encode('utf-8'))
+        writer.write_eof()
+        responses = [json.loads(line) async for line in reader]
+        writer.close()
+        return {response['id']: response for response in responses}
+
+    async def start(self, filename, processes):
+        self.server = GraphServer(filename, processes)
+        self.addCleanup(self.server.close)
+        listener = await self.server.start('127.0.0.1', 0)
+        self.addAsyncCleanup(listener.wait_closed)
+        self.addCleanup(listener.close)
+        self.address = listener.sockets[0].getsockname()[:2]
+
+    async def test_queries(self):
+        await self.start(self.filename, processes=0)
+        responses = await self.query([
+            json.dumps({'id': 1, 'query': 'shortest_path', 'args': ['A', 'F']}),
+            json.dumps({'id': 2, 'query': 'n_away', 'args': ['A', 2]}),
+            json.dumps({'id': 3, 'query': 'components'}),
+            json.dumps({'id': 4, 'query': 'toposort'}),
+            json.dumps({'id': 5, 'query': 'shortest_path', 'args': ['A', 'Z']}),
+            json.dumps({'id': 6, 'query': 'stats'}),
+            'not json',
+        ])
+
+        self.assertEqual(len(responses[1]['result']), 4)
+        self.assertEqual(sorted(responses[2]['result']), ['D', 'E'])
+        self.assertEqual(len(responses[3]['result']), 1)
+        self.assertTrue(responses[4]['error'].startswith('ValueError'))
+        self.assertTrue(responses[5]['error'].startswith('KeyError'))
+        self.assertIn('error', responses[None])
+
+        stats = (await self.query([json.dumps({'id': 7, 'query': 'stats'})]))[7]
+        self.assertEqual(stats['result']['shortest_path']['count'], 2)
+        self.assertLessEqual(stats['result']['n_away']['p50'],
+                             stats['result']['n_away']['p99'])
+
+    async def test_process_pool_and_binary_file(self):
+        handle, filename = tempfile.mkstemp(suffix='.graph')
+        os.close(handle)
+        self.addCleanup(os.remove, filename)
+        read_graph_from_file(self.filename).save(filename)
+        await self.start(filename, processes=1)
+        responses = await self.query([
+            json.dumps({'id': 1, 'query': 'n_away', 'args': ['A', 1]}),
+            json.dumps({'id': 2, 'query': 'n_away', 'args': ['Z', 1]}),
+        ])
+
+        self.assertEqual(sorted(responses[1]['result']), ['B', 'C'])
+        self.assertTrue(responses[2]['error'].startswith('KeyError'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,4 +1,7 @@
 import unittest
+from graphs import a_star
+from graphs.bellman_ford import NegativeCycleError
+from graphs.generators import grid, random_dag
 from graphs.graph import Graph
 from graphs.weighted_graph import WeightedGraph
 
@@ -34,6 +37,14 @@ class TestGraph(unittest.TestCase):
 
         return graph
 
+    def test_msf_prim_mixed_id_types(self):
+        """Tied heap entries must not fall back to comparing vertex ids."""
+        graph = WeightedGraph(is_directed=False)
+        graph.add_edges_from([('r', 1, 1), ('r', 'a', 1), (1, 'x', 2),
+                              ('a', 'x', 2)], create_missing=True)
+
+        self.assertEqual(graph.minimum_spanning_forest_prim().total, 4)
+
     def test_mst_kruskal(self):
         """Create a weighted graph."""
         graph = self.make_large_graph()
@@ -60,6 +71,25 @@ class TestGraph(unittest.TestCase):
         self.assertEqual(
             graph.minimum_spanning_tree_prim(), expected_mst_weight)
 
+    def test_msf_prim_edges(self):
+        graph = self.make_large_graph()
+        forest = graph.minimum_spanning_forest_prim()
+
+        self.assertEqual(forest.total, 37)
+        self.assertEqual(len(forest.edges), 8)
+        self.assertEqual(sum(weight for _, _, weight in forest.edges), 37)
+
+    def test_msf_prim_disconnected(self):
+        graph = self.make_large_graph()
+        graph.add_vertex('K')
+        graph.add_vertex('L')
+        graph.add_edge('K','L', 3)
+        forest = graph.minimum_spanning_forest_prim()
+
+        self.assertEqual(forest.total, 40)
+        self.assertEqual(len(forest.edges), 9)
+        self.assertIn(('K', 'L', 3), forest.edges)
+
     def test_mst_kruskal(self):
         """Create a weighted graph."""
         graph = self.make_large_graph()
@@ -78,5 +108,194 @@ class TestGraph(unittest.TestCase):
         self.assertEqual(
             graph.find_shortest_path('A', 'J'), expected_shortest_path)
 
+    def test_shortest_path_with_distance(self):
+        graph = self.make_large_graph()
+
+        self.assertEqual(graph.find_shortest_path_with_distance('A', 'J'),
+                         (21, ['A', 'C', 'F', 'H', 'J']))
+
+    def test_shortest_path_unreachable(self):
+        graph = self.make_large_graph()
+        graph.add_vertex('K')
+
+        self.assertIsNone(graph.find_shortest_path('A', 'K'))
+        self.assertIsNone(graph.find_shortest_path_with_distance('A', 'K'))
+
+    def test_dijkstra_single_source(self):
+        graph = self.make_large_graph()
+        vertex_to_distance, vertex_to_previous = graph.dijkstra('A')
+
+        self.assertEqual(vertex_to_distance,
+                         {'A': 0, 'B': 4, 'C': 8, 'D': 12, 'E': 12, 'F': 9,
+                          'G': 19, 'H': 11, 'J': 21})
+        self.assertIsNone(vertex_to_previous['A'])
+        self.assertEqual(vertex_to_previous['H'], 'F')
+
+class TestFloydWarshall(unittest.TestCase):
+
+    def make_directed_graph(self):
+        graph = WeightedGraph(is_directed=True)
+        for vertex_id in 'ABCD':
+            graph.add_vertex(vertex_id)
+        graph.add_edge('A','B', 4)
+        graph.add_edge('A','C', 1)
+        graph.add_edge('C','B', -2)
+        graph.add_edge('B','D', 3)
+        return graph
+
+    def test_dense_and_johnson_agree(self):
+        graph = TestGraph().make_large_graph()
+        dense = graph.floyd_warshall(method='dense')
+        sparse = graph.floyd_warshall(method='johnson')
+
+        self.assertEqual(dense.vertex_ids, sparse.vertex_ids)
+        self.assertEqual([list(row) for row in dense.distances],
+                         [list(row) for row in sparse.distances])
+        index = dense.vertex_ids.index
+        self.assertEqual(dense.distances[index('A')][index('J')], 21)
+
+    def test_negative_edges(self):
+        graph = self.make_directed_graph()
+
+        for method in ('dense', 'johnson'):
+            with self.subTest(method):
+                result = graph.floyd_warshall(method=method)
+                index = result.vertex_ids.index
+                self.assertEqual(result.distances[index('A')][index('D')], 2)
+                self.assertEqual(result.distances[index('D')][index('A')],
+                                 float('inf'))
+                # Walk predecessors back from D to A: A -> C -> B -> D
+                path = [index('D')]
+                while path[-1] != index('A'):
+                    path.append(result.predecessors[index('A')][path[-1]])
+                self.assertEqual([result.vertex_ids[i] for i in reversed(path)],
+                                 ['A', 'C', 'B', 'D'])
+
+    def test_negative_cycle(self):
+        graph = self.make_directed_graph()
+        graph.add_edge('D','C', -5)
+
+        for method in ('dense', 'johnson'):
+            with self.subTest(method), self.assertRaises(ValueError):
+                graph.floyd_warshall(method=method)
+
+
+
+class TestBellmanFord(unittest.TestCase):
+
+    def test_negative_edges(self):
+        graph = TestFloydWarshall().make_directed_graph()
+
+        for method in ('spfa', 'bellman_ford'):
+            with self.subTest(method):
+                distances, previous = graph.bellman_ford('A', method=method)
+                self.assertEqual(distances, {'A': 0, 'B': -1, 'C': 1, 'D': 2})
+                self.assertEqual(previous['B'], 'C')
+                self.assertEqual(graph.bellman_ford('D', method=method),
+                                 ({'D': 0}, {'D': None}))
+        self.assertRaises(ValueError, graph.bellman_ford, 'A', 'dijkstra')
+
+    def test_find_shortest_path_uses_bellman_ford(self):
+        graph = TestFloydWarshall().make_directed_graph()
+
+        self.assertTrue(graph.has_negative_weights())
+        self.assertEqual(graph.find_shortest_path_with_distance('A', 'D'),
+                         (2, ['A', 'C', 'B', 'D']))
+        graph.set_edge_weight('C', 'B', 2)
+        self.assertFalse(graph.has_negative_weights())
+        self.assertEqual(graph.find_shortest_path('A', 'D'), 6)
+
+    def test_negative_cycle(self):
+        graph = TestFloydWarshall().make_directed_graph()
+        graph.add_edge('D','C', -5)
+
+        for method in ('spfa', 'bellman_ford'):
+            with self.subTest(method):
+                with self.assertRaises(NegativeCycleError) as context:
+                    graph.bellman_ford('A', method=method)
+                cycle = context.exception.cycle
+                self.assertCountEqual(cycle, ['B', 'C', 'D'])
+                self.assertEqual(cycle[cycle.index('C'):] +
+                                 cycle[:cycle.index('C')], ['C', 'B', 'D'])
+        # A cycle that is unreachable from the start is not an error
+        graph.add_vertex('E')
+        self.assertEqual(graph.bellman_ford('E'), ({'E': 0}, {'E': None}))
+
+    def test_matches_dijkstra(self):
+        graph = random_dag(300, 1500, weighted=True)
+        expected = graph.dijkstra(0)[0]
+
+        for method in ('spfa', 'bellman_ford'):
+            with self.subTest(method):
+                self.assertEqual(graph.bellman_ford(0, method=method)[0],
+                                 expected)
+
+    def test_distance_types_match_weights(self):
+        """Integer weights give exact integer distances on every engine."""
+        big = 2**53 + 1
+        graph = WeightedGraph(is_directed=True)
+        graph.add_edges_from([('A','B', big), ('B','C', 2)],
+                             create_missing=True)
+
+        self.assertEqual(graph.freeze().weight_typecode, 'q')
+        self.assertEqual(graph.dijkstra('A')[0], {'A': 0, 'B': big,
+                                                  'C': big + 2})
+        for method in ('spfa', 'bellman_ford'):
+            with self.subTest(method):
+                distances = graph.bellman_ford('A', method=method)[0]
+                self.assertEqual(distances['C'], big + 2)
+                self.assertIs(type(distances['C']), int)
+        self.assertEqual(graph.freeze().find_shortest_path('A', 'C'), big + 2)
+        self.assertEqual(graph.contraction_hierarchy().find_shortest_path(
+            'A', 'C'), big + 2)
+
+        graph.add_edge('C','A', -1) # switches to SPFA
+        distance = graph.find_shortest_path('A', 'C')
+        self.assertEqual((distance, type(distance)), (big + 2, int))
+
+        graph.add_vertex('D')
+        graph.add_edge('C','D', 0.5)
+        self.assertEqual(graph.freeze().weight_typecode, 'd')
+        self.assertIs(type(graph.bellman_ford('A')[0]['D']), float)
+
+
+class TestAStar(unittest.TestCase):
+
+    def test_matches_dijkstra(self):
+        graph = TestGraph().make_large_graph()
+        result = graph.a_star('A', 'J')
+
+        self.assertEqual(tuple(result[:2]),
+                         graph.find_shortest_path_with_distance('A', 'J'))
+        self.assertEqual(result.expanded,
+                         len(graph.dijkstra('A', 'J')[0]))
+
+    def test_unreachable(self):
+        graph = WeightedGraph()
+        graph.add_vertex('A')
+        graph.add_vertex('B')
+
+        self.assertIsNone(graph.a_star('A', 'B'))
+        self.assertRaises(KeyError, graph.a_star, 'A', 'Z')
+
+    def test_heuristics_expand_fewer_vertices(self):
+        rows = columns = 30
+        graph = WeightedGraph(is_directed=False)
+        graph.add_vertices_from(range(rows * columns))
+        graph.add_edges_from((vertex.get_id(), neighbor.get_id(), 1)
+                             for vertex in grid(rows, columns).get_vertices()
+                             for neighbor in vertex.get_neighbors())
+        coordinates = {row * columns + column: (column, row)
+                       for row in range(rows) for column in range(columns)}
+        start, target = 0, rows * columns - 1
+        dijkstra = graph.a_star(start, target)
+
+        for heuristic in (a_star.manhattan(coordinates),
+                          a_star.euclidean(coordinates)):
+            with self.subTest(heuristic):
+                result = graph.a_star(start, target, heuristic)
+                self.assertEqual(result.cost, dijkstra.cost)
+                self.assertLess(result.expanded, dijkstra.expanded)
+
 if __name__ == '__main__':
     unittest.main()
@@ -1,57 +1,111 @@
-from itertools import chain
+import re
 
 from graphs.graph import Graph
+from graphs.weighted_graph import WeightedGraph
 
+# (A,B) or (A,B,5): two vertex ids and an optional weight
+EDGE_PATTERN = re.compile(r'\(\s*([^\s,()]+)\s*,\s*([^\s,()]+)\s*'
+                          r'(?:,\s*([^\s,()]+)\s*)?\)')
 
-def read_graph_from_file(filename):
+
+# Number of parsed edges handed to add_edges_from at a time
+EDGE_BATCH_SIZE = 10000
+
+
+def read_graph_from_file(filename, progress=None, progress_interval=100000):
     """
     Read in data from the specified filename, and create and return a graph
     object corresponding to that data.
 
+    The file is streamed one line at a time and parsed edges are added in
+    batches, so memory is bounded by the graph being built rather than the
+    size of the file. Edge lines of the form `(A,B,5)` produce a WeightedGraph.
+
     Arguments:
     filename (string): The relative path of the file to be processed
+    progress (callable): Optional callback, called with the number of lines
+                         read so far every `progress_interval` lines and once
+                         at the end
+    progress_interval (integer): Lines between progress callbacks
 
     Returns:
-    Graph: A directed or undirected Graph object containing the specified
-    vertices and edges
-    """
+    Graph: A directed or undirected Graph (or WeightedGraph) object containing
+    the specified vertices and edges
 
+    Raises:
+    ValueError: If the graph type is unknown or an edge line is malformed; the
+    message includes the line number
+    """
     with open(filename) as file:
-        file_it = iter(file)
-        graph_type = {'D': True, 'G': False}.get(next(file_it).strip('\n'))
+        graph_type = {'D': True, 'G': False}.get(file.readline().strip())
 
         if graph_type is None:
-            raise ValueError()
-        graph = Graph(is_directed=graph_type)
-
-        for num in next_alnum(next(file_it)):
-            ## Use the second line to add the vertices to the graph
-            graph.add_vertex(num)
+            raise ValueError(f'{filename}, line 1: graph type must be D or G')
+        ## Use the second line to add the vertices to the graph
+        vertex_ids = [vertex_id.strip()
+                      for vertex_id in file.readline().split(',')
+                      if vertex_id.strip()]
+        graph = None
+        batch = []
+        match_edge = EDGE_PATTERN.fullmatch
+        line_number = 2
 
-        for line in file_it:
+        for line_number, line in enumerate(file, 3):
             ## Use the 3rd+ line to add the edges to the graph
-            lineit = next_alnum(line)
+            line = line.strip()
 
-            try:
-                node1, node2 = next(lineit), next(lineit)
-                graph.add_edge(node1, node2)
-            except:
-                pass
-    return graph
+            if progress is not None and line_number % progress_interval == 0:
+                progress(line_number)
+            if not line:
+                continue
+            edge = match_edge(line)
 
-def next_alnum(line):
-    """Read numeric strings from a comma-separated line.
+            if edge is None:
+                raise ValueError(f'{filename}, line {line_number}: '
+                                 f'malformed edge {line!r}')
+            vertex_id1, vertex_id2, weight = edge.groups()
 
-    Yields:
-        Next alphanumeric string in line
-    """
-    word = []
+            if graph is None:
+                ## The first edge decides whether the graph is weighted
+                graph = _new_graph(vertex_ids, graph_type, weight is not None)
+                is_weighted = weight is not None
+
+            if is_weighted != (weight is not None):
+                raise ValueError(f'{filename}, line {line_number}: '
+                                 'mixed weighted and unweighted edges')
+            if is_weighted:
+                batch.append((vertex_id1, vertex_id2,
+                              _parse_weight(weight, filename, line_number)))
+            else:
+                batch.append((vertex_id1, vertex_id2))
+
+            if len(batch) >= EDGE_BATCH_SIZE:
+                graph.add_edges_from(batch)
+                batch.clear()
 
-    for char in chain(line, ','):
+        if batch:
+            graph.add_edges_from(batch)
 
-        if char.isalnum():
-            word.append(char)
+    if progress is not None:
+        progress(line_number)
+    if graph is None:
+        graph = _new_graph(vertex_ids, graph_type, False)
+    return graph
+
+def _new_graph(vertex_ids, is_directed, is_weighted):
+    """Create an empty Graph or WeightedGraph holding vertex_ids."""
+    graph = (WeightedGraph if is_weighted else Graph)(is_directed=is_directed)
+    graph.add_vertices_from(vertex_ids)
+    return graph
 
-        if char ==  ',':
-            yield ''.join(word)
-            word = []
+def _parse_weight(text, filename, line_number):
+    """Parse an edge weight as an int if possible, otherwise a float."""
+    try:
+        return int(text)
+    except ValueError:
+        pass
+    try:
+        return float(text)
+    except ValueError:
+        raise ValueError(f'{filename}, line {line_number}: '
+                         f'invalid weight {text!r}') from None